@@ -3,6 +3,7 @@ from .classifier import Classifier
 from .datatype import DataType
 from .mock import MockMixin
 from .fileset import FileSet
+from .fileset_array import FileSetArray
 from .field import Field
 from .identification import (
     to_mime,
@@ -13,12 +14,14 @@ from .identification import (
 from .sampling import SampleFileGenerator
 from .extras import extra, extra_implementation, converter
 from .decorators import validated_property, mtime_cached_property
+from .cache import cache_stats, reset_cache_stats
 
 __all__ = [
     "__version__",
     "Classifier",
     "DataType",
     "FileSet",
+    "FileSetArray",
     "MockMixin",
     "Field",
     "to_mime",
@@ -31,4 +34,6 @@ __all__ = [
     "converter",
     "validated_property",
     "mtime_cached_property",
+    "cache_stats",
+    "reset_cache_stats",
 ]
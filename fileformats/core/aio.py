@@ -0,0 +1,131 @@
+import asyncio
+import functools
+import weakref
+import typing as ty
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from threading import Lock
+from .fs_mount_identifier import FsMountIdentifier
+from .typing import PathType
+
+
+T = ty.TypeVar("T")
+
+# Default maximum number of threads used to run the blocking I/O of async methods
+IO_MAX_WORKERS_DEFAULT = 8
+# Default maximum number of async I/O operations in flight on each file-system mount
+IO_MAX_PER_MOUNT_DEFAULT = 4
+# Number of chunks hashed by each step of `FileSet.ahash` between yields to the event
+# loop (i.e. 128 x 8 KB = 1 MB by default)
+HASH_CHUNKS_PER_STEP = 128
+
+
+def set_async_io_limits(
+    max_workers: ty.Optional[int] = None, max_per_mount: ty.Optional[int] = None
+) -> None:
+    """Sets the limits on the concurrency of the async I/O methods of FileSets (e.g.
+    `ahash`, `acopy`, `aload`). Should be called before any of the async methods are
+    used, as executors and semaphores that are already in use aren't resized.
+
+    Parameters
+    ----------
+    max_workers : int, optional
+        the maximum number of threads used to run blocking I/O, by default
+        IO_MAX_WORKERS_DEFAULT
+    max_per_mount : int, optional
+        the maximum number of operations in flight on each file-system mount, by default
+        IO_MAX_PER_MOUNT_DEFAULT
+    """
+    global _io_executor, _max_workers, _max_per_mount
+    with _lock:
+        if max_workers is not None:
+            _max_workers = max_workers
+            if _io_executor is not None:
+                _io_executor.shutdown(wait=False)
+                _io_executor = None
+        if max_per_mount is not None:
+            _max_per_mount = max_per_mount
+            _mount_semaphores.clear()
+
+
+def get_io_executor() -> ThreadPoolExecutor:
+    """Returns the bounded thread-pool that the blocking I/O of async methods is run
+    on"""
+    global _io_executor
+    with _lock:
+        if _io_executor is None:
+            _io_executor = ThreadPoolExecutor(
+                max_workers=_max_workers, thread_name_prefix="fileformats-io"
+            )
+        return _io_executor
+
+
+async def run_io(func: ty.Callable[..., T], *args: ty.Any, **kwargs: ty.Any) -> T:
+    """Runs a blocking function on the I/O executor without blocking the event loop
+
+    Parameters
+    ----------
+    func : Callable
+        the blocking function to run
+    *args, **kwargs
+        arguments passed to the function
+
+    Returns
+    -------
+    T
+        the return value of the function
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_io_executor(), functools.partial(func, *args, **kwargs)
+    )
+
+
+@asynccontextmanager
+async def mount_limits(fspaths: ty.Iterable[PathType]) -> ty.AsyncIterator[None]:
+    """Waits until there is a free slot on each of the mounts the paths are on, holding
+    them until the context exits. Slots are acquired in a consistent order to avoid
+    deadlocks between operations spanning several mounts (e.g. copies).
+
+    Parameters
+    ----------
+    fspaths : Iterable[PathType]
+        the paths that will be accessed within the context
+    """
+    mounts = sorted(set(_mount_of(p) for p in fspaths))
+    loop_semaphores = _mount_semaphores.setdefault(asyncio.get_running_loop(), {})
+    semaphores = []
+    for mount in mounts:
+        try:
+            semaphore = loop_semaphores[mount]
+        except KeyError:
+            semaphore = loop_semaphores[mount] = asyncio.Semaphore(_max_per_mount)
+        semaphores.append(semaphore)
+    acquired = []
+    try:
+        for semaphore in semaphores:
+            await semaphore.acquire()
+            acquired.append(semaphore)
+        yield
+    finally:
+        for semaphore in reversed(acquired):
+            semaphore.release()
+
+
+def _mount_of(fspath: PathType) -> str:
+    try:
+        return str(FsMountIdentifier.get_mount(fspath)[0])
+    except ValueError:  # not on a known mount point
+        return str(Path(fspath).absolute().anchor)
+
+
+_lock = Lock()
+_io_executor: ty.Optional[ThreadPoolExecutor] = None
+_max_workers = IO_MAX_WORKERS_DEFAULT
+_max_per_mount = IO_MAX_PER_MOUNT_DEFAULT
+# Semaphores limiting the operations in flight on each mount, per event loop (as
+# asyncio primitives are bound to the loop they are used in)
+_mount_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, ty.Dict[str, asyncio.Semaphore]]" = (  # noqa: E501
+    weakref.WeakKeyDictionary()
+)
@@ -0,0 +1,802 @@
+import os
+import stat
+import sys
+import pickle
+import hashlib
+import tempfile
+import logging
+import weakref
+import typing as ty
+from pathlib import Path
+from collections import OrderedDict
+from threading import RLock, Lock, Event, get_ident
+from .typing import PathType
+
+if ty.TYPE_CHECKING:
+    from .fileset import FileSet
+
+
+logger = logging.getLogger("fileformats")
+
+
+# Default memory budget (in bytes) of the process-wide cache shared between FileSets
+SHARED_CACHE_SIZE_DEFAULT = 256 * 1024**2
+# Default memory budget (in bytes) of the values cached on individual FileSet instances
+INSTANCE_CACHE_SIZE_DEFAULT = 1024**3
+# Default memory budget (in bytes) of the memo of the outcomes of FileSet validations
+VALIDATION_CACHE_SIZE_DEFAULT = 16 * 1024**2
+# Default memory budget (in bytes) of the memo of the content digests of files
+DIGEST_CACHE_SIZE_DEFAULT = 16 * 1024**2
+
+
+class SharedCache:
+    """A thread-safe, least-recently-used (LRU) cache with an approximate memory budget.
+
+    A single process-wide instance (`shared_cache`) is used to share lazily loaded
+    values (i.e. the `metadata` and `contents` properties) between FileSet objects that
+    point to the same unchanged files, so short-lived instances created for the same
+    paths don't have to reload them.
+
+    Parameters
+    ----------
+    max_size : int
+        the memory budget of the cache in bytes, as estimated by `estimate_size`. The
+        least-recently used entries are evicted to keep the total size of the cached
+        entries (both their keys and values) below this limit. Entries that are larger
+        than the budget are not cached, and setting it to 0 disables the cache
+    """
+
+    def __init__(self, max_size: int = SHARED_CACHE_SIZE_DEFAULT):
+        self._max_size = max_size
+        self._entries: "OrderedDict[ty.Hashable, ty.Tuple[ty.Any, int]]" = OrderedDict()
+        self._size = 0
+        self._lock = RLock()
+
+    @property
+    def max_size(self) -> int:
+        "The memory budget of the cache in bytes"
+        return self._max_size
+
+    @max_size.setter
+    def max_size(self, max_size: int) -> None:
+        if max_size < 0:
+            raise ValueError(f"Cache size must be non-negative, not {max_size}")
+        with self._lock:
+            self._max_size = max_size
+            self._evict()
+
+    @property
+    def size(self) -> int:
+        "The estimated size of all entries currently stored in the cache in bytes"
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: ty.Hashable) -> bool:
+        return key in self._entries
+
+    def __getitem__(self, key: ty.Hashable) -> ty.Any:
+        with self._lock:
+            value, _ = self._entries[key]
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: ty.Hashable, value: ty.Any) -> bool:
+        """Stores a value in the cache, evicting least-recently used entries if required
+        to stay within the memory budget
+
+        Parameters
+        ----------
+        key : Hashable
+            the key to store the value under
+        value : Any
+            the value to cache
+
+        Returns
+        -------
+        bool
+            whether the value was stored or not (i.e. if it is larger than the budget)
+        """
+        # Keys are included as they can be larger than the values (e.g. the paths and
+        # mtimes in the keys of memoised validations, which have values of None)
+        size = estimate_size((key, value))
+        with self._lock:
+            self.discard(key)
+            if size > self._max_size:
+                return False
+            self._entries[key] = (value, size)
+            self._size += size
+            self._evict()
+        return True
+
+    def discard(self, key: ty.Hashable) -> None:
+        "Removes an entry from the cache if present"
+        with self._lock:
+            try:
+                _, size = self._entries.pop(key)
+            except KeyError:
+                pass
+            else:
+                self._size -= size
+
+    def clear(self) -> None:
+        "Removes all entries from the cache"
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _evict(self) -> None:
+        while self._size > self._max_size and self._entries:
+            _, (_, size) = self._entries.popitem(last=False)
+            self._size -= size
+
+
+def estimate_size(value: ty.Any) -> int:
+    """Estimates the memory footprint of a value in bytes, recursing into the builtin
+    container types (the sizes of the objects referenced by other types aren't
+    included). The `nbytes` attribute of array-like objects is used where it is
+    larger than the size reported by `sys.getsizeof`. Classes aren't included as they
+    are shared rather than owned by the value
+
+    Parameters
+    ----------
+    value : Any
+        the value to estimate the size of
+
+    Returns
+    -------
+    int
+        the estimated size of the value in bytes
+    """
+    seen: ty.Set[int] = set()
+    to_size = [value]
+    size = 0
+    while to_size:
+        obj = to_size.pop()
+        if id(obj) in seen or isinstance(obj, type):
+            continue
+        seen.add(id(obj))
+        # Use the size of the referenced buffer for array-like objects that don't own
+        # their data (e.g. memoryviews and numpy array views)
+        nbytes = getattr(obj, "nbytes", 0)
+        if not isinstance(nbytes, int):
+            nbytes = 0
+        size += max(sys.getsizeof(obj), nbytes)
+        if isinstance(obj, dict):
+            to_size.extend(obj.keys())
+            to_size.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            to_size.extend(obj)
+    return size
+
+
+def freeze(value: ty.Any) -> ty.Hashable:
+    """Converts a value built from builtin containers (e.g. keyword arguments passed
+    to `read_metadata`) into a hashable equivalent that can be used in a cache key
+
+    Parameters
+    ----------
+    value : Any
+        the value to convert
+
+    Returns
+    -------
+    Hashable
+        a hashable representation of the value
+
+    Raises
+    ------
+    TypeError
+        if the value (or a nested value) is not hashable
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    if isinstance(value, set):
+        return frozenset(freeze(v) for v in value)
+    hash(value)  # raise TypeError if the value isn't hashable
+    return value  # type: ignore[no-any-return]
+
+
+class InstanceCacheBudget:
+    """Enforces a global memory budget on the values cached on individual FileSet
+    instances by "bounded" `mtime_cached_property` properties (e.g. `contents` and
+    `raw_contents`), so that long-lived filesets (and collections of them) don't pin
+    their loaded contents in memory indefinitely. When the budget is exceeded, the
+    least-recently used values are dropped from the instances they are cached on, and
+    are transparently reloaded the next time they are accessed. Values that are also
+    held in the `shared_cache` are evicted from it at the same time, as otherwise
+    evicting them from the instances wouldn't free any memory.
+
+    Parameters
+    ----------
+    max_size : int
+        the memory budget in bytes, as estimated by `estimate_size`
+    weak_values : bool
+        instead of holding cached values that support weak references (e.g. numpy
+        arrays) in memory until evicted, only keep weak references to them so they are
+        dropped as soon as they are no longer referenced outside of the cache.
+        Values that don't support weak references are always held and count towards
+        the budget. By default False
+    """
+
+    def __init__(
+        self, max_size: int = INSTANCE_CACHE_SIZE_DEFAULT, weak_values: bool = False
+    ):
+        self._max_size = max_size
+        self.weak_values = weak_values
+        self._entries: "OrderedDict[ty.Tuple[int, str], ty.Tuple[weakref.ref[ty.Any], int, ty.Optional[ty.Hashable]]]" = (
+            OrderedDict()
+        )
+        self._size = 0
+        self._lock = RLock()
+
+    @property
+    def max_size(self) -> int:
+        "The memory budget in bytes"
+        return self._max_size
+
+    @max_size.setter
+    def max_size(self, max_size: int) -> None:
+        if max_size < 0:
+            raise ValueError(f"Cache size must be non-negative, not {max_size}")
+        with self._lock:
+            self._max_size = max_size
+            self._evict()
+
+    @property
+    def size(self) -> int:
+        "The estimated size of all values held on instances in bytes"
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def wrap(self, value: ty.Any) -> ty.Any:
+        """Wraps a value to be cached on an instance in a weak reference if
+        `weak_values` is enabled and the value supports them"""
+        if self.weak_values:
+            try:
+                return WeakValue(value)
+            except TypeError:
+                pass
+        return value
+
+    def record(
+        self,
+        instance: ty.Any,
+        cache_name: str,
+        value: ty.Any,
+        shared_key: ty.Optional[ty.Hashable] = None,
+    ) -> None:
+        """Records a value that has been cached on an instance, evicting the
+        least-recently used values if the budget is exceeded
+
+        Parameters
+        ----------
+        instance : FileSet
+            the instance the value is cached on
+        cache_name : str
+            the name of the attribute in the instance's __dict__ the value is cached in
+        value : Any
+            the value that has been cached
+        shared_key : Hashable, optional
+            the key the value is also stored under in the `shared_cache`, if any
+        """
+        if isinstance(value, WeakValue):
+            return  # weakly referenced values don't count towards the budget
+        size = estimate_size(value)
+        key = (id(instance), cache_name)
+
+        def forget(_: ty.Any) -> None:
+            # Drop the entry once the instance has been garbage collected
+            with self._lock:
+                self._discard(key)
+
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (weakref.ref(instance, forget), size, shared_key)
+            self._size += size
+            self._evict()
+
+    def touch(self, instance: ty.Any, cache_name: str) -> None:
+        "Marks a cached value as being the most recently used"
+        with self._lock:
+            try:
+                self._entries.move_to_end((id(instance), cache_name))
+            except KeyError:
+                pass
+
+    def discard(self, instance: ty.Any, cache_name: str) -> None:
+        "Stops tracking a value that is no longer cached on an instance"
+        with self._lock:
+            self._discard((id(instance), cache_name))
+
+    def _discard(self, key: ty.Tuple[int, str]) -> None:
+        try:
+            _, size, _ = self._entries.pop(key)
+        except KeyError:
+            pass
+        else:
+            self._size -= size
+
+    def _evict(self) -> None:
+        while self._size > self._max_size and self._entries:
+            (_, cache_name), (instance_ref, size, shared_key) = self._entries.popitem(
+                last=False
+            )
+            self._size -= size
+            if shared_key is not None:
+                shared_cache.discard(shared_key)
+            instance = instance_ref()
+            if instance is not None:
+                instance.__dict__.pop(cache_name, None)
+                # cache names are of the form "_<property-name>_mtime_cache"
+                prop_name = cache_name[1 : -len("_mtime_cache")]
+                cache_stats_recorder[(type(instance), prop_name)].evictions += 1
+
+
+class WeakValue(weakref.ref):  # type: ignore[type-arg]
+    "A weak reference to a value cached on a FileSet instance"
+
+
+class SingleFlight:
+    """Deduplicates concurrent computations of the same value, so that when several
+    threads request a value for the same key at the same time only the first computes
+    it and the others wait for and share its result (or exception). Computations of
+    different keys don't block each other.
+    """
+
+    class _Call:
+        def __init__(self) -> None:
+            self.thread_id = get_ident()
+            self.done = Event()
+            self.value: ty.Any = None
+            self.error: ty.Optional[BaseException] = None
+
+    def __init__(self) -> None:
+        self._calls: ty.Dict[ty.Hashable, SingleFlight._Call] = {}
+        self._lock = Lock()
+
+    def __contains__(self, key: ty.Hashable) -> bool:
+        return key in self._calls
+
+    def do(
+        self, key: ty.Hashable, func: ty.Callable[[], ty.Any]
+    ) -> ty.Tuple[ty.Any, bool]:
+        """Computes the value for the key by calling `func` unless another thread is
+        already computing it, in which case waits for that computation to finish
+
+        Parameters
+        ----------
+        key : Hashable
+            the key identifying the value being computed
+        func : Callable[[], Any]
+            the function to compute the value
+
+        Returns
+        -------
+        value : Any
+            the computed value
+        computed : bool
+            whether the value was computed by this call (as opposed to another thread)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = self._Call()
+                leader = True
+            else:
+                leader = False
+        if not leader:
+            if call.thread_id == get_ident():
+                # Reentrant request from the thread computing the value, so waiting
+                # would deadlock
+                return func(), True
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, False
+        try:
+            call.value = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.value, True
+
+
+class CacheStats:
+    """Counters of the lookups of a cached property (or aggregate of several)
+
+    Attributes
+    ----------
+    hits : int
+        number of times a valid value was found cached on the instance
+    misses : int
+        number of times no value was cached on the instance (i.e. on first access or
+        after the value was evicted)
+    shared_hits : int
+        number of misses that were served from the process-wide shared cache, or by a
+        concurrent computation of the same value in another thread
+    invalidations : int
+        number of times a cached value was discarded because the mtimes of the files
+        had changed
+    resolution_misses : int
+        number of times a cached value was discarded because the files were modified
+        too recently to be sure a subsequent modification would be detected given the
+        mtime resolution of the file-system
+        (see `enough_time_has_elapsed_given_mtime_resolution`)
+    evictions : int
+        number of cached values evicted to stay within the `instance_cache_budget`
+    recomputes : int
+        number of times the value was computed
+    recompute_time : float
+        total time spent computing the value in seconds
+    """
+
+    FIELDS = (
+        "hits",
+        "misses",
+        "shared_hits",
+        "invalidations",
+        "resolution_misses",
+        "evictions",
+        "recomputes",
+        "recompute_time",
+    )
+
+    hits: int
+    misses: int
+    shared_hits: int
+    invalidations: int
+    resolution_misses: int
+    evictions: int
+    recomputes: int
+    recompute_time: float
+
+    def __init__(self, **counters: ty.Union[int, float]):
+        for field in self.FIELDS:
+            setattr(self, field, counters.pop(field, 0))
+        if counters:
+            raise TypeError(f"Unrecognised cache stats counters {list(counters)}")
+
+    @property
+    def lookups(self) -> int:
+        "Total number of lookups of the cached value"
+        return self.hits + self.misses + self.invalidations + self.resolution_misses
+
+    @property
+    def hit_rate(self) -> float:
+        "Proportion of lookups that were served from a cache (instance or shared)"
+        if not self.lookups:
+            return 0.0
+        return (self.hits + self.shared_hits) / self.lookups
+
+    def copy(self) -> "CacheStats":
+        return CacheStats(**{f: getattr(self, f) for f in self.FIELDS})
+
+    def __add__(self, other: "CacheStats") -> "CacheStats":
+        return CacheStats(
+            **{f: getattr(self, f) + getattr(other, f) for f in self.FIELDS}
+        )
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, CacheStats) and all(
+            getattr(self, f) == getattr(other, f) for f in self.FIELDS
+        )
+
+    def __repr__(self) -> str:
+        counters = ", ".join(f"{f}={getattr(self, f)!r}" for f in self.FIELDS)
+        return f"{type(self).__name__}({counters})"
+
+
+class CacheStatsSnapshot:
+    """A snapshot of the cache statistics of each cached property of each format class,
+    as returned by `cache_stats()`
+
+    Parameters
+    ----------
+    stats : dict[tuple[type, str], CacheStats]
+        the statistics for each format class and property name pair
+    """
+
+    def __init__(self, stats: ty.Dict[ty.Tuple[type, str], CacheStats]):
+        self.stats = stats
+
+    def __getitem__(self, key: ty.Tuple[type, str]) -> CacheStats:
+        return self.stats[key]
+
+    def __iter__(self) -> ty.Iterator[ty.Tuple[type, str]]:
+        return iter(self.stats)
+
+    def __len__(self) -> int:
+        return len(self.stats)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.stats!r})"
+
+    @property
+    def total(self) -> CacheStats:
+        "The statistics aggregated over all classes and properties"
+        return sum(self.stats.values(), CacheStats())
+
+    def by_property(self) -> ty.Dict[str, CacheStats]:
+        "The statistics of each cached property aggregated over all format classes"
+        return self._aggregate(lambda k: k[1])
+
+    def by_class(self) -> ty.Dict[type, CacheStats]:
+        "The statistics of each format class aggregated over all cached properties"
+        return self._aggregate(lambda k: k[0])
+
+    def _aggregate(
+        self, group: ty.Callable[[ty.Tuple[type, str]], ty.Any]
+    ) -> ty.Dict[ty.Any, CacheStats]:
+        aggregated: ty.Dict[ty.Any, CacheStats] = {}
+        for key, stats in self.stats.items():
+            grp = group(key)
+            aggregated[grp] = aggregated.get(grp, CacheStats()) + stats
+        return aggregated
+
+
+class CacheStatsRecorder:
+    """Collects the statistics of the lookups of `mtime_cached_property` values by
+    format class and property. Counters are incremented without locking so may slightly
+    under-count under heavily concurrent access"""
+
+    def __init__(self) -> None:
+        self._stats: ty.Dict[ty.Tuple[type, str], CacheStats] = {}
+        self._lock = RLock()
+
+    def __getitem__(self, key: ty.Tuple[type, str]) -> CacheStats:
+        try:
+            return self._stats[key]
+        except KeyError:
+            with self._lock:
+                return self._stats.setdefault(key, CacheStats())
+
+    def snapshot(self) -> CacheStatsSnapshot:
+        "Returns a copy of the current statistics"
+        with self._lock:
+            return CacheStatsSnapshot(
+                {k: v.copy() for k, v in list(self._stats.items())}
+            )
+
+    def reset(self) -> None:
+        "Resets all counters to zero"
+        with self._lock:
+            self._stats = {}
+
+
+def cache_stats(reset: bool = False) -> CacheStatsSnapshot:
+    """Returns a snapshot of the hit, miss, invalidation and recompute-time statistics
+    of the values cached by `mtime_cached_property` properties (e.g. `metadata` and
+    `contents`) for each format class
+
+    Parameters
+    ----------
+    reset : bool, optional
+        reset the counters after taking the snapshot, by default False
+
+    Returns
+    -------
+    CacheStatsSnapshot
+        the statistics, which can be accessed by (format-class, property-name) keys
+        or aggregated with the `by_class()` and `by_property()` methods
+    """
+    with cache_stats_recorder._lock:
+        snapshot = cache_stats_recorder.snapshot()
+        if reset:
+            cache_stats_recorder.reset()
+    return snapshot
+
+
+def reset_cache_stats() -> None:
+    "Resets the counters returned by `cache_stats()`"
+    cache_stats_recorder.reset()
+
+
+class PersistentMetadataCache:
+    """A cross-process cache of the metadata read by the `read_metadata` extra, stored
+    on disk so that worker processes don't need to re-read the headers of unchanged
+    files. Entries are keyed by the format class, the identity (path, device, inode,
+    size and mtime) of each file-system path in the fileset and the keyword arguments
+    passed to `read_metadata`.
+
+    Each entry is pickled to a separate file, which is written atomically so the cache
+    directory can be shared between concurrently running processes (including over
+    network file-systems). Since unpickling an entry can execute arbitrary code, the
+    cache directories are created so that they are only accessible by the current user,
+    and entries that aren't owned by the current user or are writable by other users
+    are ignored.
+
+    Parameters
+    ----------
+    cache_dir : Path | str
+        the directory to store the cache entries in
+    """
+
+    # Incremented when the key or entry format changes to invalidate existing caches
+    FORMAT_VERSION = 1
+
+    def __init__(self, cache_dir: PathType):
+        self.cache_dir = Path(cache_dir).absolute()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({str(self.cache_dir)!r})"
+
+    def key(self, fileset: "FileSet") -> ty.Optional[str]:
+        """Returns the key for the metadata of a fileset or None if it cannot be
+        cached, i.e. if the load kwargs aren't hashable or the files have been modified
+        too recently for any subsequent modification to be detected
+
+        Parameters
+        ----------
+        fileset : FileSet
+            the fileset to generate the key for
+
+        Returns
+        -------
+        str or None
+            a hex digest uniquely identifying the metadata of the fileset
+        """
+        from .decorators import enough_time_has_elapsed_given_mtime_resolution
+
+        try:
+            load_kwargs = freeze(fileset._load_kwargs)
+        except TypeError:
+            return None
+        identities = []
+        for fspath in sorted(fileset.fspaths):
+            fstat = fspath.stat()
+            identities.append(
+                (
+                    str(fspath),
+                    fstat.st_dev,
+                    fstat.st_ino,
+                    fstat.st_size,
+                    fstat.st_mtime_ns,
+                )
+            )
+        if not enough_time_has_elapsed_given_mtime_resolution(
+            (i[0], i[-1]) for i in identities
+        ):
+            return None
+        tp = type(fileset)
+        key = (
+            self.FORMAT_VERSION,
+            tp.__module__,
+            tp.__qualname__,
+            tuple(identities),
+            load_kwargs,
+        )
+        return hashlib.sha256(repr(key).encode()).hexdigest()
+
+    def __getitem__(self, key: str) -> ty.Mapping[str, ty.Any]:
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, "rb") as f:
+                # Checked on the open file so it can't be swapped after the check
+                if not self._is_trusted(os.fstat(f.fileno())):
+                    logger.warning(
+                        "Ignoring metadata cache entry %s as it isn't owned by the "
+                        "current user or is writable by other users",
+                        entry_path,
+                    )
+                    raise KeyError(key)
+                metadata: ty.Mapping[str, ty.Any] = pickle.load(f)
+        except FileNotFoundError:
+            raise KeyError(key) from None
+        except Exception as e:
+            logger.debug("Could not read metadata cache entry %s: %s", entry_path, e)
+            raise KeyError(key) from None
+        return metadata
+
+    def put(self, key: str, metadata: ty.Mapping[str, ty.Any]) -> bool:
+        """Stores the metadata in the cache
+
+        Parameters
+        ----------
+        key : str
+            the key returned by `key`
+        metadata : Mapping[str, Any]
+            the metadata to store
+
+        Returns
+        -------
+        bool
+            whether the metadata was able to be stored or not
+        """
+        entry_path = self._entry_path(key)
+        try:
+            pickled = pickle.dumps(metadata, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.debug("Could not pickle metadata to store in cache: %s", e)
+            return False
+        try:
+            self.cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+            entry_path.parent.mkdir(mode=0o700, exist_ok=True)
+            # Write to a temporary file and then move it into place so that other
+            # processes never read partially written entries
+            fd, tmp_path = tempfile.mkstemp(dir=entry_path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(pickled)
+                os.replace(tmp_path, entry_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.debug("Could not write metadata cache entry %s: %s", entry_path, e)
+            return False
+        return True
+
+    def clear(self) -> None:
+        "Removes all entries from the cache"
+        for entry_path in self.cache_dir.glob("*/*.pkl"):
+            entry_path.unlink()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / (key + ".pkl")
+
+    @staticmethod
+    def _is_trusted(entry_stat: os.stat_result) -> bool:
+        """Whether an entry is owned by the current user and not writable by other
+        users, and so is safe to unpickle"""
+        if entry_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+            return False
+        if hasattr(os, "geteuid") and entry_stat.st_uid != os.geteuid():
+            return False
+        return True
+
+
+def set_persistent_metadata_cache(
+    cache_dir: ty.Optional[PathType],
+) -> ty.Optional[PersistentMetadataCache]:
+    """Sets the directory used to persistently cache the metadata read from filesets
+    across processes (see `PersistentMetadataCache`). Can also be set via the
+    "FILEFORMATS_METADATA_CACHE_DIR" environment variable
+
+    Parameters
+    ----------
+    cache_dir : Path | str | None
+        the directory to store the cache in, or None to disable the persistent cache
+
+    Returns
+    -------
+    PersistentMetadataCache or None
+        the new persistent cache
+    """
+    global _persistent_metadata_cache
+    if cache_dir is None:
+        _persistent_metadata_cache = None
+    else:
+        _persistent_metadata_cache = PersistentMetadataCache(cache_dir)
+    return _persistent_metadata_cache
+
+
+def get_persistent_metadata_cache() -> ty.Optional[PersistentMetadataCache]:
+    "Returns the persistent metadata cache if one has been set"
+    return _persistent_metadata_cache
+
+
+shared_cache = SharedCache()
+# Maps (class, path-stats, load-kwargs) keys to None if the validation of the
+# properties of the FileSet class passed or the type and args of the FormatMismatchError
+# raised if not
+validation_cache = SharedCache(max_size=VALIDATION_CACHE_SIZE_DEFAULT)
+# Maps (path, mtime, size, crypto-method) keys to the hex digests of the contents of
+# files, used to compare files when syncing
+digest_cache = SharedCache(max_size=DIGEST_CACHE_SIZE_DEFAULT)
+in_flight = SingleFlight()
+cache_stats_recorder = CacheStatsRecorder()
+instance_cache_budget = InstanceCacheBudget()
+
+_persistent_metadata_cache: ty.Optional[PersistentMetadataCache] = None
+if os.environ.get("FILEFORMATS_METADATA_CACHE_DIR"):
+    set_persistent_metadata_cache(os.environ["FILEFORMATS_METADATA_CACHE_DIR"])
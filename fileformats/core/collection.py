@@ -2,7 +2,7 @@ import typing as ty
 from pathlib import Path
 from abc import ABCMeta, abstractproperty
 from fileformats.core import FileSet, validated_property, mtime_cached_property
-from fileformats.core.decorators import classproperty
+from fileformats.core.decorators import classproperty, cached_classproperty
 from fileformats.core.exceptions import FormatMismatchError
 from fileformats.core.utils import get_optional_type
 
@@ -19,7 +19,7 @@ class TypedCollection(FileSet, metaclass=ABCMeta):
     def content_fspaths(self) -> ty.Iterable[Path]:
         ...  # noqa: E704
 
-    @mtime_cached_property
+    @mtime_cached_property(bounded=True)
     def contents(self) -> ty.List[FileSet]:
         contnts = []
         for content_type in self.potential_content_types:
@@ -63,7 +63,7 @@ class TypedCollection(FileSet, metaclass=ABCMeta):
                 content_types.append(content_type)  # type: ignore[arg-type]
         return tuple(content_types)
 
-    @classproperty  # type: ignore[arg-type]
+    @cached_classproperty  # type: ignore[arg-type]
     def unconstrained(cls) -> bool:
         """Whether the file-format is unconstrained by extension, magic number or another
         constraint"""
@@ -1,9 +1,20 @@
 from abc import ABCMeta
+from collections import deque
+from copy import copy
+from pathlib import Path
+import tempfile
 import typing as ty
+from types import TracebackType
 import logging
-from .exceptions import FormatDefinitionError
+from .exceptions import (
+    FormatDefinitionError,
+    FileFormatsError,
+    AmbiguousConverterError,
+    FormatConversionError,
+)
 from .classifier import Classifier
 from .datatype import DataType
+from .utils import forget_missing_extras_modules, set_cwd
 
 if ty.TYPE_CHECKING:
     from pydra.engine.specs import TaskDef
@@ -15,6 +26,11 @@ logger = logging.getLogger("fileformats")
 T = ty.TypeVar("T")
 DT = ty.TypeVar("DT", bound=DataType)
 
+# The maximum number of converters chained together to convert between two formats
+CONVERTER_ROUTE_MAX_HOPS = 4
+
+ConverterRoute = ty.List[ty.Tuple[ty.Type["fileformats.core.FileSet"], "Converter"]]
+
 
 class SubtypeVar:
     """To handle the case where the target format is a placeholder (type-var) defined by
@@ -134,6 +150,7 @@ class SubtypeVar:
             )
 
         cls.converters[source_format] = converter  # type: ignore
+        converters_changed()
 
 
 class Converter:
@@ -167,3 +184,351 @@ class Converter:
             and self.in_file == other.in_file
             and self.out_file == other.out_file
         )
+
+
+class ConversionChain:
+    """A picklable callable that runs the converters along a route, so the conversion
+    of many file-sets can be spread across a pool of processes. Within worker processes
+    (see `run_in_worker`), the functions underlying Python converter tasks are called
+    directly, each in a fresh temporary working directory, bypassing the construction
+    of a Pydra task for each file-set. Otherwise, and for other converters (e.g. shell
+    commands), the converters are run as Pydra tasks.
+
+    Parameters
+    ----------
+    route : list[tuple[type, Converter]]
+        the formats converted into at each step of the route and the converters used
+        to convert into them, as returned by `FileSet.get_converter_route`
+    **kwargs
+        args to customise the final converter of the route with
+    """
+
+    steps: ty.List["_ConversionStep"]
+
+    def __init__(self, route: ConverterRoute, **kwargs: ty.Any):
+        self.steps = [
+            _ConversionStep(target_format, converter, **kwargs)
+            if i == len(route) - 1
+            else _ConversionStep(target_format, converter)
+            for i, (target_format, converter) in enumerate(route)
+        ]
+
+    @property
+    def direct(self) -> bool:
+        """Whether the functions underlying all the converters can be called directly"""
+        return all(step.function is not None for step in self.steps)
+
+    def __call__(
+        self, fileset: "fileformats.core.FileSet"
+    ) -> "fileformats.core.FileSet":
+        return self._run(fileset, direct=False)
+
+    def run_in_worker(
+        self, fileset: "fileformats.core.FileSet"
+    ) -> "fileformats.core.FileSet":
+        """Runs the conversion in a dedicated worker process, in which the working
+        directory can be changed without affecting other conversions, so the functions
+        underlying Python converter tasks are called directly"""
+        return self._run(fileset, direct=True)
+
+    def _run(
+        self, fileset: "fileformats.core.FileSet", direct: bool
+    ) -> "fileformats.core.FileSet":
+        if not self.steps:
+            return copy(fileset)
+        converted = fileset
+        for step in self.steps:
+            converted = step(converted, direct=direct)
+        return converted
+
+
+class _ConversionStep:
+    """Converts a file-set into the target format, calling the function underlying
+    Python converter tasks directly where permitted"""
+
+    target_format: ty.Type["fileformats.core.FileSet"]
+    converter: ty.Optional["Converter"]
+    kwargs: ty.Dict[str, ty.Any]
+    function: ty.Optional[ty.Callable[..., ty.Any]]
+    task_class: ty.Optional[type]
+    function_inputs: ty.Dict[str, ty.Any]
+    in_file: str
+    output_index: ty.Optional[int]
+
+    def __init__(
+        self,
+        target_format: ty.Type["fileformats.core.FileSet"],
+        converter: "Converter",
+        **kwargs: ty.Any,
+    ):
+        import attrs
+
+        self.target_format = target_format
+        self.converter = converter
+        self.kwargs = kwargs
+        self.function = None
+        self.task_class = None
+        self.function_inputs = {}
+        self.in_file = converter.in_file
+        self.output_index = None
+        task_def = (
+            attrs.evolve(converter.task_def, **kwargs) if kwargs else converter.task_def
+        )
+        function = getattr(task_def, "function", None)
+        if not callable(function):
+            return  # not a Python task
+        try:
+            inputs = attrs.asdict(task_def, recurse=False)
+            output_names = [f.name for f in attrs.fields(task_def.Outputs)]
+        except (AttributeError, TypeError, attrs.exceptions.NotAnAttrsClassError):
+            return
+        if converter.out_file not in output_names:
+            return
+        self.function = function
+        if _task_function(type(task_def)) is function:
+            self.task_class = type(task_def)
+        self.function_inputs = {
+            n: v
+            for n, v in inputs.items()
+            if n not in ("function", self.in_file)
+            and not n.startswith("_")
+            and v is not attrs.NOTHING
+        }
+        if len(output_names) > 1:
+            self.output_index = output_names.index(converter.out_file)
+
+    def __getstate__(self) -> ty.Dict[str, ty.Any]:
+        state = self.__dict__.copy()
+        if self.function is not None:
+            # The task definition isn't required to call the function (and may not be
+            # picklable), so it isn't sent to worker processes
+            state["converter"] = None
+        if self.task_class is not None:
+            # Pydra replaces the function with the task class in its module, so the
+            # function can't be pickled by reference and is looked up from the task
+            # class when unpickled instead
+            state["function"] = None
+        return state
+
+    def __setstate__(self, state: ty.Dict[str, ty.Any]) -> None:
+        self.__dict__.update(state)
+        if self.task_class is not None:
+            self.function = _task_function(self.task_class)
+
+    def __call__(
+        self, fileset: "fileformats.core.FileSet", direct: bool = False
+    ) -> "fileformats.core.FileSet":
+        if self.function is None or not direct:
+            assert self.converter is not None
+            return self.target_format._run_converter(
+                self.converter, fileset, **self.kwargs
+            )
+        # Like Pydra, run the function in its own working directory, so outputs written
+        # to relative paths don't clash with those of other conversions. The directory
+        # isn't deleted as the outputs are left in it
+        with set_cwd(Path(tempfile.mkdtemp(prefix="fileformats-convert-"))):
+            out_file = self.function(**self.function_inputs, **{self.in_file: fileset})
+            if self.output_index is not None:
+                out_file = out_file[self.output_index]
+            # Created within the working directory so relative paths are resolved
+            # against it
+            if not isinstance(out_file, self.target_format):
+                out_file = self.target_format(out_file)
+        return out_file
+
+
+def _task_function(task_class: type) -> ty.Optional[ty.Callable[..., ty.Any]]:
+    """Returns the function wrapped by a Python task class, or None if it isn't one"""
+    import attrs
+
+    try:
+        function = attrs.fields_dict(task_class)["function"].default
+    except (KeyError, TypeError, attrs.exceptions.NotAnAttrsClassError):
+        return None
+    return function if callable(function) else None
+
+
+def register_converter_target(target_format: type) -> None:
+    """Adds a format to the nodes of the converter graph that converters are registered
+    to. Called when a converter is registered to the format
+
+    Parameters
+    ----------
+    target_format : type
+        the format (or unclassified template of a format) converters are registered to
+    """
+    _converter_targets[target_format] = None
+    converters_changed()
+
+
+def converters_changed() -> None:
+    """Invalidates the cached converter resolutions and routes, and the failed attempts
+    to import extras modules, after the set of registered converters has changed"""
+    global _converters_version
+    _converters_version += 1
+    converter_resolutions.clear()
+    _converter_routes.clear()
+    forget_missing_extras_modules()
+
+
+def converters_version() -> int:
+    """Returns a counter that is incremented each time a converter is registered, so
+    cached lookups computed while converters were being registered can be discarded"""
+    return _converters_version
+
+
+def find_converter_route(
+    source_format: ty.Type["fileformats.core.FileSet"],
+    target_format: ty.Type["fileformats.core.FileSet"],
+    max_hops: ty.Optional[int] = None,
+) -> ty.Optional[ConverterRoute]:
+    """Searches the graph of registered converters for the shortest chain of converters
+    (i.e. the fewest number of hops) that converts from the source to the target format.
+    Routes are cached until another converter is registered.
+
+    Parameters
+    ----------
+    source_format : type
+        the format to convert from
+    target_format : type
+        the format to convert to
+    max_hops : int, optional
+        the maximum number of converters to chain together, by default
+        CONVERTER_ROUTE_MAX_HOPS
+
+    Returns
+    -------
+    list[tuple[type, Converter]] or None
+        the intermediate (and final) formats along the route, paired with the
+        converters used to convert into them, or None if there is no route between the
+        formats
+
+    Raises
+    ------
+    AmbiguousConverterError
+        if more than one converter is registered between the formats at the last hop of
+        the shortest route
+    """
+    if max_hops is None:
+        max_hops = CONVERTER_ROUTE_MAX_HOPS
+    key = (source_format, target_format, max_hops)
+    try:
+        route = _converter_routes[key]
+    except KeyError:
+        pass
+    else:
+        return list(route) if route is not None else None
+    version = _converters_version
+    route = _search_converter_route(source_format, target_format, max_hops)
+    # Only store the route if no converters were registered (e.g. by importing extras
+    # modules) during the search, as they could provide a shorter route
+    if version == _converters_version:
+        _converter_routes[key] = route
+    return list(route) if route is not None else None
+
+
+def _search_converter_route(
+    source_format: ty.Type["fileformats.core.FileSet"],
+    target_format: ty.Type["fileformats.core.FileSet"],
+    max_hops: int,
+) -> ty.Optional[ConverterRoute]:
+    """Breadth-first search of the converter graph, so the first route found is the one
+    with the fewest hops"""
+    route: ConverterRoute
+    visited = {source_format}
+    queue = deque([(source_format, [])])  # type: ignore[var-annotated]
+    while queue:
+        node, route = queue.popleft()
+        converter = _converter_between(node, target_format)
+        if converter is not None:
+            return route + [(target_format, converter)]
+        if len(route) + 1 >= max_hops:
+            continue
+        for hop_format, converter in _converters_from(node):
+            if hop_format not in visited and not issubclass(node, hop_format):
+                visited.add(hop_format)
+                queue.append((hop_format, route + [(hop_format, converter)]))
+    return None
+
+
+def _converter_between(
+    source_format: ty.Type["fileformats.core.FileSet"],
+    target_format: ty.Type["fileformats.core.FileSet"],
+) -> ty.Optional["Converter"]:
+    """Returns the converter registered directly between two formats, or None if there
+    isn't one. Raises an AmbiguousConverterError if there is more than one"""
+    try:
+        return target_format.get_converter(source_format)
+    except AmbiguousConverterError:
+        raise
+    except (FileFormatsError, TypeError):
+        return None
+
+
+def _hop_converter(
+    source_format: ty.Type["fileformats.core.FileSet"],
+    target_format: ty.Type["fileformats.core.FileSet"],
+) -> ty.Optional["Converter"]:
+    """Returns the converter into an intermediate format along a route, or None if there
+    isn't one or it is ambiguous (in which case routes via the format are skipped)"""
+    try:
+        return _converter_between(source_format, target_format)
+    except AmbiguousConverterError as e:
+        logger.debug("Not converting via '%s': %s", target_format, e)
+        return None
+
+
+def _converters_from(
+    source_format: ty.Type["fileformats.core.FileSet"],
+) -> ty.Iterator[ty.Tuple[ty.Type["fileformats.core.FileSet"], "Converter"]]:
+    """Yields the formats that can be converted into directly from the source format
+    (i.e. the edges of the converter graph), along with the converters to use"""
+    from fileformats.core import FileSet
+
+    for target_format in list(_converter_targets):
+        candidates = []
+        for template, converter in target_format.__dict__.get("converters", {}).items():
+            classifiers: ty.Optional[ty.Tuple[type, ...]] = None
+            if not converter.classifiers:
+                if issubclass(source_format, template):
+                    candidates.append(target_format)
+            elif issubclass(template, SubtypeVar):
+                # e.g. AnyFormat -> Gzip[AnyFormat]
+                if len(converter.classifiers) == 1 and issubclass(
+                    source_format, template.bound
+                ):
+                    classifiers = (source_format,)
+            elif getattr(source_format, "is_classified", False) and issubclass(
+                source_format.unclassified, template.unclassified  # type: ignore
+            ):
+                # e.g. Zip[AnyFormat] -> Gzip[AnyFormat]
+                classifiers = source_format.classifiers  # type: ignore[attr-defined]
+            if classifiers is not None:
+                try:
+                    candidates.append(target_format[classifiers])  # type: ignore
+                except (FileFormatsError, TypeError):
+                    pass  # not a valid classification of the target format
+        for candidate in dict.fromkeys(candidates):
+            converter = _hop_converter(source_format, candidate)
+            if converter is not None:
+                yield candidate, converter
+    # e.g. Gzip[AnyFormat] -> AnyFormat
+    if SubtypeVar.converters and getattr(source_format, "is_classified", False):
+        for classifier in source_format.classifiers:  # type: ignore[attr-defined]
+            if isinstance(classifier, type) and issubclass(classifier, FileSet):
+                converter = _hop_converter(source_format, classifier)
+                if converter is not None:
+                    yield classifier, converter
+
+
+# Formats that converters have been registered to, in order of registration
+_converter_targets: ty.Dict[type, None] = {}
+# Incremented each time a converter is registered, to invalidate cached lookups
+_converters_version = 0
+# Converters resolved by FileSet.get_converter, keyed by the target and source formats,
+# or the errors raised (along with their tracebacks) if they couldn't be resolved
+converter_resolutions: ty.Dict[
+    ty.Tuple[type, type],
+    ty.Union["Converter", ty.Tuple[FormatConversionError, ty.Optional[TracebackType]]],
+] = {}
+_converter_routes: ty.Dict[ty.Tuple[type, type, int], ty.Optional[ConverterRoute]] = {}
@@ -0,0 +1,1143 @@
+import os
+import sys
+import stat
+import errno
+import time
+import hashlib
+import tempfile
+import shutil
+import logging
+import typing as ty
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from threading import Lock
+from pathlib import Path
+from .typing import PathType, CryptoMethod
+from .cache import digest_cache
+from .decorators import enough_time_has_elapsed_given_mtime_resolution
+from .exceptions import TransferVerificationError
+
+
+logger = logging.getLogger("fileformats")
+
+
+# Linux ioctl request to clone (reflink) the contents of one file into another,
+# _IOW(0x94, 9, int) from linux/fs.h
+FICLONE = 0x40049409
+
+# Error numbers that indicate reflinks aren't supported between the given files, in
+# which case we fall back to a full copy
+REFLINK_UNSUPPORTED_ERRNOS = frozenset(
+    getattr(errno, name)
+    for name in (
+        "EOPNOTSUPP",
+        "ENOTSUP",
+        "ENOTTY",
+        "EXDEV",
+        "EINVAL",
+        "ENOSYS",
+        "EBADF",
+        "EPERM",
+    )
+    if hasattr(errno, name)
+)
+
+# The maximum number of bytes copied by each kernel-side copy call, large chunks
+# minimise the number of system calls while allowing the copy to be interrupted
+COPY_CHUNK_SIZE = 64 * 1024 * 1024  # 64 MiB
+
+# The size of the buffer used when falling back to copying via userspace
+BUFFERED_COPY_SIZE = 1024 * 1024  # 1 MiB
+
+# The size of the chunks streamed between file-systems when moving files across them,
+# between which progress is reported
+MOVE_CHUNK_SIZE = 8 * 1024 * 1024  # 8 MiB
+
+# Suffix appended to the names of files while they are being streamed to a different
+# file-system, so interrupted moves can be resumed
+PARTIAL_SUFFIX = ".partial"
+# Number of hex digits of the digest of the identity of the original file included in
+# the names of partial files
+PARTIAL_ID_LENGTH = 16
+
+# Error numbers that indicate a kernel-side copy method isn't supported between the
+# given files, in which case we fall back to the next method
+KERNEL_COPY_UNSUPPORTED_ERRNOS = frozenset(
+    getattr(errno, name)
+    for name in (
+        "EOPNOTSUPP",
+        "ENOTSUP",
+        "EXDEV",
+        "EINVAL",
+        "ENOSYS",
+        "EBADF",
+        "EPERM",
+    )
+    if hasattr(errno, name)
+)
+
+
+class DestinationIndex:
+    """An in-memory index of the entries within destination directories, which can be
+    passed as the `avoid_clashes` argument of `FileSet.copy`/`move` (and their bulk
+    variants) in place of a set of paths. Avoids clashes with both the existing entries
+    of the destination directories and the paths added by previous copies/moves, so
+    that a series of copies into the same directory is guaranteed to have unique paths.
+
+    Each directory is listed once with `os.scandir` the first time a path within it is
+    checked, after which checks are in-memory. The index also remembers the clash
+    counter at which a free name was last found for each set of candidate names, so
+    the search for a free name for the next file-set with the same names resumes from
+    there instead of re-checking every name before it.
+
+    Note that changes made to the destination directories by anything other than the
+    copies/moves the index is passed to are not tracked once they have been listed.
+
+    Parameters
+    ----------
+    paths : Iterable[PathType], optional
+        paths to add to the index in addition to the existing entries of the
+        directories
+    """
+
+    def __init__(self, paths: ty.Iterable[PathType] = ()):
+        self._listings: ty.Dict[Path, ty.Set[str]] = {}
+        self._counters: ty.Dict[ty.Hashable, int] = {}
+        self._lock = Lock()
+        self.update(paths)
+
+    def __contains__(self, path: object) -> bool:
+        if not isinstance(path, (str, os.PathLike)):
+            return False
+        path = Path(path)
+        with self._lock:
+            return path.name in self._listing(path.parent)
+
+    def add(self, path: PathType) -> None:
+        """Adds a path to the index, e.g. one that is about to be written
+
+        Parameters
+        ----------
+        path : PathType
+            the path to add
+        """
+        path = Path(path)
+        with self._lock:
+            self._listing(path.parent).add(path.name)
+            # Register any directories that will be created to hold the path in the
+            # listings of their parents
+            while path.parent != path:
+                path = path.parent
+                listing = self._listings.get(path.parent)
+                if listing is None or path.name in listing:
+                    break
+                listing.add(path.name)
+
+    def update(self, paths: ty.Iterable[PathType]) -> None:
+        """Adds several paths to the index
+
+        Parameters
+        ----------
+        paths : Iterable[PathType]
+            the paths to add
+        """
+        for path in paths:
+            self.add(path)
+
+    def counter_hint(self, key: ty.Hashable) -> int:
+        """Returns the clash counter at which a free name was last found for the given
+        candidate names, which is where the search for the next free name should start
+
+        Parameters
+        ----------
+        key : Hashable
+            identifies the candidate names, e.g. the destination paths without a counter
+
+        Returns
+        -------
+        int
+            the counter to start the search from
+        """
+        return self._counters.get(key, 0)
+
+    def record_counter(self, key: ty.Hashable, counter: int) -> None:
+        """Records the clash counter at which a free name was found for the given
+        candidate names
+
+        Parameters
+        ----------
+        key : Hashable
+            identifies the candidate names, e.g. the destination paths without a counter
+        counter : int
+            the counter of the free name
+        """
+        self._counters[key] = counter
+
+    def _listing(self, dpath: Path) -> ty.Set[str]:
+        try:
+            return self._listings[dpath]
+        except KeyError:
+            pass
+        try:
+            with os.scandir(dpath) as entries:
+                listing = set(e.name for e in entries)
+        except (FileNotFoundError, NotADirectoryError):
+            listing = set()
+        self._listings[dpath] = listing
+        return listing
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(<{len(self._listings)} directories>)"
+
+
+class TransferProgress:
+    """Tracks the progress of a transfer (e.g. a move) of a number of files, and passes
+    it to a callback each time it advances. Can be shared between threads.
+
+    Parameters
+    ----------
+    callback : Callable[[TransferProgress], None], optional
+        called with the progress object each time a chunk of data or a file has been
+        transferred
+    files_total : int, optional
+        the total number of files to be transferred, by default 0 (unknown)
+    bytes_total : int, optional
+        the total number of bytes to be transferred, by default 0 (unknown)
+    """
+
+    def __init__(
+        self,
+        callback: ty.Optional[ty.Callable[["TransferProgress"], None]] = None,
+        files_total: int = 0,
+        bytes_total: int = 0,
+    ):
+        self.callback = callback
+        self.files_total = files_total
+        self.bytes_total = bytes_total
+        self.files_done = 0
+        self.bytes_done = 0
+        self.start_time = time.monotonic()
+        self._lock = Lock()
+
+    @classmethod
+    def of_paths(
+        cls,
+        fspaths: ty.Iterable[Path],
+        callback: ty.Optional[ty.Callable[["TransferProgress"], None]] = None,
+    ) -> "TransferProgress":
+        """Creates a progress tracker for the transfer of the given paths, including the
+        files within any directories, with the totals counted up front
+
+        Parameters
+        ----------
+        fspaths : Iterable[Path]
+            the paths to be transferred
+        callback : Callable[[TransferProgress], None], optional
+            called each time the transfer progresses
+
+        Returns
+        -------
+        TransferProgress
+            the progress tracker
+        """
+        files_total = bytes_total = 0
+        for fspath in fspaths:
+            if fspath.is_dir() and not fspath.is_symlink():
+                for dpath, _, fnames in os.walk(fspath):
+                    for fname in fnames:
+                        files_total += 1
+                        bytes_total += os.lstat(os.path.join(dpath, fname)).st_size
+            else:
+                files_total += 1
+                bytes_total += os.lstat(fspath).st_size
+        return cls(callback, files_total=files_total, bytes_total=bytes_total)
+
+    @property
+    def elapsed(self) -> float:
+        "The time elapsed since the transfer started in seconds"
+        return time.monotonic() - self.start_time
+
+    @property
+    def throughput(self) -> float:
+        "The average number of bytes transferred per second"
+        elapsed = self.elapsed
+        return self.bytes_done / elapsed if elapsed else 0.0
+
+    def advance(self, num_bytes: int = 0, num_files: int = 0) -> None:
+        """Records that more bytes and/or files have been transferred and passes the
+        updated progress to the callback
+
+        Parameters
+        ----------
+        num_bytes : int, optional
+            the number of bytes transferred since the last update
+        num_files : int, optional
+            the number of files completed since the last update
+        """
+        with self._lock:
+            self.bytes_done += num_bytes
+            self.files_done += num_files
+            if self.callback is not None:
+                self.callback(self)
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(files={self.files_done}/{self.files_total}, "
+            f"bytes={self.bytes_done}/{self.bytes_total})"
+        )
+
+
+class TransferMetrics:
+    """The metrics of the transfer of a single file between file-systems, which are
+    passed to the hook set by `set_transfer_metrics_hook`
+
+    Parameters
+    ----------
+    src : Path
+        the original path of the file
+    dest : Path
+        the new path of the file
+    num_bytes : int
+        the size of the file
+    resumed_bytes : int
+        the number of bytes that had already been transferred by a previous,
+        interrupted, transfer and didn't need to be transferred again
+    duration : float
+        the time taken to transfer the file (including verification) in seconds
+    verified : bool
+        whether the transferred file was verified against the original
+    """
+
+    def __init__(
+        self,
+        src: Path,
+        dest: Path,
+        num_bytes: int,
+        resumed_bytes: int,
+        duration: float,
+        verified: bool,
+    ):
+        self.src = src
+        self.dest = dest
+        self.num_bytes = num_bytes
+        self.resumed_bytes = resumed_bytes
+        self.duration = duration
+        self.verified = verified
+
+    @property
+    def throughput(self) -> float:
+        "The number of bytes transferred (excluding resumed bytes) per second"
+        transferred = self.num_bytes - self.resumed_bytes
+        return transferred / self.duration if self.duration else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(src={str(self.src)!r}, dest={str(self.dest)!r}, "
+            f"num_bytes={self.num_bytes}, duration={self.duration:.3f})"
+        )
+
+
+def set_transfer_metrics_hook(
+    hook: ty.Optional[ty.Callable[[TransferMetrics], None]]
+) -> None:
+    """Sets a hook that is called with the metrics of each file that is streamed
+    between file-systems when it is moved (e.g. to report throughput to a monitoring
+    system)
+
+    Parameters
+    ----------
+    hook : Callable[[TransferMetrics], None] or None
+        the hook to call, or None to remove the current hook
+    """
+    global _transfer_metrics_hook
+    _transfer_metrics_hook = hook
+
+
+def move_path(
+    src: Path,
+    dest: Path,
+    progress: ty.Optional[TransferProgress] = None,
+    verify: bool = True,
+) -> None:
+    """Moves a file or directory. Paths on the same file-system are simply renamed,
+    otherwise the files are streamed to the destination (see `move_file`), with the
+    directory structure recreated and the original directories removed once they are
+    empty.
+
+    Parameters
+    ----------
+    src : Path
+        the path to move
+    dest : Path
+        the new path
+    progress : TransferProgress, optional
+        tracks the progress of the move
+    verify : bool, optional
+        whether to verify the contents of files streamed to a different file-system
+        against the originals before they are deleted, by default True
+    """
+    if src.is_symlink():
+        os.symlink(os.readlink(src), dest)
+        os.unlink(src)
+        if progress is not None:
+            progress.advance(num_files=1)
+        return
+    try:
+        os.rename(src, dest)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+    else:
+        if progress is not None:
+            tracker = TransferProgress.of_paths([dest])
+            progress.advance(tracker.bytes_total, tracker.files_total)
+        return
+    if not src.is_dir():
+        move_file(src, dest, progress=progress, verify=verify)
+        return
+    dirs: ty.List[ty.Tuple[Path, Path]] = []
+    for dpath_str, dnames, fnames in os.walk(src):
+        dpath = Path(dpath_str)
+        dest_dpath = dest / dpath.relative_to(src)
+        dest_dpath.mkdir(exist_ok=True)  # may exist if resuming
+        dirs.append((dpath, dest_dpath))
+        # Symlinks to directories are listed with the directories, but are recreated
+        # like symlinks to files rather than walked into
+        linked_dnames = [d for d in dnames if (dpath / d).is_symlink()]
+        dnames[:] = [d for d in dnames if d not in linked_dnames]
+        for dname in linked_dnames:
+            move_path(dpath / dname, dest_dpath / dname, progress, verify)
+        file_paths = [dpath / f for f in fnames]
+        linked = [p for p in file_paths if p.is_symlink()]
+        for fpath in linked:
+            move_path(fpath, dest_dpath / fpath.name, progress, verify)
+        file_paths = [p for p in file_paths if p not in linked]
+        # The stale partial files of the whole directory are removed in one scan, instead
+        # of scanning the directory again for each file moved into it
+        _remove_stale_partials(
+            dest_dpath,
+            {
+                p.name: _partial_path(dest_dpath / p.name, os.stat(p)).name
+                for p in file_paths
+            },
+        )
+        for fpath in file_paths:
+            move_file(
+                fpath,
+                dest_dpath / fpath.name,
+                progress=progress,
+                verify=verify,
+                remove_stale_partials=False,
+            )
+    for dpath, dest_dpath in reversed(dirs):
+        shutil.copystat(dpath, dest_dpath)
+        os.rmdir(dpath)
+
+
+def move_file(
+    src: Path,
+    dest: Path,
+    progress: ty.Optional[TransferProgress] = None,
+    verify: bool = True,
+    remove_stale_partials: bool = True,
+) -> None:
+    """Moves a file to a different file-system by streaming its contents to a partial
+    file alongside the destination (with PARTIAL_SUFFIX appended to its name), which is
+    flushed to disk and verified against the original before it is renamed to the
+    destination and the original is deleted.
+
+    The name of the partial file identifies the original by its size, modification
+    time and inode, so if a partial file is left by a previous move of the same
+    unmodified file that was interrupted, the move resumes from the end of it. Partial
+    files left by moves of different versions of the file are deleted. The resumed file
+    is verified against the original (if `verify` is set) and if it doesn't match, the
+    move is restarted from the beginning.
+
+    Parameters
+    ----------
+    src : Path
+        the file to move
+    dest : Path
+        the new path of the file
+    progress : TransferProgress, optional
+        tracks the progress of the move
+    verify : bool, optional
+        whether to verify the contents of the new file against the original before it
+        is deleted, by default True
+    remove_stale_partials : bool, optional
+        whether to remove partial files left by moves of other versions of the file,
+        by default True. Disabled when they have already been removed from the
+        destination directory as a whole
+
+    Raises
+    ------
+    TransferVerificationError
+        if the new file doesn't match the original
+    """
+    start_time = time.monotonic()
+    src_stat = os.stat(src)
+    size = src_stat.st_size
+    partial = _partial_path(dest, src_stat)
+    if remove_stale_partials:
+        _remove_stale_partials(dest.parent, {dest.name: partial.name})
+    try:
+        resumed = os.stat(partial).st_size
+    except FileNotFoundError:
+        resumed = 0
+    if resumed > size:
+        resumed = 0
+    src_digest = _stream_file(src, partial, resumed, progress, verify)
+    if verify:
+        mismatch = os.stat(partial).st_size != size or (
+            src_digest != file_digest(partial)
+        )
+        if mismatch and resumed:
+            logger.info(
+                "Resumed move of '%s' to '%s' doesn't match the original, restarting",
+                src,
+                dest,
+            )
+            if progress is not None:
+                progress.advance(num_bytes=-size)
+            resumed = 0
+            src_digest = _stream_file(src, partial, 0, progress, verify)
+            mismatch = os.stat(partial).st_size != size or (
+                src_digest != file_digest(partial)
+            )
+        if mismatch:
+            raise TransferVerificationError(
+                f"The contents of '{partial}' don't match '{src}', which hasn't been "
+                "deleted"
+            )
+    shutil.copystat(src, partial)
+    os.replace(partial, dest)
+    os.unlink(src)
+    if progress is not None:
+        progress.advance(num_files=1)
+    if _transfer_metrics_hook is not None:
+        _transfer_metrics_hook(
+            TransferMetrics(
+                src=src,
+                dest=dest,
+                num_bytes=size,
+                resumed_bytes=resumed,
+                duration=time.monotonic() - start_time,
+                verified=verify,
+            )
+        )
+
+
+def reflink_file(src: Path, dest: Path) -> None:
+    """Creates a copy-on-write clone (reflink) of a file, which shares the data blocks
+    of the source file until either is modified and so is created in constant time.
+    Falls back to a full copy if the platform or file-system doesn't support reflinks.
+
+    Parameters
+    ----------
+    src : Path
+        the file to clone
+    dest : Path
+        the path of the clone to create
+    """
+    try:
+        _clone(src, dest)
+    except OSError as e:
+        if e.errno not in REFLINK_UNSUPPORTED_ERRNOS:
+            raise
+        logger.debug(
+            "Could not reflink '%s' to '%s' (%s), falling back to a full copy",
+            src,
+            dest,
+            e,
+        )
+        copy_file(src, dest)
+
+
+def reflink_dir(src: Path, dest: Path, max_workers: ty.Optional[int] = None) -> None:
+    """Recursively clones a directory tree using reflinks for the files within it (see
+    `reflink_file`)
+
+    Parameters
+    ----------
+    src : Path
+        the directory to clone
+    dest : Path
+        the path of the new directory
+    max_workers : int, optional
+        the number of threads to clone the files with, by default they are cloned
+        one after another
+    """
+    copy_tree(src, dest, _reflink_with_metadata, max_workers=max_workers)
+
+
+def hardlink_dir(src: Path, dest: Path, max_workers: ty.Optional[int] = None) -> None:
+    """Recreates a directory tree, hard-linking the files within it to the originals.
+    Symlinks to directories within the tree aren't followed (and so aren't recreated),
+    so cyclic links can't be descended into endlessly
+
+    Parameters
+    ----------
+    src : Path
+        the directory to link
+    dest : Path
+        the path of the new directory
+    max_workers : int, optional
+        the number of threads to link the files with, by default they are linked
+        one after another
+    """
+    copy_tree(
+        src,
+        dest,
+        os.link,
+        max_workers=max_workers,
+        copy_metadata=False,
+        follow_symlinks=False,
+    )
+
+
+def copy_file(src: Path, dest: Path) -> None:
+    """Copies the contents of a file (but not its metadata) to a new file.
+
+    The data is copied within the kernel where possible, using `os.copy_file_range`
+    (which can also be offloaded to the storage, e.g. server-side copies on NFS) or
+    failing that `os.sendfile`, in chunks of COPY_CHUNK_SIZE so that it doesn't pass
+    through userspace buffers. Falls back to a buffered copy if neither is supported
+    between the given files (e.g. across some file-systems or on non-Linux platforms).
+    Holes in sparse files are preserved where the platform supports SEEK_DATA/SEEK_HOLE.
+
+    Parameters
+    ----------
+    src : Path
+        the file to copy
+    dest : Path
+        the path of the new file
+    """
+    with open(src, "rb") as src_file, open(dest, "wb") as dest_file:
+        src_fd = src_file.fileno()
+        dest_fd = dest_file.fileno()
+        size = os.fstat(src_fd).st_size
+        if not size:
+            # Pseudo-files (e.g. on procfs) can report a size of zero despite having
+            # contents, so read until EOF
+            while True:
+                copied = _buffered_copy(src_fd, dest_fd, size, BUFFERED_COPY_SIZE)
+                if not copied:
+                    break
+                size += copied
+            os.ftruncate(dest_fd, size)
+            return
+        methods = list(_KERNEL_COPY_METHODS)
+        for start, end in _data_segments(src_fd, size):
+            copied_to = _copy_range(src_fd, dest_fd, start, end, methods)
+            if copied_to < end:
+                if os.fstat(src_fd).st_size > copied_to:
+                    raise OSError(
+                        errno.EIO,
+                        f"Reached EOF at {copied_to} bytes before the end of the "
+                        f"source file ({end} bytes)",
+                        str(src),
+                    )
+                size = copied_to  # the source was truncated during the copy
+                break
+        # Set the size explicitly in case the file ends in a hole
+        os.ftruncate(dest_fd, size)
+
+
+def copy_with_metadata(src: PathType, dest: PathType) -> None:
+    """Copies the contents and metadata (i.e. permissions and timestamps) of a file,
+    using `copy_file` to copy the contents. Equivalent to `shutil.copy2` for file
+    destinations, so can be used as the copy function of `shutil.copytree`.
+
+    Parameters
+    ----------
+    src : PathType
+        the file to copy
+    dest : PathType
+        the path of the new file
+    """
+    copy_file(Path(src), Path(dest))
+    shutil.copystat(src, dest)
+
+
+def copy_dir(src: Path, dest: Path, max_workers: ty.Optional[int] = None) -> None:
+    """Recursively copies a directory tree, using `copy_file` to copy the contents of
+    the files within it
+
+    Parameters
+    ----------
+    src : Path
+        the directory to copy
+    dest : Path
+        the path of the new directory
+    max_workers : int, optional
+        the number of threads to copy the files with, by default they are copied
+        one after another
+    """
+    copy_tree(src, dest, copy_with_metadata, max_workers=max_workers)
+
+
+def copy_tree(
+    src: Path,
+    dest: Path,
+    copy_function: ty.Callable[[PathType, PathType], ty.Any],
+    max_workers: ty.Optional[int] = None,
+    copy_metadata: bool = True,
+    follow_symlinks: bool = True,
+) -> None:
+    """Recreates a directory tree, transferring the files within it with the given
+    function. Similar to `shutil.copytree` except that the files can be transferred in
+    parallel (see `transfer`) after the directories have been created, which speeds up
+    the copying of large numbers of small files on latency-bound file-systems (e.g.
+    NFS or Lustre).
+
+    Parameters
+    ----------
+    src : Path
+        the directory to copy
+    dest : Path
+        the path of the new directory, which must not already exist
+    copy_function : Callable[[PathType, PathType], Any]
+        the function used to transfer the files within the tree
+    max_workers : int, optional
+        the number of threads to transfer the files with, by default they are
+        transferred one after another
+    copy_metadata : bool, optional
+        whether to copy the permissions and timestamps of the directories, by default
+        True
+    follow_symlinks : bool, optional
+        whether to walk into symlinks to directories within the tree (like
+        `shutil.copytree`) or skip them, by default True
+    """
+    dirs: ty.List[ty.Tuple[Path, Path]] = []
+    pairs: ty.List[ty.Tuple[Path, Path]] = []
+    # Directories are created in walk order (i.e. parents before children) so that
+    # they exist before any of the files within them are transferred
+    for dpath_str, dnames, fnames in os.walk(src, followlinks=follow_symlinks):
+        dpath = Path(dpath_str)
+        dest_dpath = dest / dpath.relative_to(src)
+        dest_dpath.mkdir(parents=dest_dpath == dest)
+        dirs.append((dpath, dest_dpath))
+        pairs.extend((dpath / n, dest_dpath / n) for n in fnames)
+    transfer(pairs, copy_function, max_workers=max_workers)
+    if copy_metadata:
+        # Children first, so the timestamps of the parents aren't altered afterwards
+        for dpath, dest_dpath in reversed(dirs):
+            shutil.copystat(dpath, dest_dpath)
+
+
+def transfer(
+    pairs: ty.Sequence[ty.Tuple[Path, Path]],
+    transfer_function: ty.Callable[[Path, Path], ty.Any],
+    max_workers: ty.Optional[int] = None,
+) -> None:
+    """Transfers (e.g. copies, links or moves) each source path to its destination,
+    optionally across a pool of threads. The parent directories of the destinations
+    should already exist.
+
+    If any of the transfers fail, the remaining transfers that come after the failed
+    one in the sequence are cancelled, and the error raised by the first failed transfer
+    in sequence order is re-raised once all running transfers are complete. The error
+    raised is therefore the same regardless of the order the transfers complete in.
+
+    Parameters
+    ----------
+    pairs : Sequence[tuple[Path, Path]]
+        the source and destination paths to transfer
+    transfer_function : Callable[[Path, Path], Any]
+        the function used to transfer each source path to its destination
+    max_workers : int, optional
+        the number of threads to run the transfers across, by default they are run
+        one after another in the current thread
+    """
+    if not max_workers or max_workers <= 1 or len(pairs) <= 1:
+        for src, dest in pairs:
+            transfer_function(src, dest)
+        return
+    with ThreadPoolExecutor(
+        max_workers=min(max_workers, len(pairs)), thread_name_prefix="fileformats-copy"
+    ) as executor:
+        futures = [executor.submit(transfer_function, s, d) for s, d in pairs]
+        first_failed = len(futures)
+        for future in as_completed(futures):
+            if future.cancelled() or future.exception() is None:
+                continue
+            index = futures.index(future)
+            if index < first_failed:
+                for later in futures[index + 1 : first_failed]:
+                    later.cancel()
+                first_failed = index
+    if first_failed < len(futures):
+        futures[first_failed].result()  # re-raise the error
+
+
+def sync_file(src: Path, dest: Path, checksum: bool = False) -> bool:
+    """Copies a file (with its metadata) to the destination if the destination doesn't
+    exist or differs from the source, i.e. the sizes or modification times of the files
+    differ or, if `checksum` is set, the sizes or digests of their contents differ.
+
+    Updated files are copied to a temporary file alongside the destination and then
+    renamed over it, so that an interrupted sync never leaves a truncated file with
+    the same modification time as the source, and links at the destination are replaced
+    rather than written through.
+
+    Parameters
+    ----------
+    src : Path
+        the file to sync
+    dest : Path
+        the path to sync the file to
+    checksum : bool, optional
+        whether to compare the digests of the contents of the files instead of their
+        modification times, by default False
+
+    Returns
+    -------
+    bool
+        whether the file was transferred
+    """
+    src_stat = os.stat(src)
+    try:
+        dest_stat: ty.Optional[os.stat_result] = os.lstat(dest)
+    except FileNotFoundError:
+        dest_stat = None
+    if dest_stat is not None:
+        if stat.S_ISDIR(dest_stat.st_mode):
+            shutil.rmtree(dest)
+            dest_stat = None
+        elif stat.S_ISREG(dest_stat.st_mode) and dest_stat.st_size == src_stat.st_size:
+            if checksum:
+                if file_digest(src) == file_digest(dest):
+                    return False
+            elif dest_stat.st_mtime_ns == src_stat.st_mtime_ns:
+                return False
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{dest.name}.", dir=dest.parent)
+    os.close(fd)
+    try:
+        copy_with_metadata(src, tmp_path)
+        os.replace(tmp_path, dest)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return True
+
+
+def sync_dir(
+    src: Path,
+    dest: Path,
+    checksum: bool = False,
+    delete_extra: bool = False,
+    max_workers: ty.Optional[int] = None,
+) -> int:
+    """Syncs a directory tree to the destination, transferring only the files that are
+    missing or differ (see `sync_file`) and optionally deleting entries in the
+    destination tree that aren't in the source
+
+    Parameters
+    ----------
+    src : Path
+        the directory to sync
+    dest : Path
+        the path to sync the directory to
+    checksum : bool, optional
+        whether to compare the digests of the contents of the files instead of their
+        modification times, by default False
+    delete_extra : bool, optional
+        whether to delete files and directories in the destination tree that aren't in
+        the source tree, by default they are kept
+    max_workers : int, optional
+        the number of threads to transfer the files with, by default they are
+        transferred one after another
+
+    Returns
+    -------
+    int
+        the number of files transferred
+    """
+    dirs: ty.List[ty.Tuple[Path, Path]] = []
+    pairs: ty.List[ty.Tuple[Path, Path]] = []
+    to_visit = [(src, dest)]
+    # Directories are created before the directories within them are visited
+    while to_visit:
+        src_dpath, dest_dpath = to_visit.pop()
+        if dest_dpath.is_symlink() or (dest_dpath.exists() and not dest_dpath.is_dir()):
+            dest_dpath.unlink()
+        dest_dpath.mkdir(exist_ok=True)
+        dirs.append((src_dpath, dest_dpath))
+        src_names = set()
+        with os.scandir(src_dpath) as entries:
+            for entry in entries:
+                src_names.add(entry.name)
+                if entry.is_dir():
+                    to_visit.append((Path(entry.path), dest_dpath / entry.name))
+                else:
+                    pairs.append((Path(entry.path), dest_dpath / entry.name))
+        if delete_extra:
+            with os.scandir(dest_dpath) as entries:
+                extra = [e for e in entries if e.name not in src_names]
+            for entry in extra:
+                logger.debug("Deleting '%s' as it isn't in '%s'", entry.path, src_dpath)
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path)
+                else:
+                    os.unlink(entry.path)
+    transferred = []
+
+    def sync(src_fpath: Path, dest_fpath: Path) -> None:
+        if sync_file(src_fpath, dest_fpath, checksum=checksum):
+            transferred.append(dest_fpath)
+
+    transfer(pairs, sync, max_workers=max_workers)
+    # Children first, so the timestamps of the parents aren't altered afterwards
+    for src_dpath, dest_dpath in reversed(dirs):
+        shutil.copystat(src_dpath, dest_dpath)
+    return len(transferred)
+
+
+def file_digest(fspath: PathType, crypto: CryptoMethod = None) -> str:
+    """Returns the hex digest of the contents of a file. Digests are memoised in
+    `cache.digest_cache` against the modification time and size of the file, once
+    enough time has passed since the file was modified for changes to be detected.
+
+    Parameters
+    ----------
+    fspath : PathType
+        the file to digest
+    crypto : CryptoMethod, optional
+        the hashing algorithm to use, by default hashlib.sha256
+
+    Returns
+    -------
+    str
+        the hex digest of the file
+    """
+    if crypto is None:
+        crypto = hashlib.sha256
+    fspath = str(fspath)
+    fstat = os.stat(fspath)
+    key = (fspath, fstat.st_mtime_ns, fstat.st_size, crypto)
+    try:
+        return digest_cache[key]  # type: ignore[no-any-return]
+    except KeyError:
+        pass
+    crypto_obj = crypto()
+    with open(fspath, "rb") as f:
+        for chunk in iter(lambda: f.read(BUFFERED_COPY_SIZE), b""):
+            crypto_obj.update(chunk)
+    digest: str = crypto_obj.hexdigest()
+    if enough_time_has_elapsed_given_mtime_resolution([(fspath, fstat.st_mtime_ns)]):
+        digest_cache.put(key, digest)
+    return digest
+
+
+def _partial_path(dest: Path, src_stat: os.stat_result) -> Path:
+    """Returns the path of the partial file a move to the destination is streamed to,
+    which is named after the identity (size, modification time and inode) of the
+    original, so only moves of the same unmodified file are resumed from it"""
+    identity = hashlib.sha256(
+        f"{src_stat.st_size}:{src_stat.st_mtime_ns}:{src_stat.st_ino}".encode()
+    ).hexdigest()[:PARTIAL_ID_LENGTH]
+    return dest.with_name(f"{dest.name}.{identity}{PARTIAL_SUFFIX}")
+
+
+def _remove_stale_partials(dest_dir: Path, keep: ty.Mapping[str, str]) -> None:
+    """Removes partial files left by interrupted moves of other versions of files into
+    the destination directory
+
+    Parameters
+    ----------
+    dest_dir : Path
+        the directory the files are moved into
+    keep : Mapping[str, str]
+        the names of the files being moved into the directory, mapped to the names of
+        the partial files of the current versions of them
+    """
+    try:
+        entries = list(os.scandir(dest_dir))
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        name = entry.name
+        if not name.endswith(PARTIAL_SUFFIX):
+            continue
+        fname, _, identity = name[: -len(PARTIAL_SUFFIX)].rpartition(".")
+        if (
+            fname in keep
+            and name != keep[fname]
+            and len(identity) == PARTIAL_ID_LENGTH
+            and all(c in "0123456789abcdef" for c in identity)
+        ):
+            logger.debug("Removing stale partial file '%s'", entry.path)
+            os.unlink(entry.path)
+
+
+def _stream_file(
+    src: Path,
+    dest: Path,
+    resume_from: int,
+    progress: ty.Optional[TransferProgress],
+    digest: bool,
+) -> ty.Optional[str]:
+    """Streams the contents of the source file to the destination file from the given
+    offset, flushing it to disk, and returns the digest of the source file if
+    requested"""
+    crypto_obj = hashlib.sha256() if digest else None
+    with open(src, "rb") as src_file, open(
+        dest, "r+b" if resume_from else "wb"
+    ) as dest_file:
+        if resume_from:
+            if crypto_obj is not None:
+                remaining = resume_from
+                while remaining:
+                    chunk = src_file.read(min(MOVE_CHUNK_SIZE, remaining))
+                    if not chunk:
+                        break
+                    crypto_obj.update(chunk)
+                    remaining -= len(chunk)
+            src_file.seek(resume_from)
+            dest_file.seek(resume_from)
+            dest_file.truncate()
+            if progress is not None:
+                progress.advance(num_bytes=resume_from)
+        while True:
+            chunk = src_file.read(MOVE_CHUNK_SIZE)
+            if not chunk:
+                break
+            dest_file.write(chunk)
+            if crypto_obj is not None:
+                crypto_obj.update(chunk)
+            if progress is not None:
+                progress.advance(num_bytes=len(chunk))
+        dest_file.flush()
+        os.fsync(dest_file.fileno())
+    return crypto_obj.hexdigest() if crypto_obj is not None else None
+
+
+def _data_segments(fd: int, size: int) -> ty.Iterator[ty.Tuple[int, int]]:
+    """Yields the (start, end) offsets of the regions of the file that contain data,
+    skipping over holes in sparse files if the platform supports SEEK_DATA/SEEK_HOLE"""
+    if not size:
+        return
+    st_blocks = getattr(os.fstat(fd), "st_blocks", None)  # not available on Windows
+    if (
+        st_blocks is None
+        or st_blocks * 512 >= size  # not sparse
+        or not hasattr(os, "SEEK_DATA")
+    ):
+        yield 0, size
+        return
+    offset = 0
+    while offset < size:
+        try:
+            start = os.lseek(fd, offset, os.SEEK_DATA)
+        except OSError as e:
+            if e.errno == errno.ENXIO:  # no more data after the offset
+                return
+            # SEEK_DATA isn't supported by the file-system
+            yield offset, size
+            return
+        end = os.lseek(fd, start, os.SEEK_HOLE)
+        yield start, end
+        offset = end
+
+
+def _copy_range(
+    src_fd: int,
+    dest_fd: int,
+    start: int,
+    end: int,
+    methods: ty.List[ty.Callable[[int, int, int, int], int]],
+) -> int:
+    """Copies the byte range between the same offsets of the source and destination
+    files, using the first of the kernel-side copy methods that is supported (methods
+    found to be unsupported are removed from the list for subsequent calls). Returns
+    the offset copied to, which is less than the end if EOF is reached first"""
+    offset = start
+    while offset < end:
+        count = min(COPY_CHUNK_SIZE, end - offset)
+        copied = 0
+        while methods and not copied:
+            try:
+                copied = methods[0](src_fd, dest_fd, offset, count)
+            except OSError as e:
+                if e.errno not in KERNEL_COPY_UNSUPPORTED_ERRNOS:
+                    raise
+                logger.debug(
+                    "Kernel-side copy using %s failed (%s), falling back to the next "
+                    "method",
+                    methods[0].__name__,
+                    e,
+                )
+                methods.pop(0)
+            else:
+                if not copied:
+                    # Some file-systems (e.g. FUSE and network mounts) report success
+                    # without copying anything, so EOF is only trusted from a read
+                    logger.debug(
+                        "Kernel-side copy using %s copied nothing before the end of "
+                        "the range, falling back to the next method",
+                        methods[0].__name__,
+                    )
+                    methods.pop(0)
+        if not copied:
+            copied = _buffered_copy(src_fd, dest_fd, offset, count)
+        if not copied:
+            break
+        offset += copied
+    return offset
+
+
+def _copy_file_range(src_fd: int, dest_fd: int, offset: int, count: int) -> int:
+    return os.copy_file_range(src_fd, dest_fd, count, offset, offset)
+
+
+def _sendfile(src_fd: int, dest_fd: int, offset: int, count: int) -> int:
+    # sendfile writes to the current position of the output file
+    os.lseek(dest_fd, offset, os.SEEK_SET)
+    return os.sendfile(dest_fd, src_fd, offset, count)
+
+
+def _buffered_copy(src_fd: int, dest_fd: int, offset: int, count: int) -> int:
+    os.lseek(src_fd, offset, os.SEEK_SET)
+    os.lseek(dest_fd, offset, os.SEEK_SET)
+    copied = 0
+    while copied < count:
+        buf = os.read(src_fd, min(BUFFERED_COPY_SIZE, count - copied))
+        if not buf:
+            break
+        view = memoryview(buf)
+        while view:
+            view = view[os.write(dest_fd, view) :]
+        copied += len(buf)
+    return copied
+
+
+def _clone(src: Path, dest: Path) -> None:
+    """Clones the source file into the destination using the FICLONE ioctl, removing
+    the destination again if the clone fails"""
+    if not sys.platform.startswith("linux"):
+        raise OSError(errno.ENOTSUP, "Reflinks are only supported on Linux")
+    import fcntl
+
+    with open(src, "rb") as src_file:
+        with open(dest, "xb") as dest_file:
+            try:
+                fcntl.ioctl(dest_file.fileno(), FICLONE, src_file.fileno())
+            except OSError:
+                dest_file.close()
+                os.unlink(dest)
+                raise
+
+
+def _reflink_with_metadata(src: PathType, dest: PathType) -> None:
+    reflink_file(Path(src), Path(dest))
+    shutil.copystat(src, dest)
+
+
+# Kernel-side copy methods to try in order of preference, the platforms that don't
+# support them are dropped
+_KERNEL_COPY_METHODS: ty.Tuple[ty.Callable[[int, int, int, int], int], ...] = tuple(
+    m
+    for m, name in ((_copy_file_range, "copy_file_range"), (_sendfile, "sendfile"))
+    if hasattr(os, name) and sys.platform.startswith("linux")
+)
+
+_transfer_metrics_hook: ty.Optional[ty.Callable[[TransferMetrics], None]] = None
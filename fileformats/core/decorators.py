@@ -1,25 +1,78 @@
 import typing as ty
 from pathlib import Path
 import time
-from threading import RLock
+import weakref
+import functools
+from copy import copy
 import fileformats.core
 from .fs_mount_identifier import FsMountIdentifier
+from .cache import (
+    shared_cache,
+    instance_cache_budget,
+    cache_stats_recorder,
+    in_flight,
+    CacheStats,
+    WeakValue,
+    freeze,
+)
 
 
 PropReturn = ty.TypeVar("PropReturn")
 
 
-__all__ = ["mtime_cached_property", "classproperty"]
+__all__ = ["mtime_cached_property", "mtime_cached_method", "classproperty"]
+
+
+# Statuses of lookups of values cached on instances by mtime_cached_property
+HIT = "hit"
+MISSING = "missing"
+INVALIDATED = "invalidated"  # the mtimes of the files have changed
+UNRESOLVED = "unresolved"  # modified within the mtime resolution of the file-system
 
 
 class mtime_cached_property:
-    """A property that is cached until the mtimes of the files in the fileset are changed"""
+    """A property that is cached until the mtimes of the files in the fileset are changed
+
+    Can be applied either directly, ``@mtime_cached_property``, or with options,
+    ``@mtime_cached_property(shared=True)``.
+
+    Parameters
+    ----------
+    func : Callable, optional
+        the method to cache the result of
+    shared : bool, optional
+        whether to also store the value in the process-wide `shared_cache`, so it can
+        be reused by other instances of the same class pointing to the same unchanged
+        files (and loaded with the same keyword arguments). Each instance keeps its own
+        shallow copy of shared lists, sets and dicts (made once when the value is
+        loaded), so they can be modified without affecting other instances, but other
+        values are the same object for each instance, so they shouldn't be modified in
+        place. By default False
+    bounded : bool, optional
+        whether the value cached on the instance counts towards the global memory
+        budget of `instance_cache_budget`, in which case it may be evicted (and reloaded
+        on the next access) to free memory. Should be used for properties that can hold
+        large values (e.g. loaded file contents). By default False
+    """
 
-    def __init__(self, func: ty.Callable[..., ty.Any]):
+    def __init__(
+        self,
+        func: ty.Optional[ty.Callable[..., ty.Any]] = None,
+        *,
+        shared: bool = False,
+        bounded: bool = False,
+    ):
+        self.shared = shared
+        self.bounded = bounded
+        if func is not None:
+            self(func)
+
+    def __call__(self, func: ty.Callable[..., ty.Any]) -> "mtime_cached_property":
         self.func = func
         self.__doc__ = func.__doc__
-        self.lock = RLock()
+        self._name = func.__name__
         self._cache_name = f"_{func.__name__}_mtime_cache"
+        return self
 
     def __get__(
         self,
@@ -32,34 +85,171 @@ class mtime_cached_property:
             "Cannot use mtime_cached_property instance with "
             f"{type(instance).__name__!r} object, only FileSet objects."
         )
-        try:
-            mtimes, value = instance.__dict__[self._cache_name]
-        except KeyError:
-            pass
+        mtimes = instance.mtimes
+        status, value = self._lookup(instance, mtimes)
+        stats = cache_stats_recorder[(type(instance), self._name)]
+        if status is HIT:
+            stats.hits += 1
+            if self.bounded:
+                instance_cache_budget.touch(instance, self._cache_name)
+            return value
+        if status is INVALIDATED:
+            stats.invalidations += 1
+        elif status is UNRESOLVED:
+            stats.resolution_misses += 1
         else:
-            if (
-                instance.mtimes == mtimes
-                and enough_time_has_elapsed_given_mtime_resolution(mtimes)
-            ):
-                return value
-            else:
-                del instance.__dict__[self._cache_name]
-        with self.lock:
-            # check if another thread filled cache while we awaited lock
+            stats.misses += 1
+        shared_key = self._shared_key(instance, mtimes)
+        # Concurrent misses for the same value (on this instance, or on any instance
+        # pointing to the same files if shared) are only computed once, while misses
+        # for unrelated values proceed in parallel
+        if shared_key is not None:
+            flight_key: ty.Hashable = shared_key
+        else:
+            flight_key = (id(instance), self._cache_name, mtimes)
+        value, computed = in_flight.do(
+            flight_key, lambda: self._load(instance, shared_key, stats)
+        )
+        if not computed:
+            stats.shared_hits += 1
+        if shared_key is not None:
+            value = self._unshared(value)
+        if self.bounded:
+            cached = instance_cache_budget.wrap(value)
+            instance.__dict__[self._cache_name] = (mtimes, cached)
+            instance_cache_budget.record(
+                instance, self._cache_name, cached, shared_key=shared_key
+            )
+        else:
+            instance.__dict__[self._cache_name] = (mtimes, value)
+        return value
+
+    @staticmethod
+    def _unshared(value: ty.Any) -> ty.Any:
+        """Returns a shallow copy of a shared list, set or dict for an instance to keep,
+        so modifications of it through one instance don't leak to other instances"""
+        if isinstance(value, (list, set, dict)):
+            return copy(value)
+        return value
+
+    def _load(
+        self,
+        instance: "fileformats.core.FileSet",
+        shared_key: ty.Optional[ty.Hashable],
+        stats: CacheStats,
+    ) -> ty.Any:
+        """Loads the value from the shared cache if present, otherwise computes it"""
+        if shared_key is not None:
             try:
-                mtimes, value = instance.__dict__[self._cache_name]
+                value = shared_cache[shared_key]
             except KeyError:
                 pass
             else:
-                if (
-                    instance.mtimes == mtimes
-                    and enough_time_has_elapsed_given_mtime_resolution(mtimes)
-                ):
-                    return value
-            value = self.func(instance)
-            instance.__dict__[self._cache_name] = (instance.mtimes, value)
+                stats.shared_hits += 1
+                return value
+        start = time.perf_counter()
+        value = self.func(instance)
+        stats.recompute_time += time.perf_counter() - start
+        stats.recomputes += 1
+        if shared_key is not None:
+            shared_cache.put(shared_key, value)
         return value
 
+    def _lookup(
+        self,
+        instance: "fileformats.core.FileSet",
+        mtimes: ty.Tuple[ty.Tuple[str, int], ...],
+    ) -> ty.Tuple[str, ty.Any]:
+        """Looks up the value cached on the instance, returning the status of the lookup
+        (HIT, MISSING, INVALIDATED or UNRESOLVED) and the value if it is a hit"""
+        try:
+            cached_mtimes, value = instance.__dict__[self._cache_name]
+        except KeyError:
+            return MISSING, None
+        if isinstance(value, WeakValue):
+            value = value()
+            if value is None:  # the value has been garbage collected
+                return MISSING, None
+        if mtimes != cached_mtimes:
+            return INVALIDATED, None
+        if not enough_time_has_elapsed_given_mtime_resolution(mtimes):
+            return UNRESOLVED, None
+        return HIT, value
+
+    def _shared_key(
+        self,
+        instance: "fileformats.core.FileSet",
+        mtimes: ty.Tuple[ty.Tuple[str, int], ...],
+    ) -> ty.Optional[ty.Hashable]:
+        """Returns the key to store the value under in the shared cache, or None if the
+        value shouldn't be shared with other instances"""
+        if not self.shared or getattr(instance, "_explicit_metadata", None) is not None:
+            return None
+        # Only share values once we can be sure that subsequent modifications of the
+        # files will be detected (see enough_time_has_elapsed_given_mtime_resolution)
+        if not enough_time_has_elapsed_given_mtime_resolution(mtimes):
+            return None
+        try:
+            load_kwargs = freeze(instance._load_kwargs)
+        except TypeError:
+            return None
+        return (self._cache_name, type(instance), mtimes, load_kwargs)
+
+
+def mtime_cached_method(
+    method: ty.Callable[..., PropReturn]
+) -> ty.Callable[..., PropReturn]:
+    """A method whose return values are cached (separately for each combination of
+    arguments) until the mtimes of the files in the fileset are changed. Arguments that
+    aren't hashable bypass the cache.
+
+    Cached lists, sets and dicts are returned as shallow copies so that callers can
+    modify them without affecting the cache.
+    """
+    name = method.__name__
+    cache_name = f"_{name}_mtime_cache"
+
+    @functools.wraps(method)
+    def cached_method(
+        self: "fileformats.core.FileSet", *args: ty.Any, **kwargs: ty.Any
+    ) -> PropReturn:
+        try:
+            key = (args, freeze(kwargs))
+            hash(key)
+        except TypeError:
+            return method(self, *args, **kwargs)
+        stats = cache_stats_recorder[(type(self), name)]
+        mtimes = self.mtimes
+        cached_mtimes, values = self.__dict__.get(cache_name, (None, {}))
+        if cached_mtimes is not None and cached_mtimes != mtimes:
+            status, values = INVALIDATED, {}
+        elif key not in values:
+            status = MISSING
+        elif not enough_time_has_elapsed_given_mtime_resolution(mtimes):
+            status, values = UNRESOLVED, {}
+        else:
+            stats.hits += 1
+            status = HIT
+        if status is HIT:
+            value = values[key]
+        else:
+            if status is INVALIDATED:
+                stats.invalidations += 1
+            elif status is UNRESOLVED:
+                stats.resolution_misses += 1
+            else:
+                stats.misses += 1
+            start = time.perf_counter()
+            value = values[key] = method(self, *args, **kwargs)
+            stats.recompute_time += time.perf_counter() - start
+            stats.recomputes += 1
+            self.__dict__[cache_name] = (mtimes, values)
+        if isinstance(value, (list, set, dict)):
+            return copy(value)  # type: ignore[return-value]
+        return value  # type: ignore[no-any-return]
+
+    return cached_method
+
 
 # def classproperty(meth: ty.Callable[..., PropReturn]) -> PropReturn:
 #     """Access a @classmethod like a @property."""
@@ -68,8 +258,17 @@ class mtime_cached_property:
 
 
 def validated_property(meth: ty.Callable[..., PropReturn]) -> PropReturn:
-    """A property that is checked during validation of a FileSet"""
-    prop = property(meth)
+    """A property that is checked during validation of a FileSet. If the FileSet was
+    created with `FileSet.trusted`, the first access of a validated property triggers
+    its deferred validation"""
+
+    @functools.wraps(meth)
+    def fget(self: "fileformats.core.FileSet") -> PropReturn:
+        if self._validation_pending:
+            self.validate()
+        return meth(self)
+
+    prop = property(fget)
     prop.fget.__annotations__[VALIDATED_PROPERTY_FLAG] = True
     return prop  # type: ignore
 
@@ -82,8 +281,31 @@ class classproperty(object):  # type: ignore[no-redef]  # noqa
         return self.f(owner)
 
 
+class cached_classproperty(classproperty):
+    """A class property that is only evaluated once per class it is accessed from.
+    Should only be used for values that are derived from the static definition of the
+    class (e.g. its extensions and validated properties), which don't change after the
+    class is created.
+    """
+
+    def __init__(self, f: ty.Callable[[ty.Any], ty.Any]):
+        super().__init__(f)
+        # keyed by the class the property is accessed from, which may be a subclass of
+        # the one it is defined on (e.g. when accessed via `super()`)
+        self._values: "weakref.WeakKeyDictionary[type, ty.Any]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def __get__(self, obj: ty.Any, owner: ty.Any) -> ty.Any:
+        try:
+            return self._values[owner]
+        except KeyError:
+            value = self._values[owner] = self.f(owner)
+            return value
+
+
 def enough_time_has_elapsed_given_mtime_resolution(
-    mtimes: ty.Iterable[ty.Tuple[Path, ty.Union[int, float]]],
+    mtimes: ty.Iterable[ty.Tuple[ty.Union[str, Path], ty.Union[int, float]]],
     current_time: ty.Optional[int] = None,
 ) -> bool:
     """Determines whether enough time has elapsed since the the last of the cached mtimes
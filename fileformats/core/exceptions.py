@@ -18,6 +18,10 @@ class FormatConversionError(FileFormatsError):
     "No converters exist between formats"
 
 
+class AmbiguousConverterError(FormatConversionError):
+    "More than one converter exists between formats"
+
+
 class FormatRecognitionError(KeyError, FileFormatsError):
     "Did not find a format class corresponding to a MIME, or MIME-like, type string"
 
@@ -39,3 +43,8 @@ class FileFormatsExtrasPkgUninstalledError(FileFormatsExtrasError):
 class FileFormatsExtrasPkgNotCheckedError(FileFormatsExtrasError):
     """If there is an "extra" hook in the datatype class and a extras package on PyPI
     but it hasn't been installed"""
+
+
+class TransferVerificationError(OSError, FileFormatsError):
+    """The copy of a file made when moving it between file-systems doesn't match the
+    original, so the original hasn't been deleted"""
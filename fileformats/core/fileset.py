@@ -1,4 +1,5 @@
 import os
+import stat
 import struct
 from enum import Enum, IntEnum
 from warnings import warn
@@ -15,12 +16,22 @@ import functools
 from pathlib import Path
 import hashlib
 import logging
+import threading
+import pickle
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from fileformats.core.typing import Self
 from .utils import (
     fspaths_converter,
     import_extras_module,
 )
-from .decorators import mtime_cached_property, classproperty, VALIDATED_PROPERTY_FLAG
+from .decorators import (
+    mtime_cached_property,
+    mtime_cached_method,
+    classproperty,
+    cached_classproperty,
+    enough_time_has_elapsed_given_mtime_resolution,
+    VALIDATED_PROPERTY_FLAG,
+)
 from .typing import FspathsInputType, CryptoMethod, PathType
 from .sampling import SampleFileGenerator
 from .identification import (
@@ -32,6 +43,7 @@ from .exceptions import (
     FormatMismatchError,
     UnconstrainedExtensionException,
     FormatConversionError,
+    AmbiguousConverterError,
     UnsatisfiableCopyModeError,
     FormatDefinitionError,
     FileFormatsExtrasError,
@@ -42,6 +54,11 @@ from .datatype import DataType
 from .extras import extra
 from .fs_mount_identifier import FsMountIdentifier
 from .mock import MockMixin
+from . import aio
+from . import copying
+from . import converter_helpers
+from .converter_helpers import register_converter_target
+from .cache import get_persistent_metadata_cache, validation_cache, freeze
 
 if ty.TYPE_CHECKING:
     from .converter_helpers import Converter
@@ -52,6 +69,10 @@ FILE_CHUNK_LEN_DEFAULT = 8192
 
 logger = logging.getLogger("fileformats")
 
+# Names of the attributes of the base FileSet class, which are skipped when searching
+# for validated properties of subclasses
+_fileset_attr_names: ty.Optional[ty.FrozenSet[str]] = None
+
 T = ty.TypeVar("T")
 
 
@@ -106,8 +127,10 @@ class FileSet(DataType):
         self._explicit_metadata = metadata
         self._load_kwargs = load_kwargs
         self._validate_class()
-        self.fspaths = frozenset(
-            itertools.chain(*(fspaths_converter(p) for p in fspaths))
+        self.fspaths = (
+            fspaths_converter(fspaths[0])
+            if len(fspaths) == 1
+            else frozenset(itertools.chain(*(fspaths_converter(p) for p in fspaths)))
         )
         self._validate_fspaths()
         self._additional_fspaths()
@@ -117,6 +140,80 @@ class FileSet(DataType):
             )
         self._validate_properties()
 
+    @classmethod
+    def trusted(
+        cls,
+        *fspaths: FspathsInputType,
+        metadata: ty.Optional[ty.Dict[str, ty.Any]] = None,
+        **load_kwargs: ty.Any,
+    ) -> Self:
+        """Creates a file-set from paths that are already known to be in the format
+        (e.g. as recorded in a catalogue) without checking them. Validation of the
+        paths is deferred until `validate` is called or a validated property is first
+        accessed.
+
+        Note that, unlike when the class is instantiated directly, no adjacent files
+        (e.g. headers and side-cars) are added, so all the file-system paths in the
+        file-set need to be provided.
+
+        Parameters
+        ----------
+        *fspaths : FspathsInputType
+            the file-system paths of the file-set
+        metadata : dict[str, Any], optional
+            explicit metadata of the file-set
+        **load_kwargs : Any
+            keyword arguments to pass to the metadata reader and loader
+
+        Returns
+        -------
+        Self
+            the unvalidated file-set
+        """
+        if not fspaths:
+            raise ValueError("No file-system paths provided to FileSet")
+        fileset = cls.__new__(cls)
+        fileset._explicit_metadata = metadata
+        fileset._load_kwargs = load_kwargs
+        fileset.fspaths = (
+            fspaths_converter(fspaths[0])
+            if len(fspaths) == 1
+            else frozenset(itertools.chain(*(fspaths_converter(p) for p in fspaths)))
+        )
+        fileset._validation_pending = True
+        return fileset
+
+    def validate(self) -> None:
+        """Runs the validation of a file-set created with `trusted` (does nothing if
+        the file-set has already been validated)
+
+        Raises
+        ------
+        FileNotFoundError
+            if any of the file-system paths don't exist
+        FormatMismatchError
+            if the paths don't match the format
+        """
+        if not self._validation_pending:
+            return
+        # Unset the flag before validating so that accessing validated properties
+        # doesn't trigger validation recursively
+        self._validation_pending = False
+        try:
+            self._validate_class()
+            self._validate_fspaths()
+            if self._explicit_metadata and not isinstance(
+                self._explicit_metadata, dict
+            ):
+                raise TypeError(
+                    "Fileset metadata value needs to be None or dict, not "
+                    f"{self._explicit_metadata} ({self})"
+                )
+            self._validate_properties()
+        except Exception:
+            self._validation_pending = True
+            raise
+
     def _validate_fspaths(self) -> None:
         if not self.fspaths:
             raise ValueError(f"No file-system paths provided to {self}")
@@ -160,9 +257,51 @@ class FileSet(DataType):
         """Additional checks to be performed on the file-system paths provided to the"""
 
     def _validate_properties(self) -> None:
+        # Reuse the outcome of previous validations of the same unchanged files
+        memo_key = self._validation_memo_key()
+        if memo_key is not None:
+            try:
+                mismatch = validation_cache[memo_key]
+            except KeyError:
+                pass
+            else:
+                if mismatch is not None:
+                    error_type, error_args = mismatch
+                    raise error_type(*error_args)
+                return
         # Check required properties don't raise errors
-        for prop_name in self.validated_properties():
-            getattr(self, prop_name)
+        try:
+            for prop_name in self.validated_properties():
+                getattr(self, prop_name)
+        except FormatMismatchError as e:
+            if memo_key is not None:
+                validation_cache.put(memo_key, (type(e), e.args))
+            raise
+        if memo_key is not None:
+            validation_cache.put(memo_key, None)
+
+    def _validation_memo_key(self) -> ty.Optional[ty.Hashable]:
+        """Returns the key to memoise the outcome of the validation of the properties
+        of the file-set under, or None if it shouldn't be memoised"""
+        if self._explicit_metadata is not None or not self.validated_properties():
+            return None
+        try:
+            load_kwargs = freeze(self._load_kwargs)
+        except TypeError:
+            return None
+        stats = []
+        for fspath in sorted(self.fspaths):
+            fstat = fspath.stat()
+            # The validation of directories can depend on the contents of the files
+            # within them, which don't affect the mtime of the directory
+            if not stat.S_ISREG(fstat.st_mode):
+                return None
+            stats.append((str(fspath), fstat.st_mtime_ns, fstat.st_size))
+        if not enough_time_has_elapsed_given_mtime_resolution(
+            (p, m) for p, m, _ in stats
+        ):
+            return None
+        return (type(self), tuple(stats), load_kwargs)
 
     def __eq__(self, other: object) -> bool:
         return (
@@ -288,28 +427,44 @@ class FileSet(DataType):
         """Return extension that is guaranteed to be a string (i.e. not None)"""
         return cls.ext if cls.ext is not None else ""
 
-    @classproperty  # type: ignore[arg-type]
+    @cached_classproperty  # type: ignore[arg-type]
     def unconstrained(cls) -> bool:
         """Whether the file-format is unconstrained by extension, magic number or another
         constraint"""
-        return not list(cls.validated_properties())
+        return not cls.validated_properties()
 
     @classproperty  # type: ignore[arg-type]
     def possible_exts(cls) -> ty.List[ty.Optional[str]]:
         """All possible extensions of the file format"""
+        return list(cls._possible_exts)
+
+    @cached_classproperty  # type: ignore[arg-type]
+    def _possible_exts(cls) -> ty.Tuple[ty.Optional[str], ...]:
+        # Cached as a tuple so it can't be modified by callers of possible_exts
         possible = [cls.ext]
         try:
             possible.extend(cls.alternate_exts)
         except AttributeError:
             pass
-        return possible
+        return tuple(possible)
 
-    @mtime_cached_property
+    @mtime_cached_property(shared=True)
     def metadata(self) -> ty.Mapping[str, ty.Any]:
         """Lazily load metadata from `read_metadata` extra if implemented, returning an
-        empty metadata array if not"""
+        empty metadata array if not. The loaded metadata is shared between file-sets
+        pointing to the same unchanged files, and each file-set keeps its own shallow
+        copy of it, so nested values shouldn't be modified in place"""
         if self._explicit_metadata is not None:
             return self._explicit_metadata
+        # Check the persistent, cross-process, cache (if enabled) before reading
+        persistent_cache = get_persistent_metadata_cache()
+        cache_key = persistent_cache.key(self) if persistent_cache else None
+        if cache_key:
+            assert persistent_cache
+            try:
+                return persistent_cache[cache_key]
+            except KeyError:
+                pass
         try:
             metadata = self.read_metadata(**self._load_kwargs)
         except FileFormatsExtrasPkgUninstalledError:
@@ -319,12 +474,19 @@ class FileSet(DataType):
             metadata = {}
         except FileFormatsExtrasError:
             metadata = {}
+        else:
+            if cache_key:
+                assert persistent_cache
+                persistent_cache.put(cache_key, metadata)
         return metadata
 
-    @mtime_cached_property
+    @mtime_cached_property(shared=True, bounded=True)
     def contents(self) -> ty.Any:
         """The contents of the file-set, will be an object of a type that makes sense
-        for the format, as loaded by the `load` method"""
+        for the format, as loaded by the `load` method. The loaded contents are shared
+        between file-sets pointing to the same unchanged files, so (lists, sets and
+        dicts aside, of which each file-set keeps its own shallow copy) they shouldn't
+        be modified in place. Use `load` to get a private copy"""
         return self.load()
 
     @extra
@@ -354,26 +516,43 @@ class FileSet(DataType):
             a tuple containing all the properties names defined outside of core and
             generic classes
         """
-        if required_props := cls.__dict__.get("_required_props"):
-            assert isinstance(required_props, tuple) and all(
-                isinstance(p, str) for p in required_props
-            )
-            return required_props  # return cached value
-        fileset_props = dir(FileSet)
+        required_props = cls.__dict__.get("_required_props")
+        if required_props is not None:
+            return required_props  # type: ignore[no-any-return]
+        # Only reached for FileSet itself, as the properties of subclasses are found
+        # when they are created (see __init_subclass__)
+        return cls._find_validated_properties()
+
+    def __init_subclass__(cls, **kwargs: ty.Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._required_props = cls._find_validated_properties()
+
+    @classmethod
+    def _find_validated_properties(cls) -> ty.Tuple[str, ...]:
+        """Finds the validated properties of the class from those already found for
+        its FileSet base classes, plus any defined in the class itself or its mixins"""
+        global _fileset_attr_names
+        if _fileset_attr_names is None:
+            _fileset_attr_names = frozenset(dir(FileSet))
+        candidates = set(cls.__dict__)
+        for base in cls.__mro__[1:]:
+            if isinstance(base.__dict__.get("_required_props"), tuple):
+                candidates.update(base.__dict__["_required_props"])
+            elif not issubclass(base, FileSet):
+                candidates.update(base.__dict__)
         required_props = []
-        for attr_name in dir(cls):
-            if attr_name in fileset_props:
-                continue
-            attr = getattr(cls, attr_name)
-            if isinstance(attr, property):
-                try:
-                    attr.fget.__annotations__[VALIDATED_PROPERTY_FLAG]
-                except KeyError:
-                    pass
-                else:
-                    required_props.append(attr_name)
+        for attr_name in sorted(candidates - _fileset_attr_names):
+            # Look up the attribute without evaluating it in case it is a class property
+            attr = inspect.getattr_static(cls, attr_name, None)
+            if (
+                isinstance(attr, property)
+                and attr.fget is not None
+                and attr.fget.__annotations__.get(VALIDATED_PROPERTY_FLAG)
+            ):
+                required_props.append(attr_name)
         return tuple(required_props)
 
+    @mtime_cached_method
     def required_paths(self) -> ty.FrozenSet[Path]:
         """Returns all fspaths that are required for the format"""
         required = set()
@@ -400,6 +579,7 @@ class FileSet(DataType):
                     required.add(path)
         return frozenset(required)
 
+    @mtime_cached_method
     def nested_filesets(self) -> ty.List["FileSet"]:
         """Returns all nested filesets that are required for the format
 
@@ -492,7 +672,7 @@ class FileSet(DataType):
         if exts is None:
             if cls.ext is None:
                 return list(fspaths)
-            exts = cls.possible_exts
+            exts = cls._possible_exts
         return [
             p for p in fspaths if any(e is None or str(p).endswith(e) for e in exts)
         ]
@@ -517,20 +697,152 @@ class FileSet(DataType):
         FileSet
             the file-set converted into the type of the current class
         """
-        import attrs
-
-        # Make unique, yet somewhat recognisable task name
-        converter = cls.get_converter(source_format=type(fileset))
-        if converter is None:
+        route = cls.get_converter_route(source_format=type(fileset))
+        if not route:
             assert isinstance(fileset, cls)
             return copy(fileset)
+        converted = fileset
+        for i, (hop_format, converter) in enumerate(route):
+            # Customisations of the task definition are applied to the final converter
+            converted = hop_format._run_converter(
+                converter, converted, **(kwargs if i == len(route) - 1 else {})
+            )
+        return converted  # type: ignore[return-value]
+
+    @classmethod
+    def convert_many(
+        cls,
+        filesets: ty.Iterable["FileSet"],
+        max_workers: ty.Optional[int] = None,
+        **kwargs: ty.Any,
+    ) -> ty.List[Self]:
+        """Convert many file-sets into the format specified by the class in bulk.
+        Equivalent to calling `FileSet.convert` on each of the file-sets, except that
+        the converters are only resolved once per source format.
+
+        The conversions are run across a pool of processes if the converters are all
+        Python tasks and they and the file-sets can be pickled, in which case the
+        functions underlying the tasks are called directly (each in a fresh temporary
+        working directory) instead of constructing and running a Pydra task for each
+        file-set. Otherwise, the conversions are run as Pydra tasks across a pool of
+        threads.
+
+        Parameters
+        ----------
+        filesets : Iterable[FileSet]
+            the file-set objects to convert
+        max_workers : int, optional
+            the number of processes (or threads) to run the conversions across, by
+            default the file-sets are converted one after another
+        **kwargs
+            args to pass to customise the converter task definitions
+
+        Returns
+        -------
+        list[FileSet]
+            the file-sets converted into the type of the current class, in the order
+            they were provided
+        """
+        filesets = list(filesets)
+        chains = {
+            source_format: converter_helpers.ConversionChain(
+                cls.get_converter_route(source_format), **kwargs
+            )
+            for source_format in dict.fromkeys(type(f) for f in filesets)
+        }
+        fileset_chains = [chains[type(f)] for f in filesets]
+        if not max_workers or max_workers <= 1 or len(filesets) <= 1:
+            return [chain(f) for chain, f in zip(fileset_chains, filesets)]  # type: ignore[misc]
+        executor: ty.Union[ProcessPoolExecutor, ThreadPoolExecutor]
+        if all(c.direct for c in chains.values()):
+            try:
+                pickle.dumps((list(chains.values()), filesets))
+            except (pickle.PicklingError, AttributeError, TypeError) as e:
+                logger.debug(
+                    "Converting %s file-sets across threads instead of processes as "
+                    "they can't be pickled: %s",
+                    cls.mime_like,
+                    e,
+                )
+            else:
+                with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                    return list(
+                        executor.map(
+                            converter_helpers.ConversionChain.run_in_worker,  # type: ignore[arg-type]
+                            fileset_chains,
+                            filesets,
+                            chunksize=max(1, len(filesets) // (max_workers * 4)),
+                        )
+                    )
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(
+                executor.map(
+                    converter_helpers.ConversionChain.__call__,  # type: ignore[arg-type]
+                    fileset_chains,
+                    filesets,
+                )
+            )
+
+    @classmethod
+    def _run_converter(
+        cls, converter: "Converter", fileset: "FileSet", **kwargs: ty.Any
+    ) -> Self:
+        import attrs
+
         kwargs[converter.in_file] = fileset
         task_def = attrs.evolve(converter.task_def, **kwargs)
         outputs = task_def()
         out_file = getattr(outputs, converter.out_file)
         if not isinstance(out_file, cls):
             out_file = cls(out_file)
-        return out_file  # type: ignore
+        return out_file
+
+    @classmethod
+    def get_converter_route(
+        cls,
+        source_format: ty.Type[DataType],
+        max_hops: ty.Optional[int] = None,
+    ) -> ty.List[ty.Tuple[ty.Type["FileSet"], "Converter"]]:
+        """Get the chain of converters that converts from the source format type into
+        the format specified by the class via the fewest intermediate formats, e.g.
+        DICOM -> NIfTI -> NIfTI-gz if there is no direct converter between DICOM and
+        NIfTI-gz
+
+        Parameters
+        ----------
+        source_format : type
+            the format to convert from
+        max_hops : int, optional
+            the maximum number of converters to chain together, by default
+            CONVERTER_ROUTE_MAX_HOPS
+
+        Returns
+        -------
+        list[tuple[type, Converter]]
+            the formats converted into at each step of the route (the last of which is
+            the class) paired with the converters to use, or an empty list if no
+            conversion is required
+
+        Raises
+        ------
+        FileFormatConversionError
+            no route found between source and dest format
+        AmbiguousConverterError
+            ambiguous (i.e. more than one) converters found directly between source and
+            dest format
+        """
+        from .converter_helpers import find_converter_route
+
+        try:
+            converter = cls.get_converter(source_format)
+        except AmbiguousConverterError:
+            raise
+        except FormatConversionError as e:
+            route = find_converter_route(source_format, cls, max_hops=max_hops)  # type: ignore[arg-type]
+            if route is None:
+                raise e
+            return route
+        return [(cls, converter)] if converter is not None else []
 
     @classmethod
     def get_converter(
@@ -559,11 +871,32 @@ class FileSet(DataType):
         ------
         FileFormatConversionError
             no converters found between source and dest format
-        FileFormatConversionError
+        AmbiguousConverterError
             ambiguous (i.e. more than one) converters found between source and dest format
         """
         if issubclass(source_format, cls):
             return None
+        # Resolutions (including failed ones) are cached until a converter is registered
+        key = (cls, source_format)
+        try:
+            resolved = converter_helpers.converter_resolutions[key]
+        except KeyError:
+            version = converter_helpers.converters_version()
+            try:
+                resolved = cls._resolve_converter(source_format)
+            except FormatConversionError as e:
+                resolved = (e, e.__traceback__)
+            if version == converter_helpers.converters_version():
+                converter_helpers.converter_resolutions[key] = resolved
+        if isinstance(resolved, tuple):
+            # Re-raise the original error from where it was first raised, instead of
+            # accumulating the tracebacks of each time it has been re-raised
+            error, traceback = resolved
+            raise error.with_traceback(traceback)
+        return resolved
+
+    @classmethod
+    def _resolve_converter(cls, source_format: ty.Type[DataType]) -> "Converter":
         # trigger loading of standard converters for target format
         converters = cls.get_converters_dict()
         try:
@@ -587,7 +920,7 @@ class FileSet(DataType):
                     available_str = "\n".join(
                         str(a.task_def) for a in available_converters
                     )
-                    raise FormatConversionError(
+                    raise AmbiguousConverterError(
                         f"Ambiguous converters found between '{cls.mime_like}' and "
                         f"'{source_format.mime_like}':\n{available_str}"
                     ) from None
@@ -698,6 +1031,7 @@ class FileSet(DataType):
                 f"and {prev_converter.task_def}\n\n"
             )
         converters_dict[source_format] = converter
+        register_converter_target(cls)
 
     @classproperty  # type: ignore[arg-type]
     def all_formats(cls) -> ty.Set[ty.Type["FileSet"]]:
@@ -936,6 +1270,137 @@ class FileSet(DataType):
             file_hashes[str(path)] = crypto_obj.hexdigest()
         return file_hashes
 
+    async def ahash(
+        self,
+        crypto: CryptoMethod = None,
+        mtime: bool = False,
+        chunk_len: int = FILE_CHUNK_LEN_DEFAULT,
+        relative_to: ty.Optional[Path] = None,
+        ignore_hidden_files: bool = False,
+        ignore_hidden_dirs: bool = False,
+    ) -> str:
+        """Awaitable version of `hash`. The files are read and hashed in steps (of
+        `aio.HASH_CHUNKS_PER_STEP` chunks) on the bounded I/O executor, so the event loop
+        isn't blocked and the hashing stops between steps if the task is cancelled.
+
+        Parameters
+        ----------
+        crypto : function, optional
+            the cryptography method used to hash the files, by default hashlib.sha256
+        **kwargs
+            keyword args passed directly through to the ``byte_chunks`` method
+
+        Returns
+        -------
+        hash : str
+            unique hash for the file-set
+        """
+        if crypto is None:
+            crypto = hashlib.sha256
+        crypto_obj = crypto()
+
+        def iter_chunks() -> ty.Generator[bytes, None, None]:
+            for path, bytes_iter in self.byte_chunks(
+                mtime=mtime,
+                chunk_len=chunk_len,
+                relative_to=relative_to,
+                ignore_hidden_files=ignore_hidden_files,
+                ignore_hidden_dirs=ignore_hidden_dirs,
+            ):
+                yield path.encode()
+                yield from bytes_iter
+
+        chunks = iter_chunks()
+        # Ensures the chunks generator isn't closed while a step is still running in
+        # its thread after the task has been cancelled
+        step_lock = threading.Lock()
+
+        def hash_step() -> bool:
+            """Hashes the next step of chunks, returning whether there may be more"""
+            with step_lock:
+                num_chunks = 0
+                for chunk in itertools.islice(chunks, aio.HASH_CHUNKS_PER_STEP):
+                    crypto_obj.update(chunk)
+                    num_chunks += 1
+                return num_chunks == aio.HASH_CHUNKS_PER_STEP
+
+        def close_chunks() -> None:
+            with step_lock:
+                chunks.close()
+
+        try:
+            async with aio.mount_limits(self.fspaths):
+                while await aio.run_io(hash_step):
+                    pass
+        finally:
+            aio.get_io_executor().submit(close_chunks)
+        digest: str = crypto_obj.hexdigest()
+        return digest
+
+    async def aload(self, **kwargs: ty.Any) -> ty.Any:
+        """Awaitable version of `load`, which is run on the bounded I/O executor
+
+        Parameters
+        ----------
+        **kwargs : Any
+            any format-specific keyword arguments to pass to the loader
+
+        Returns
+        -------
+        Any
+            the data loaded from the file in an type to the format
+        """
+        async with aio.mount_limits(self.fspaths):
+            return await aio.run_io(self.load, **kwargs)
+
+    async def acopy(self, dest_dir: PathType, *args: ty.Any, **kwargs: ty.Any) -> Self:
+        """Awaitable version of `copy`, which is run on the bounded I/O executor.
+
+        Note that if the awaiting task is cancelled once the copy has started, the copy
+        continues to completion in its thread (as it can't be safely interrupted)
+
+        Parameters
+        ----------
+        dest_dir : PathType
+            Path to the parent directory to save the file-set
+        *args, **kwargs
+            arguments passed through to `copy`
+
+        Returns
+        -------
+        Self
+            the copied file-set
+        """
+        async with aio.mount_limits(itertools.chain(self.fspaths, [dest_dir])):
+            return await aio.run_io(self.copy, dest_dir, *args, **kwargs)
+
+    @classmethod
+    async def afrom_paths(
+        cls, fspaths: ty.Iterable[Path], common_ok: bool = False, **kwargs: ty.Any
+    ) -> ty.Tuple[ty.Set[Self], ty.Set[Path]]:
+        """Awaitable version of `from_paths`, which is run on the bounded I/O executor
+
+        Parameters
+        ----------
+        fspaths : Iterable[Path]
+            file-system paths to instantiate file-sets from
+        common_ok : bool
+            whether secondary file-system paths can be shared between multiple instances
+            of the returned filesets
+        **kwargs: Any
+            additional keyword arguments to pass to the file
+
+        Returns
+        -------
+        filesets : set[FileSet]
+            file-sets instantiated from the provided paths
+        remaining : set[Path]
+            remaining file-system paths that weren't used in any of the file-sets
+        """
+        fspaths = list(fspaths)
+        async with aio.mount_limits(fspaths):
+            return await aio.run_io(cls.from_paths, fspaths, common_ok, **kwargs)
+
     def __bytes_repr__(
         self, cache: ty.Dict[ty.Any, str]  # pylint: disable=unused-argument
     ) -> ty.Iterable[bytes]:
@@ -1124,6 +1589,7 @@ class FileSet(DataType):
         def __str__(self) -> str:
             return self.name
 
+    @mtime_cached_method
     def decomposed_fspaths(
         self,
         required_only: bool = True,
@@ -1265,6 +1731,10 @@ class FileSet(DataType):
             hardlink the files into the destination directory
         symlink
             symlink the files into the destination directory
+        reflink
+            create copy-on-write clones of the files in the destination directory,
+            which are independent copies created in constant time (falls back to a full
+            copy if not supported by the file-system)
         copy
             duplicate (actually copy) the files into the destination directory
 
@@ -1278,6 +1748,8 @@ class FileSet(DataType):
             "  symbolic "   "         "
         hardlink_or_copy
             "  hard "   "         "
+        reflink_or_copy
+            use a reflink where supported by the file-system, otherwise copy
 
         Masks
         -----
@@ -1286,32 +1758,56 @@ class FileSet(DataType):
         none
             none of the requested methods are supported (i.e. after masking with the
             supported options mask)
+
+        Combinations that aren't listed (e.g. resulting from bit-masking) are
+        represented by members named after their basic options joined by "_or_"
         """
 
         # Bases
 
-        leave = 0b0001
-        hardlink = 0b0010
-        symlink = 0b0100
-        copy = 0b1000
+        leave = 0b00001
+        hardlink = 0b00010
+        symlink = 0b00100
+        copy = 0b01000
+        reflink = 0b10000
 
         # Common combinations
-        link = 0b0110
-        link_or_copy = 0b1110
-        hardlink_or_copy = 0b1010
-        symlink_or_copy = 0b1100
+        link = 0b00110
+        link_or_copy = 0b01110
+        hardlink_or_copy = 0b01010
+        symlink_or_copy = 0b01100
+        reflink_or_copy = 0b11000
 
         # Masks
-        any = 0b1111
-        none = 0b0000
+        any = 0b11111
+        none = 0b00000
 
         # All other combinations (typically the result of bit-masking)
-        leave_or_copy = 0b1001
-        leave_or_hardlink = 0b0011
-        leave_or_symlink = 0b0101
-        leave_or_link = 0b0111
-        leave_or_hardlink_or_copy = 0b1011
-        leave_or_symlink_or_copy = 0b1101
+        leave_or_copy = 0b01001
+        leave_or_hardlink = 0b00011
+        leave_or_symlink = 0b00101
+        leave_or_link = 0b00111
+        leave_or_hardlink_or_copy = 0b01011
+        leave_or_symlink_or_copy = 0b01101
+        leave_or_link_or_copy = 0b01111
+
+        @classmethod
+        def _missing_(cls, value: object) -> ty.Optional["FileSet.CopyMode"]:
+            # Create members on demand for the combinations of the basic options that
+            # aren't explicitly listed
+            if not isinstance(value, int) or value & ~cls.any.value or value < 0:
+                return None
+            bases = [
+                cls.leave,
+                cls.hardlink,
+                cls.symlink,
+                cls.reflink,
+                cls.copy,
+            ]
+            member = object.__new__(cls)
+            member._name_ = "_or_".join(b.name for b in bases if b.value & value)
+            member._value_ = value
+            return cls._value2member_map_.setdefault(value, member)  # type: ignore[return-value]
 
         def __xor__(self, other: "FileSet.CopyMode") -> "FileSet.CopyMode":
             return type(self)(self.value ^ other.value)
@@ -1360,6 +1856,26 @@ class FileSet(DataType):
         def __str__(self) -> str:
             return self.name
 
+    class SyncComparison(Enum):
+        """How the files of a file-set are compared with existing files at the
+        destination by FileSet.sync() to determine whether they need to be transferred
+
+        Values
+        ------
+        mtime
+            the files differ if their sizes or modification times differ
+        checksum
+            the files differ if their sizes or the digests of their contents differ.
+            Digests are memoised against the modification times of the files so only
+            need to be recalculated for files that have changed since the last sync
+        """
+
+        mtime = 1
+        checksum = 2
+
+        def __str__(self) -> str:
+            return self.name
+
     def copy(
         self,
         dest_dir: PathType,
@@ -1371,10 +1887,11 @@ class FileSet(DataType):
         trim: bool = True,
         make_dirs: bool = False,
         overwrite: bool = False,
-        avoid_clashes: ty.Union[bool, ty.Set[Path]] = False,
+        avoid_clashes: ty.Union[bool, ty.Set[Path], copying.DestinationIndex] = False,
         clash_template: str = "{stem} ({counter})",
         supported_modes: CopyMode = CopyMode.any,
         extension_decomposition: ExtensionDecomposition = ExtensionDecomposition.single,
+        max_workers: ty.Optional[int] = None,
     ) -> Self:
         """Copies the file-set to a new directory, optionally renaming the files
         to have consistent name-stems.
@@ -1382,8 +1899,8 @@ class FileSet(DataType):
         Based on the range of options provided, copy determines the "laziest" mode to use,
         i.e. if we can leave the files where they are and satisfy both the explicit mode
         requested by the user and the "collation" requirements (see FileSet.CopyCollation),
-        we prefer to do so, otherwise we prefer to symlink, then hardlink,
-        then as a last resort a full copy.
+        we prefer to do so, otherwise we prefer to symlink, then hardlink, then reflink
+        (copy-on-write clone), then as a last resort a full copy.
 
         Parameters
         ----------
@@ -1413,7 +1930,7 @@ class FileSet(DataType):
         overwrite : bool, optional
             whether to overwrite existing files/directories if present, ignored if
             avoid_clashes is set to True, by default False
-        avoid_clashes : bool or set[Path], optional
+        avoid_clashes : bool or set[Path] or DestinationIndex, optional
             whether to avoid name clashes between files in the file-set and existing files.
             In this case the clash_template is used to generate a new name for the file
             that doesn't clash with any existing files. If a set of paths is provided, then
@@ -1421,6 +1938,9 @@ class FileSet(DataType):
             overwrite flag is irrelevant), or a set of paths to avoid clashes with.
             If a set is provided, then the copied files will be added to that set as they
             are copied to allow a series of copies to guarantee to have unique paths.
+            A `copying.DestinationIndex` can be provided instead of a set to also avoid
+            existing files, with the destination directory listed once instead of
+            each candidate name being checked on disk.
         clash_template: str
             The template used to generate a new file name if there is a clash with an
             existing file. It should be a string template containing "stem", "counter"
@@ -1434,92 +1954,27 @@ class FileSet(DataType):
             last (single) or be empty (none), when the extension of a fspath in the
             FileSet isn't explicitly defined by the FileSet class. Only relevant when
             collation mode is set to "adjacent". By default True
+        max_workers : int, optional
+            the number of threads to copy/link the paths of the file-set, and the files
+            within any directories in it, across. Useful for file-sets containing many
+            files on file-systems with high per-file latencies (e.g. NFS, Lustre). By
+            default the files are copied one after another
         """
         self._check_clash_template(clash_template)
         dest_dir = Path(dest_dir)
-        # Logic to determine the laziest mode to use
         mode = self.CopyMode[mode] if isinstance(mode, str) else mode
-        if len(self.fspaths) == 1:
-            # If there is only one path to copy, then collation isn't meaningful
-            collation = self.CopyCollation.any
-        else:
-            collation = (
-                self.CopyCollation[collation]
-                if isinstance(collation, str)
-                else collation
-            )
-        # Rule out any copy modes that are not supported given the collation mode
-        # and file-system mounts the paths and destination directory reside on
-        constraints = []
-        if (
-            not FsMountIdentifier.symlinks_supported(dest_dir)
-            and mode & self.CopyMode.symlink
-        ):
-            supported_modes -= self.CopyMode.symlink
-            constraint = (
-                f"Destination directory is on CIFS mount ({dest_dir}) "
-                "and we therefore cannot create a symlink"
-            )
-            logger.debug(constraint)
-            constraints.append(constraint)
-        not_on_same_mount = [
-            p for p in self.fspaths if not FsMountIdentifier.on_same_mount(p, dest_dir)
-        ]
-        if not_on_same_mount and mode & self.CopyMode.hardlink:
-            supported_modes -= self.CopyMode.hardlink
-            constraint = (
-                f"Some paths ({', '.join(str(p) for p in not_on_same_mount)}) are on "
-                f"not on same file-system mount as the destination directory {dest_dir}"
-                "and therefore cannot be hard-linked"
-            )
-            logger.debug(constraint)
-            constraints.append(constraint)
-        if (
-            new_stem
-            or prefix
-            or stem_suffix
-            or (
-                collation >= self.CopyCollation.siblings
-                and not all(p.parent == self.parent for p in self.fspaths)
-            )
-        ):
-            supported_modes -= self.CopyMode.leave
-
-        # Get the intersection of copy modes that are supported and have been requested
-        selected_mode = mode & supported_modes
-        if not selected_mode:
-            msg = (
-                f"Cannot copy {self} using '{mode}' mode as it is not supported by "
-                f"the '{supported_modes}' given the collation specification, {collation}"
-            )
-            if constraints:
-                msg += ", and the following constraints:\n" + "\n".join(constraints)
-            raise UnsatisfiableCopyModeError(msg)
+        collation = self._copy_collation(collation)
+        selected_mode = self._select_copy_mode(
+            mode=mode,
+            collation=collation,
+            dest_dir=dest_dir,
+            supported_modes=supported_modes,
+            renamed=bool(new_stem or prefix or stem_suffix),
+            mounts={},
+        )
         if selected_mode & self.CopyMode.leave:
             return self  # Don't need to do anything
-
-        copy_file: ty.Callable[[Path, Path], None]
-        copy_dir: ty.Callable[[Path, Path], None]
-
-        # Select inner copy/link methods
-        if selected_mode & self.CopyMode.symlink:
-            copy_dir = copy_file = os.symlink
-        elif selected_mode & self.CopyMode.hardlink:
-            copy_file = os.link
-
-            def hardlink_dir(src: Path, dest: Path) -> None:
-                for dpath_str, _, fpaths in os.walk(src):
-                    dpath = Path(dpath_str)
-                    relpath = dpath.relative_to(src)
-                    (dest / relpath).mkdir()
-                    for fpath in fpaths:
-                        os.link(dpath / fpath, dest / relpath / fpath)
-
-            copy_dir = hardlink_dir
-        else:
-            assert selected_mode & self.CopyMode.copy
-            copy_dir = shutil.copytree
-            copy_file = shutil.copyfile  # type: ignore
+        copy_path = self._copy_path_function(selected_mode, max_workers=max_workers)
 
         # Prepare destination directory
         dest_dir = Path(dest_dir)
@@ -1539,23 +1994,14 @@ class FileSet(DataType):
             avoid_clashes=avoid_clashes,
             extension_decomposition=extension_decomposition,
         )
-        # Iterate through the paths to copy, copying them to the destination directory
-        new_paths: ty.List[Path] = []
-        for fspath, new_path in src_dest:
+        if overwrite:
+            self._remove_overwritten(n for _, n in src_dest)
+        # Create the parent directories of the destination paths in order, then copy
+        # the paths to them
+        for _, new_path in src_dest:
             new_path.parent.mkdir(parents=True, exist_ok=True)
-            if fspath.is_dir():
-                copy_dir(fspath, new_path)
-            else:
-                try:
-                    copy_file(fspath, new_path)
-                except PermissionError as e:
-                    if e.errno == errno.EPERM and copy_file is not shutil.copyfile:  # type: ignore[comparison-overlap]
-                        # Fallback to proper copy if the link fails for some reason
-                        shutil.copyfile(fspath, new_path)
-                    else:
-                        raise
-
-            new_paths.append(new_path)
+        copying.transfer(src_dest, copy_path, max_workers=max_workers)
+        new_paths = [new_path for _, new_path in src_dest]
         return type(self)(new_paths)
 
     def move(
@@ -1568,9 +2014,11 @@ class FileSet(DataType):
         trim: bool = True,
         make_dirs: bool = False,
         overwrite: bool = False,
-        avoid_clashes: ty.Union[bool, ty.Set[Path]] = False,
+        avoid_clashes: ty.Union[bool, ty.Set[Path], copying.DestinationIndex] = False,
         clash_template: str = "{stem} ({counter})",
         extension_decomposition: ExtensionDecomposition = ExtensionDecomposition.single,
+        progress: ty.Optional[ty.Callable[[copying.TransferProgress], None]] = None,
+        verify: bool = True,
     ) -> Self:
         """Moves the file-set to a new directory, optionally renaming the files
         to have consistent name-stems.
@@ -1599,7 +2047,7 @@ class FileSet(DataType):
         overwrite : bool, optional
             whether to overwrite existing files/directories if present, ignored if
             avoid_clashes is set to True, by default False
-        avoid_clashes : bool or set[Path], optional
+        avoid_clashes : bool or set[Path] or DestinationIndex, optional
             whether to avoid name clashes between files in the file-set and existing files.
             In this case the clash_template is used to generate a new name for the file
             that doesn't clash with any existing files. If a set of paths is provided, then
@@ -1607,6 +2055,9 @@ class FileSet(DataType):
             overwrite flag is irrelevant), or a set of paths to avoid clashes with.
             If a set is provided, then the copied files will be added to that set as they
             are copied to allow a series of copies to guarantee to have unique paths.
+            A `copying.DestinationIndex` can be provided instead of a set to also avoid
+            existing files, with the destination directory listed once instead of
+            each candidate name being checked on disk.
         clash_template: str
             The template used to generate a new file name if there is a clash with an
             existing file. It should be a string template containing "stem", "counter"
@@ -1617,18 +2068,17 @@ class FileSet(DataType):
             last (single) or be empty (none), when the extension of a fspath in the
             FileSet isn't explicitly defined by the FileSet class. Only relevant when
             collation mode is set to "adjacent". By default True
+        progress : Callable[[copying.TransferProgress], None], optional
+            called with the progress of the move (i.e. the numbers of bytes and files
+            done out of the totals) as each file, or chunk of a file streamed to a
+            different file-system, is moved
+        verify : bool, optional
+            whether to verify the contents of files streamed to a different file-system
+            against the originals before the originals are deleted, by default True
         """
         self._check_clash_template(clash_template)
         dest_dir = Path(dest_dir)
-        if len(self.fspaths) == 1:
-            # If there is only one path to copy, then collation isn't meaningful
-            collation = self.CopyCollation.any
-        else:
-            collation = (
-                self.CopyCollation[collation]
-                if isinstance(collation, str)
-                else collation
-            )
+        collation = self._copy_collation(collation)
         # Create destination directory
         dest_dir = Path(dest_dir)  # ensure a Path not a string
         if make_dirs:
@@ -1647,14 +2097,558 @@ class FileSet(DataType):
             avoid_clashes=avoid_clashes,
             extension_decomposition=extension_decomposition,
         )
+        if overwrite:
+            self._remove_overwritten(n for _, n in to_move_pairs)
+        tracker = (
+            copying.TransferProgress.of_paths((p for p, _ in to_move_pairs), progress)
+            if progress is not None
+            else None
+        )
         new_paths: ty.List[Path] = []
         for fspath, new_path in to_move_pairs:
             new_path.parent.mkdir(parents=True, exist_ok=True)
-            shutil.move(str(fspath), new_path)
+            copying.move_path(fspath, new_path, progress=tracker, verify=verify)
             new_paths.append(new_path)
         self.fspaths = frozenset(new_paths)
         return self
 
+    def sync(
+        self,
+        dest_dir: PathType,
+        collation: ty.Union[CopyCollation, str] = CopyCollation.any,
+        new_stem: ty.Optional[str] = None,
+        prefix: str = "",
+        stem_suffix: str = "",
+        trim: bool = True,
+        make_dirs: bool = False,
+        comparison: ty.Union[SyncComparison, str] = SyncComparison.mtime,
+        delete_extra: bool = False,
+        extension_decomposition: ExtensionDecomposition = ExtensionDecomposition.single,
+        max_workers: ty.Optional[int] = None,
+    ) -> Self:
+        """Incrementally copies the file-set to a new directory, only transferring the
+        files that are missing from the destination or differ from the existing files
+        there (see FileSet.SyncComparison), e.g. to mirror file-sets that have been
+        partially updated since they were last copied. Directories within the file-set
+        are synced recursively. The modification times of the transferred files are
+        preserved so that unchanged files aren't transferred again by the next sync.
+
+        Parameters
+        ----------
+        dest_dir : str
+            Path to the parent directory to sync the file-set to
+        collation : FileSet.CopyCollation or str, optional
+            how to treat relative paths within the fileset, see `FileSet.copy`
+        new_stem: str, optional
+            the file name excluding file extensions, to give the files/dirs in the parent
+            directory, by default the original file name is used
+        prefix : str, optional
+            the prefix to append to the stem of the file name, by default ""
+        stem_suffix : str, optional
+            the suffix to append to the stem of the file name (i.e. before the extension),
+            by default ""
+        trim : bool, optional
+            Only sync the paths in the file-set that are "required" by the format,
+            true by default
+        make_dirs : bool, optional
+            Make the parent destination and all missing ancestors if they are missing,
+            false by default
+        comparison : FileSet.SyncComparison or str, optional
+            how to determine whether existing files at the destination differ from the
+            files of the file-set, by default by their sizes and modification times
+        delete_extra : bool, optional
+            whether to delete files and sub-directories within the destinations of the
+            directories of the file-set that aren't in the file-set, by default they are
+            kept. Other paths in the destination directory are never deleted
+        extension_decomposition : FileSet.ExtensionDecomposition, optional
+            how to decompose the extensions of paths not explicitly defined by the
+            format, see `FileSet.copy`
+        max_workers : int, optional
+            the number of threads to compare and transfer the files across, by default
+            they are synced one after another
+
+        Returns
+        -------
+        FileSet
+            the synced file-set at the destination
+        """
+        dest_dir = Path(dest_dir)
+        collation = self._copy_collation(collation)
+        comparison = (
+            self.SyncComparison[comparison]
+            if isinstance(comparison, str)
+            else comparison
+        )
+        checksum = comparison == self.SyncComparison.checksum
+        if make_dirs:
+            dest_dir.mkdir(parents=True, exist_ok=True)
+        src_dest = self._src_dest_pairs(
+            dest_dir=dest_dir,
+            new_stem=new_stem,
+            trim=trim,
+            prefix=prefix,
+            stem_suffix=stem_suffix,
+            collation=collation,
+            overwrite=False,
+            clash_template="{stem} ({counter})",
+            avoid_clashes=False,
+            extension_decomposition=extension_decomposition,
+            check_existing=False,
+        )
+        for _, new_path in src_dest:
+            new_path.parent.mkdir(parents=True, exist_ok=True)
+
+        def sync_path(fspath: Path, new_path: Path) -> None:
+            if fspath.is_dir():
+                copying.sync_dir(
+                    fspath,
+                    new_path,
+                    checksum=checksum,
+                    delete_extra=delete_extra,
+                    max_workers=max_workers,
+                )
+            else:
+                copying.sync_file(fspath, new_path, checksum=checksum)
+
+        copying.transfer(src_dest, sync_path, max_workers=max_workers)
+        return type(self)([new_path for _, new_path in src_dest])
+
+    @classmethod
+    def copy_many(
+        cls,
+        filesets: ty.Iterable["FileSet"],
+        dest_dir: PathType,
+        mode: ty.Union[CopyMode, str] = CopyMode.copy,
+        collation: ty.Union[CopyCollation, str] = CopyCollation.any,
+        prefix: str = "",
+        stem_suffix: str = "",
+        trim: bool = True,
+        make_dirs: bool = False,
+        overwrite: bool = False,
+        avoid_clashes: ty.Union[bool, ty.Set[Path], copying.DestinationIndex] = False,
+        clash_template: str = "{stem} ({counter})",
+        supported_modes: CopyMode = CopyMode.any,
+        extension_decomposition: ExtensionDecomposition = ExtensionDecomposition.single,
+        max_workers: ty.Optional[int] = None,
+    ) -> ty.List["FileSet"]:
+        """Copies many file-sets to the same destination directory in bulk. Equivalent
+        to calling `FileSet.copy` on each of the file-sets, except that the capabilities
+        of the file-system mounts are only looked up once per directory, the directories
+        to create are batched and the copies of all the file-sets are run through a
+        single pool of threads.
+
+        The destination paths of all the file-sets are determined before any are copied,
+        so they must be unique across the file-sets unless `avoid_clashes` is set. If
+        the plan for any of the file-sets is rejected, nothing is written (or removed
+        if `overwrite` is set).
+
+        Parameters
+        ----------
+        filesets : Iterable[FileSet]
+            the file-sets to copy
+        dest_dir : PathType
+            Path to the parent directory to save the file-sets
+        mode : FileSet.CopyMode or str, optional
+            designates whether to perform an actual copy or whether a link is okay, see
+            `FileSet.copy` for details
+        collation : FileSet.CopyCollation or str, optional
+            how to treat relative paths within the file-sets, see `FileSet.copy`
+        prefix : str, optional
+            the prefix to append to the stems of the file names, by default ""
+        stem_suffix : str, optional
+            the suffix to append to the stems of the file names, by default ""
+        trim : bool, optional
+            Only copy the paths in the file-sets that are "required" by their formats,
+            true by default
+        make_dirs : bool, optional
+            Make the parent destination and all missing ancestors if they are missing,
+            false by default
+        overwrite : bool, optional
+            whether to overwrite existing files/directories if present, by default False
+        avoid_clashes : bool or set[Path] or DestinationIndex, optional
+            whether to avoid name clashes with existing files and between the file-sets,
+            see `FileSet.copy`
+        clash_template: str
+            The template used to generate a new file name if there is a clash with an
+            existing file, by default "{stem} ({counter})"
+        supported_modes : CopyMode, optional
+            supported modes for the copy operation. Used to mask out the requested
+            copy mode
+        extension_decomposition : FileSet.ExtensionDecomposition, optional
+            how to decompose the extensions of paths not explicitly defined by the
+            format, see `FileSet.copy`
+        max_workers : int, optional
+            the number of threads to run the copies across, by default the files are
+            copied one after another
+
+        Returns
+        -------
+        list[FileSet]
+            the copied file-sets, in the order they were provided
+        """
+        filesets = list(filesets)
+        dest_dir = Path(dest_dir)
+        mode = cls.CopyMode[mode] if isinstance(mode, str) else mode
+        if avoid_clashes is True:
+            # Share an index of the destination between the file-sets, so that the
+            # destinations planned for each are avoided by the file-sets after it
+            avoid_clashes = copying.DestinationIndex()
+        mounts: ty.Dict[Path, ty.Tuple[Path, str]] = {}
+        copy_paths: ty.Dict["FileSet.CopyMode", ty.Callable[[Path, Path], None]] = {}
+        plans: ty.List[ty.Tuple["FileSet", ty.List[ty.Tuple[Path, Path]]]] = []
+        transfer_functions: ty.Dict[Path, ty.Callable[[Path, Path], None]] = {}
+        for fileset in filesets:
+            fileset._check_clash_template(clash_template)
+            fs_collation = fileset._copy_collation(collation)
+            selected_mode = fileset._select_copy_mode(
+                mode=mode,
+                collation=fs_collation,
+                dest_dir=dest_dir,
+                supported_modes=supported_modes,
+                renamed=bool(prefix or stem_suffix),
+                mounts=mounts,
+            )
+            if selected_mode & cls.CopyMode.leave:
+                plans.append((fileset, []))
+                continue
+            try:
+                copy_path = copy_paths[selected_mode]
+            except KeyError:
+                copy_path = copy_paths[selected_mode] = cls._copy_path_function(
+                    selected_mode
+                )
+            pairs = fileset._src_dest_pairs(
+                dest_dir=dest_dir,
+                new_stem=None,
+                trim=trim,
+                prefix=prefix,
+                stem_suffix=stem_suffix,
+                collation=fs_collation,
+                overwrite=overwrite,
+                clash_template=clash_template,
+                avoid_clashes=avoid_clashes,
+                extension_decomposition=extension_decomposition,
+            )
+            for _, new_path in pairs:
+                transfer_functions[new_path] = copy_path
+            plans.append((fileset, pairs))
+
+        def copy_planned(src: Path, dest: Path) -> None:
+            transfer_functions[dest](src, dest)
+
+        cls._transfer_many(
+            plans,
+            copy_planned,
+            max_workers,
+            overwrite=overwrite,
+            dest_dir=dest_dir if make_dirs else None,
+        )
+        return [
+            type(fileset)([n for _, n in pairs]) if pairs else fileset
+            for fileset, pairs in plans
+        ]
+
+    @classmethod
+    def move_many(
+        cls,
+        filesets: ty.Iterable["FileSet"],
+        dest_dir: PathType,
+        collation: ty.Union[CopyCollation, str] = CopyCollation.any,
+        prefix: str = "",
+        stem_suffix: str = "",
+        trim: bool = True,
+        make_dirs: bool = False,
+        overwrite: bool = False,
+        avoid_clashes: ty.Union[bool, ty.Set[Path], copying.DestinationIndex] = False,
+        clash_template: str = "{stem} ({counter})",
+        extension_decomposition: ExtensionDecomposition = ExtensionDecomposition.single,
+        max_workers: ty.Optional[int] = None,
+        progress: ty.Optional[ty.Callable[[copying.TransferProgress], None]] = None,
+        verify: bool = True,
+    ) -> ty.List["FileSet"]:
+        """Moves many file-sets to the same destination directory in bulk. Equivalent to
+        calling `FileSet.move` on each of the file-sets, except that the directories to
+        create are batched and the moves of all the file-sets are run through a single
+        pool of threads.
+
+        The destination paths of all the file-sets are determined before any are moved,
+        so they must be unique across the file-sets unless `avoid_clashes` is set. If
+        the plan for any of the file-sets is rejected, nothing is written (or removed
+        if `overwrite` is set).
+
+        Parameters
+        ----------
+        filesets : Iterable[FileSet]
+            the file-sets to move, which are updated in place to point to the new paths
+        dest_dir : PathType
+            Path to the parent directory to move the file-sets to
+        collation : FileSet.CopyCollation or str, optional
+            how to treat relative paths within the file-sets, see `FileSet.move`
+        prefix : str, optional
+            the prefix to append to the stems of the file names, by default ""
+        stem_suffix : str, optional
+            the suffix to append to the stems of the file names, by default ""
+        trim : bool, optional
+            Only move the paths in the file-sets that are "required" by their formats,
+            true by default
+        make_dirs : bool, optional
+            Make the parent destination and all missing ancestors if they are missing,
+            false by default
+        overwrite : bool, optional
+            whether to overwrite existing files/directories if present, by default False
+        avoid_clashes : bool or set[Path] or DestinationIndex, optional
+            whether to avoid name clashes with existing files and between the file-sets,
+            see `FileSet.move`
+        clash_template: str
+            The template used to generate a new file name if there is a clash with an
+            existing file, by default "{stem} ({counter})"
+        extension_decomposition : FileSet.ExtensionDecomposition, optional
+            how to decompose the extensions of paths not explicitly defined by the
+            format, see `FileSet.move`
+        max_workers : int, optional
+            the number of threads to run the moves across, by default the files are
+            moved one after another
+        progress : Callable[[copying.TransferProgress], None], optional
+            called with the overall progress of the moves (i.e. the numbers of bytes and files
+            done out of the totals) as each file, or chunk of a file streamed to a
+            different file-system, is moved
+        verify : bool, optional
+            whether to verify the contents of files streamed to a different file-system
+            against the originals before the originals are deleted, by default True
+
+        Returns
+        -------
+        list[FileSet]
+            the moved file-sets, in the order they were provided
+        """
+        filesets = list(filesets)
+        dest_dir = Path(dest_dir)
+        if avoid_clashes is True:
+            # Share an index of the destination between the file-sets, so that the
+            # destinations planned for each are avoided by the file-sets after it
+            avoid_clashes = copying.DestinationIndex()
+        plans: ty.List[ty.Tuple["FileSet", ty.List[ty.Tuple[Path, Path]]]] = []
+        for fileset in filesets:
+            fileset._check_clash_template(clash_template)
+            pairs = fileset._src_dest_pairs(
+                dest_dir=dest_dir,
+                new_stem=None,
+                trim=trim,
+                prefix=prefix,
+                stem_suffix=stem_suffix,
+                collation=fileset._copy_collation(collation),
+                overwrite=overwrite,
+                clash_template=clash_template,
+                avoid_clashes=avoid_clashes,
+                extension_decomposition=extension_decomposition,
+            )
+            plans.append((fileset, pairs))
+        tracker = (
+            copying.TransferProgress.of_paths(
+                (p for _, pairs in plans for p, _ in pairs), progress
+            )
+            if progress is not None
+            else None
+        )
+        cls._transfer_many(
+            plans,
+            functools.partial(copying.move_path, progress=tracker, verify=verify),
+            max_workers,
+            overwrite=overwrite,
+            dest_dir=dest_dir if make_dirs else None,
+        )
+        for fileset, pairs in plans:
+            fileset.fspaths = frozenset(n for _, n in pairs)
+        return filesets
+
+    @staticmethod
+    def _transfer_many(
+        plans: ty.List[ty.Tuple["FileSet", ty.List[ty.Tuple[Path, Path]]]],
+        transfer_function: ty.Callable[[Path, Path], ty.Any],
+        max_workers: ty.Optional[int],
+        overwrite: bool = False,
+        dest_dir: ty.Optional[Path] = None,
+    ) -> None:
+        """Runs the planned transfers of a bulk copy/move, once the plans of all the
+        file-sets have been checked, removing existing paths to be overwritten and
+        creating the destination directories (including `dest_dir` if provided) first"""
+        all_pairs = [p for _, pairs in plans for p in pairs]
+        destinations = Counter(n for _, n in all_pairs)
+        if clashes := [str(n) for n, c in destinations.items() if c > 1]:
+            raise FileExistsError(
+                "Destination paths clash between the file-sets being copied/moved, set "
+                f"'avoid_clashes' to avoid them: {clashes}"
+            )
+        if overwrite:
+            FileSet._remove_overwritten(destinations)
+        if dest_dir is not None:
+            dest_dir.mkdir(parents=True, exist_ok=True)
+        # Sorted so parent directories are created before their children
+        for dpath in sorted(set(n.parent for n in destinations)):
+            dpath.mkdir(parents=True, exist_ok=True)
+        copying.transfer(all_pairs, transfer_function, max_workers=max_workers)
+
+    def _copy_collation(
+        self, collation: ty.Union[CopyCollation, str]
+    ) -> "FileSet.CopyCollation":
+        """Resolves the collation mode to use to copy/move the file-set"""
+        if len(self.fspaths) == 1:
+            # If there is only one path to copy, then collation isn't meaningful
+            return self.CopyCollation.any
+        return (
+            self.CopyCollation[collation] if isinstance(collation, str) else collation
+        )
+
+    def _select_copy_mode(
+        self,
+        mode: CopyMode,
+        collation: CopyCollation,
+        dest_dir: Path,
+        supported_modes: CopyMode,
+        renamed: bool,
+        mounts: ty.Dict[Path, ty.Tuple[Path, str]],
+    ) -> "FileSet.CopyMode":
+        """Determines the "laziest" copy mode that satisfies the requested mode, the
+        collation and the capabilities of the file-system mounts the paths and
+        destination directory reside on.
+
+        Parameters
+        ----------
+        mode : FileSet.CopyMode
+            the requested copy mode(s)
+        collation : FileSet.CopyCollation
+            the resolved collation mode
+        dest_dir : Path
+            the destination directory
+        supported_modes : FileSet.CopyMode
+            the modes supported by the caller
+        renamed : bool
+            whether the copied paths are to be renamed
+        mounts : dict[Path, tuple[Path, str]]
+            mount points and file-system types of previously looked up directories,
+            which can be shared between the copies of several file-sets to the same
+            destination so they are only looked up once
+
+        Returns
+        -------
+        FileSet.CopyMode
+            the selected copy mode
+
+        Raises
+        ------
+        UnsatisfiableCopyModeError
+            if none of the requested modes are supported
+        """
+        dest_mount, dest_fstype = self._lookup_mount(dest_dir, mounts)
+        # Rule out any copy modes that are not supported given the collation mode
+        # and file-system mounts the paths and destination directory reside on
+        constraints = []
+        if dest_fstype == "cifs" and mode & self.CopyMode.symlink:
+            supported_modes -= self.CopyMode.symlink
+            constraint = (
+                f"Destination directory is on CIFS mount ({dest_dir}) "
+                "and we therefore cannot create a symlink"
+            )
+            logger.debug(constraint)
+            constraints.append(constraint)
+        not_on_same_mount = [
+            p for p in self.fspaths if self._lookup_mount(p, mounts)[0] != dest_mount
+        ]
+        if not_on_same_mount and mode & self.CopyMode.hardlink:
+            supported_modes -= self.CopyMode.hardlink
+            constraint = (
+                f"Some paths ({', '.join(str(p) for p in not_on_same_mount)}) are on "
+                f"not on same file-system mount as the destination directory {dest_dir}"
+                "and therefore cannot be hard-linked"
+            )
+            logger.debug(constraint)
+            constraints.append(constraint)
+        if mode & self.CopyMode.reflink:
+            if not_on_same_mount:
+                supported_modes -= self.CopyMode.reflink
+                constraint = (
+                    f"Some paths ({', '.join(str(p) for p in not_on_same_mount)}) are "
+                    "not on same file-system mount as the destination directory "
+                    f"{dest_dir} and therefore cannot be reflinked"
+                )
+                logger.debug(constraint)
+                constraints.append(constraint)
+            elif dest_fstype not in FsMountIdentifier.REFLINK_FS_TYPES:
+                supported_modes -= self.CopyMode.reflink
+                constraint = (
+                    f"Destination directory ({dest_dir}) is not on a file-system that "
+                    "supports reflinks"
+                )
+                logger.debug(constraint)
+                constraints.append(constraint)
+        if renamed or (
+            collation >= self.CopyCollation.siblings
+            and not all(p.parent == self.parent for p in self.fspaths)
+        ):
+            supported_modes -= self.CopyMode.leave
+
+        # Get the intersection of copy modes that are supported and have been requested
+        selected_mode = mode & supported_modes
+        if not selected_mode:
+            msg = (
+                f"Cannot copy {self} using '{mode}' mode as it is not supported by "
+                f"the '{supported_modes}' given the collation specification, {collation}"
+            )
+            if constraints:
+                msg += ", and the following constraints:\n" + "\n".join(constraints)
+            raise UnsatisfiableCopyModeError(msg)
+        return selected_mode
+
+    @classmethod
+    def _copy_path_function(
+        cls, selected_mode: CopyMode, max_workers: ty.Optional[int] = None
+    ) -> ty.Callable[[Path, Path], None]:
+        """Returns a function that copies/links a path of a file-set to its destination
+        using the selected copy mode"""
+        copy_file: ty.Callable[[Path, Path], None]
+        copy_dir: ty.Callable[[Path, Path], None]
+
+        # Select inner copy/link methods
+        if selected_mode & cls.CopyMode.symlink:
+            copy_dir = copy_file = os.symlink
+        elif selected_mode & cls.CopyMode.hardlink:
+            copy_file = os.link
+            copy_dir = functools.partial(copying.hardlink_dir, max_workers=max_workers)
+        elif selected_mode & cls.CopyMode.reflink:
+            copy_file = copying.reflink_file
+            copy_dir = functools.partial(copying.reflink_dir, max_workers=max_workers)
+        else:
+            assert selected_mode & cls.CopyMode.copy
+            copy_file = copying.copy_file
+            copy_dir = functools.partial(copying.copy_dir, max_workers=max_workers)
+
+        def copy_path(fspath: Path, new_path: Path) -> None:
+            if fspath.is_dir():
+                copy_dir(fspath, new_path)
+            else:
+                try:
+                    copy_file(fspath, new_path)
+                except PermissionError as e:
+                    if e.errno == errno.EPERM and copy_file is not copying.copy_file:
+                        # Fallback to proper copy if the link fails for some reason
+                        copying.copy_file(fspath, new_path)
+                    else:
+                        raise
+
+        return copy_path
+
+    @staticmethod
+    def _lookup_mount(
+        dpath: Path, mounts: ty.Dict[Path, ty.Tuple[Path, str]]
+    ) -> ty.Tuple[Path, str]:
+        """Looks up the mount point and file-system type of a path, memoised in the
+        provided dictionary"""
+        try:
+            return mounts[dpath]
+        except KeyError:
+            mount = mounts[dpath] = FsMountIdentifier.get_mount(dpath)
+            return mount
+
     def _src_dest_pairs(
         self,
         dest_dir: Path,
@@ -1665,8 +2659,9 @@ class FileSet(DataType):
         collation: CopyCollation,
         clash_template: str,
         overwrite: bool,
-        avoid_clashes: ty.Union[bool, ty.Set[Path]],
+        avoid_clashes: ty.Union[bool, ty.Set[Path], copying.DestinationIndex],
         extension_decomposition: ExtensionDecomposition,
+        check_existing: bool = True,
     ) -> ty.List[ty.Tuple[Path, Path]]:
         """Returns the source-destination pairs for the file-paths to be copied/moved
 
@@ -1692,6 +2687,9 @@ class FileSet(DataType):
             existing file. It should be a string template containing "stem", "counter"
             and "ext", where counter is the number of files found with the same stem/
             extension
+        check_existing : bool, optional
+            whether to check for (and overwrite or avoid) existing paths at the
+            destinations, by default True
 
         Returns
         -------
@@ -1734,6 +2732,27 @@ class FileSet(DataType):
             collation = self.CopyCollation.siblings
         # Iterate through the paths to copy/move and determine their destination paths
         counter = 0
+        counter_key = None
+        if isinstance(avoid_clashes, copying.DestinationIndex):
+            # Resume the search for a free name from where the last search for the same
+            # names ended
+            counter_key = (clash_template,) + tuple(
+                self._new_copy_path(
+                    parent_dir=parent_dir,
+                    stem=stem,
+                    ext=ext,
+                    dest_dir=dest_dir,
+                    new_stem=new_stem,
+                    prefix=prefix,
+                    stem_suffix=stem_suffix,
+                    collation=collation,
+                    counter=0,
+                    clash_template=clash_template,
+                    extension_decomposition=extension_decomposition,
+                )
+                for parent_dir, stem, ext in decomposed_fspaths
+            )
+            counter = avoid_clashes.counter_hint(counter_key)
         previous_clashes = set()
         pairs: ty.List[ty.Tuple[Path, Path]] = []
         # We loop until we have a set of paths that don't clash with existing files
@@ -1761,7 +2780,9 @@ class FileSet(DataType):
                         f"{clash_template!r}, as it is not possible to generate a "
                         f"unique path, tried {str(new_path)!r}"
                     )
-                if self._destination_to_avoid(new_path, overwrite, avoid_clashes):
+                if check_existing and self._destination_to_avoid(
+                    new_path, overwrite, avoid_clashes
+                ):
                     iterate_counter = True
                     previous_clashes.add(new_path)
                     break
@@ -1771,7 +2792,9 @@ class FileSet(DataType):
                 pairs = []
                 counter += 1
         # Update the paths to avoid with the new paths
-        if isinstance(avoid_clashes, set):
+        if isinstance(avoid_clashes, copying.DestinationIndex):
+            avoid_clashes.record_counter(counter_key, counter)
+        if isinstance(avoid_clashes, (set, copying.DestinationIndex)):
             avoid_clashes.update(n for o, n in pairs)
         return pairs
 
@@ -1863,33 +2886,46 @@ class FileSet(DataType):
         self,
         new_path: Path,
         overwrite: bool,
-        avoid_clashes: ty.Union[bool, ty.Set[Path]],
+        avoid_clashes: ty.Union[bool, ty.Set[Path], copying.DestinationIndex],
     ) -> bool:
         """Check if the destination path already exists and whether to avoid it"""
-        if overwrite and avoid_clashes is True:
+        if overwrite and (
+            avoid_clashes is True or isinstance(avoid_clashes, copying.DestinationIndex)
+        ):
             raise ValueError(
                 "Cannot set both 'overwrite' and 'avoid_clashes' to True, as they are "
                 "mutually exclusive"
             )
-        if new_path.exists():
-            if overwrite:
-                if new_path.is_dir():
-                    shutil.rmtree(new_path)
-                else:
-                    os.unlink(new_path)
-                assert not new_path.exists()
-            elif avoid_clashes is True or (avoid_clashes and new_path in avoid_clashes):
+        if isinstance(avoid_clashes, copying.DestinationIndex):
+            return new_path in avoid_clashes
+        # Existing paths to be overwritten aren't removed until all the transfers have
+        # been planned (see _remove_overwritten), so nothing is deleted if the planning
+        # fails
+        if not overwrite and new_path.exists():
+            if avoid_clashes is True or (avoid_clashes and new_path in avoid_clashes):
                 return True
-            else:
-                raise FileExistsError(
-                    f"Destination path '{str(new_path)}' exists, set "
-                    "'overwrite' to overwrite it"
-                )
+            raise FileExistsError(
+                f"Destination path '{str(new_path)}' exists, set "
+                "'overwrite' to overwrite it"
+            )
         return isinstance(avoid_clashes, set) and new_path in avoid_clashes
 
+    @staticmethod
+    def _remove_overwritten(new_paths: ty.Iterable[Path]) -> None:
+        """Removes the existing paths at the destinations of a copy/move that are to be
+        overwritten, once the transfers have been planned"""
+        for new_path in new_paths:
+            if new_path.is_dir() and not new_path.is_symlink():
+                shutil.rmtree(new_path)
+            elif new_path.exists() or new_path.is_symlink():
+                os.unlink(new_path)
+
     # Class attributes, used to cache the results of the class methods
     _all_formats: ty.Optional[ty.Set[ty.Type["FileSet"]]] = None
     _formats_by_iana_mime: ty.Optional[ty.Dict[str, ty.Type["FileSet"]]] = None
     _formats_by_name: ty.Optional[ty.Dict[str, ty.Set[ty.Type["FileSet"]]]] = None
     _required_props: ty.Optional[ty.Tuple[str, ...]] = None
     _valid_class: ty.Optional[bool] = None
+
+    # Set on instances created by `trusted` until they are validated
+    _validation_pending: bool = False
@@ -0,0 +1,187 @@
+import typing as ty
+from array import array
+from pathlib import Path
+from .fileset import FileSet
+from .typing import PathType
+
+
+class FileSetArray(ty.Sequence[FileSet]):
+    """A compact, column-oriented, container for large numbers of file-sets (e.g. the
+    index of a dataset). Instead of holding FileSet objects, only the format of each
+    file-set and the parent directories and names of its paths are stored, with the
+    formats and parent directories interned so that each is only stored once. Full
+    FileSet objects are created on demand when items are accessed, using
+    `FileSet.trusted` so that the paths aren't revalidated.
+
+    Note that the metadata and load keyword arguments of the file-sets are not stored.
+    The materialised file-sets compare and hash equal to the ones they were created
+    from.
+
+    Parameters
+    ----------
+    filesets : Iterable[FileSet], optional
+        the file-sets to initialise the array with
+    """
+
+    def __init__(self, filesets: ty.Iterable[FileSet] = ()):
+        self._formats: ty.List[ty.Type[FileSet]] = []
+        self._format_ids: ty.Dict[ty.Type[FileSet], int] = {}
+        self._dirs: ty.List[str] = []
+        self._dir_ids: ty.Dict[str, int] = {}
+        # one entry per file-set, the index of its format in `_formats`
+        self._row_formats = array("l")
+        # one entry per file-set (plus a leading 0), the offsets of the paths of each
+        # file-set within the path columns
+        self._row_offsets = array("l", [0])
+        # one entry per path, the index of its parent directory in `_dirs`
+        self._path_dirs = array("l")
+        # one entry per path, the name of the path within its parent directory
+        self._path_names: ty.List[str] = []
+        self.extend(filesets)
+
+    def append(self, fileset: FileSet) -> None:
+        """Appends a file-set to the array
+
+        Parameters
+        ----------
+        fileset : FileSet
+            the file-set to append
+        """
+        self.add(type(fileset), *fileset.fspaths)
+
+    def extend(self, filesets: ty.Iterable[FileSet]) -> None:
+        """Appends several file-sets to the array
+
+        Parameters
+        ----------
+        filesets : Iterable[FileSet]
+            the file-sets to append
+        """
+        for fileset in filesets:
+            self.append(fileset)
+
+    def add(self, fileset_type: ty.Type[FileSet], *fspaths: PathType) -> None:
+        """Appends a file-set to the array from its format and paths without creating a
+        FileSet object. The paths should be already known to be in the format, as they
+        are not validated.
+
+        Parameters
+        ----------
+        fileset_type : type[FileSet]
+            the format of the file-set
+        *fspaths : PathType
+            the absolute file-system paths of the file-set
+        """
+        if not fspaths:
+            raise ValueError("No file-system paths provided to FileSetArray")
+        try:
+            format_id = self._format_ids[fileset_type]
+        except KeyError:
+            format_id = self._format_ids[fileset_type] = len(self._formats)
+            self._formats.append(fileset_type)
+        for fspath in fspaths:
+            fspath = Path(fspath)
+            if not fspath.is_absolute():
+                fspath = fspath.absolute()
+            parent = str(fspath.parent)
+            try:
+                dir_id = self._dir_ids[parent]
+            except KeyError:
+                dir_id = self._dir_ids[parent] = len(self._dirs)
+                self._dirs.append(parent)
+            self._path_dirs.append(dir_id)
+            self._path_names.append(fspath.name)
+        self._row_formats.append(format_id)
+        self._row_offsets.append(len(self._path_names))
+
+    def format_of(self, index: int) -> ty.Type[FileSet]:
+        """Returns the format of the file-set at the given index without creating it
+
+        Parameters
+        ----------
+        index : int
+            the index of the file-set in the array
+
+        Returns
+        -------
+        type[FileSet]
+            the format of the file-set
+        """
+        return self._formats[self._row_formats[index]]
+
+    def fspaths_of(self, index: int) -> ty.FrozenSet[Path]:
+        """Returns the paths of the file-set at the given index without creating it
+
+        Parameters
+        ----------
+        index : int
+            the index of the file-set in the array
+
+        Returns
+        -------
+        frozenset[Path]
+            the file-system paths of the file-set
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"FileSetArray index {index} out of range")
+        start, end = self._row_offsets[index], self._row_offsets[index + 1]
+        return frozenset(
+            Path(self._dirs[self._path_dirs[i]]) / self._path_names[i]
+            for i in range(start, end)
+        )
+
+    def hash_of(self, index: int) -> int:
+        """Returns the hash of the file-set at the given index without creating it,
+        which is equal to the hash of the materialised FileSet object
+
+        Parameters
+        ----------
+        index : int
+            the index of the file-set in the array
+
+        Returns
+        -------
+        int
+            the hash of the file-set
+        """
+        tp = self.format_of(index)
+        return hash((tp.__module__, tp.__name__, self.fspaths_of(index)))
+
+    @ty.overload
+    def __getitem__(self, index: int) -> FileSet:
+        ...  # noqa: E704
+
+    @ty.overload
+    def __getitem__(self, index: slice) -> "FileSetArray":
+        ...  # noqa: E704
+
+    def __getitem__(
+        self, index: ty.Union[int, slice]
+    ) -> ty.Union[FileSet, "FileSetArray"]:
+        if isinstance(index, slice):
+            sliced = type(self)()
+            for i in range(*index.indices(len(self))):
+                sliced.add(self.format_of(i), *self.fspaths_of(i))
+            return sliced
+        fspaths = self.fspaths_of(index)
+        return self.format_of(index).trusted(*fspaths)
+
+    def __len__(self) -> int:
+        return len(self._row_formats)
+
+    def __contains__(self, fileset: object) -> bool:
+        if not isinstance(fileset, FileSet):
+            return False
+        try:
+            format_id = self._format_ids[type(fileset)]
+        except KeyError:
+            return False
+        return any(
+            self._row_formats[i] == format_id and self.fspaths_of(i) == fileset.fspaths
+            for i in range(len(self))
+        )
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(<{len(self)} file-sets>)"
@@ -38,6 +38,30 @@ class FsMountIdentifier:
         """
         return cls.get_mount(path)[1] != "cifs"
 
+    @classmethod
+    def reflinks_supported(cls, path: PathLike) -> bool:
+        """Check whether the file-system the path is on is of a type that can support
+        reflinks (i.e. copy-on-write clones of files). Note that support may also depend
+        on how the file-system was created (e.g. XFS requires reflink=1) or, for overlay
+        file-systems, on the file-system of the upper directory, so reflinks may still
+        fail and need to fall back to full copies.
+
+        Parameters
+        ----------
+        path: os.PathLike
+            the file-system path to check
+
+        Returns
+        -------
+        bool
+            whether the file-system can support reflinks
+        """
+        try:
+            fstype = cls.get_mount(path)[1]
+        except ValueError:
+            return False
+        return fstype in cls.REFLINK_FS_TYPES
+
     @classmethod
     def on_same_mount(cls, path1: PathLike, path2: PathLike) -> bool:
         """Checks whether two or paths are on the same logical file system"""
@@ -179,6 +203,11 @@ class FsMountIdentifier:
 
     _mount_table: ty.Optional[ty.List[ty.Tuple[str, str]]] = None
 
+    # File-system types that can support reflinks (copy-on-write clones)
+    REFLINK_FS_TYPES = frozenset(
+        ["btrfs", "xfs", "bcachefs", "ocfs2", "zfs", "overlay"]
+    )
+
     # Define a table of file system types and their mtime resolutions (in seconds)
     FS_MAX_MTIME_NS_RESOLUTION: ty.Dict[str, int] = {
         "ext4": int(1e9),  # docs say 1 nanosecond but in found 1 sec often in practice
@@ -1,8 +1,101 @@
 import io
+import os
+import mmap
+import shutil
+import tempfile
 import typing as ty
 from types import TracebackType
 
 
+# Ranges separated by gaps of up to this many bytes are coalesced into a single read
+COALESCE_GAP_DEFAULT = 4096
+
+
+def pread_ranges(
+    fd: int,
+    ranges: ty.Sequence[ty.Tuple[int, ty.Optional[int]]],
+    coalesce_gap: int = COALESCE_GAP_DEFAULT,
+) -> ty.List[bytes]:
+    """Reads several byte ranges from an open file descriptor without moving its file
+    position (where `os.pread` is available), coalescing ranges that overlap or are
+    separated by small gaps into single reads
+
+    Parameters
+    ----------
+    fd : int
+        the file descriptor to read from
+    ranges : Sequence[tuple[int, int or None]]
+        the (offset, size) pairs of the ranges to read. Negative offsets are
+        interpreted as being from the end of the file, and sizes of None as to the end
+        of the file
+    coalesce_gap : int, optional
+        the maximum gap between ranges that are coalesced into a single read, by default
+        COALESCE_GAP_DEFAULT
+
+    Returns
+    -------
+    list[bytes]
+        the bytes read for each range in the order they were requested (truncated at the
+        end of the file)
+    """
+    file_size = os.fstat(fd).st_size
+    bounds = []
+    for offset, size in ranges:
+        if offset < 0:
+            offset = max(file_size + offset, 0)
+        end = file_size if size is None else min(offset + size, file_size)
+        bounds.append((offset, max(end, offset)))
+    # Group the ranges into blocks of overlapping/nearby ranges
+    blocks: ty.List[ty.Tuple[int, int, ty.List[int]]] = []
+    for i in sorted(range(len(bounds)), key=lambda i: bounds[i]):
+        start, end = bounds[i]
+        if blocks and start <= blocks[-1][1] + coalesce_gap:
+            block_start, block_end, indices = blocks[-1]
+            blocks[-1] = (block_start, max(block_end, end), indices + [i])
+        else:
+            blocks.append((start, end, [i]))
+    results = [b""] * len(bounds)
+    for block_start, block_end, indices in blocks:
+        if len(indices) == 1:
+            results[indices[0]] = _pread(fd, block_end - block_start, block_start)
+            continue
+        block = memoryview(_pread(fd, block_end - block_start, block_start))
+        for i in indices:
+            start, end = bounds[i]
+            results[i] = bytes(block[start - block_start : end - block_start])
+    return results
+
+
+def _pread(fd: int, size: int, offset: int) -> bytes:
+    """Reads up to `size` bytes from `offset`, retrying short reads until EOF"""
+    if not size:
+        return b""
+    if hasattr(os, "pread"):
+        data = os.pread(fd, size, offset)
+        if len(data) == size or not data:
+            return data
+        chunks = [data]
+        read = len(data)
+        while read < size:
+            chunk = os.pread(fd, size - read, offset + read)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            read += len(chunk)
+        return b"".join(chunks)
+    # e.g. on Windows
+    os.lseek(fd, offset, os.SEEK_SET)
+    chunks = []
+    read = 0
+    while read < size:
+        chunk = os.read(fd, size - read)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        read += len(chunk)
+    return b"".join(chunks)
+
+
 class BinaryIOWindow(ty.BinaryIO):
     """Presents a window onto an underlying BinaryIO object in a duck-typable
     subclass, so functions that take a stream object can be presented a partial view
@@ -23,15 +116,24 @@ class BinaryIOWindow(ty.BinaryIO):
     wrapped_io: ty.BinaryIO
     start: int
     end: int
+    _mapping: ty.Optional[mmap.mmap]
+
+    # Size (in bytes) above which the contents of non-seekable streams are spooled to
+    # a temporary file on disk instead of being held in memory
+    SPOOL_MAX_SIZE = 16 * 1024**2
 
     def __init__(
         self, binary_io: ty.BinaryIO, start: int, end: ty.Optional[int] = None
     ):
         if binary_io.seekable() is False:
-            binary_io = io.BytesIO(binary_io.read())
+            binary_io = self._spool(binary_io)
         self.wrapped_io = binary_io
+        self._mapping = None
         self.wrapped_io.seek(0, io.SEEK_END)
-        file_size = self.wrapped_io.tell()
+        self._set_bounds(self.wrapped_io.tell(), start, end)
+        self.wrapped_io.seek(self.start)
+
+    def _set_bounds(self, file_size: int, start: int, end: ty.Optional[int]) -> None:
         if end is None:
             end = file_size
         if start >= 0:
@@ -56,7 +158,15 @@ class BinaryIOWindow(ty.BinaryIO):
                 f"size {file_size}"
             )
         self.size = self.end - self.start
-        self.wrapped_io.seek(self.start)
+
+    @classmethod
+    def _spool(cls, binary_io: ty.BinaryIO) -> ty.BinaryIO:
+        """Copies a non-seekable stream into a seekable temporary file, which is only
+        written to disk if it exceeds SPOOL_MAX_SIZE"""
+        spooled = tempfile.SpooledTemporaryFile(max_size=cls.SPOOL_MAX_SIZE)
+        shutil.copyfileobj(binary_io, spooled)
+        spooled.seek(0)
+        return spooled  # type: ignore[return-value]
 
     def read(self, size: ty.Optional[int] = -1) -> bytes:
         current_pos = self.tell()
@@ -66,6 +176,92 @@ class BinaryIOWindow(ty.BinaryIO):
             size = self.size - current_pos
         return self.wrapped_io.read(size)
 
+    def readinto(self, buffer: ty.Any) -> int:
+        """Reads bytes into a pre-allocated, writable, bytes-like object without
+        intermediate copies (where supported by the wrapped stream)
+
+        Parameters
+        ----------
+        buffer : bytearray or memoryview or similar
+            the buffer to read into
+
+        Returns
+        -------
+        int
+            the number of bytes read, 0 at the end of the window
+        """
+        return self._readinto(buffer, "readinto")
+
+    def readinto1(self, buffer: ty.Any) -> int:
+        """Reads bytes into a pre-allocated, writable, bytes-like object using at most
+        one call to the underlying raw stream's read method
+
+        Parameters
+        ----------
+        buffer : bytearray or memoryview or similar
+            the buffer to read into
+
+        Returns
+        -------
+        int
+            the number of bytes read, 0 at the end of the window
+        """
+        return self._readinto(buffer, "readinto1")
+
+    def _readinto(self, buffer: ty.Any, method_name: str) -> int:
+        view = memoryview(buffer).cast("B")
+        size = min(len(view), self.size - self.tell())
+        if size <= 0:
+            return 0
+        view = view[:size]
+        readinto = getattr(self.wrapped_io, method_name, None) or getattr(
+            self.wrapped_io, "readinto", None
+        )
+        if readinto is not None:
+            return readinto(view)  # type: ignore[no-any-return]
+        data = self.wrapped_io.read(size)
+        view[: len(data)] = data
+        return len(data)
+
+    def getbuffer(self) -> memoryview:
+        """Returns a read-only view of the contents of the window without copying them.
+        Supported when the wrapped stream is an in-memory BytesIO or a file on disk (in
+        which case the file is memory-mapped once and unmapped when the window is
+        closed)
+
+        Returns
+        -------
+        memoryview
+            a read-only view of the bytes in the window
+
+        Raises
+        ------
+        io.UnsupportedOperation
+            if the wrapped stream is neither in-memory or backed by a file
+        """
+        if isinstance(self.wrapped_io, io.BytesIO):
+            return self.wrapped_io.getbuffer()[self.start : self.end].toreadonly()
+        try:
+            fileno = self.wrapped_io.fileno()
+        except (AttributeError, OSError):
+            raise io.UnsupportedOperation(
+                f"Cannot get a buffer of {self.wrapped_io} as it is neither an "
+                "in-memory stream or backed by a file"
+            )
+        if not self.size:
+            return memoryview(b"")
+        if self._mapping is None:
+            self._mapping = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+        return memoryview(self._mapping)[self.start : self.end]
+
+    def _close_mapping(self) -> None:
+        if self._mapping is not None:
+            try:
+                self._mapping.close()
+            except BufferError:  # buffers returned by getbuffer() are still in use
+                pass
+            self._mapping = None
+
     def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
         if whence == io.SEEK_SET:
             ref = self.start
@@ -102,6 +298,7 @@ class BinaryIOWindow(ty.BinaryIO):
         return self.wrapped_io.name
 
     def close(self) -> None:
+        self._close_mapping()
         self.wrapped_io.close()
 
     @property
@@ -140,7 +337,8 @@ class BinaryIOWindow(ty.BinaryIO):
         return lines
 
     def seekable(self) -> bool:
-        assert self.wrapped_io.seekable()
+        # Spooled temporary files only implement seekable() in Python >= 3.11
+        assert getattr(self.wrapped_io, "seekable", lambda: True)()
         return True
 
     def truncate(self, size: ty.Optional[int] = None) -> int:
@@ -165,4 +363,107 @@ class BinaryIOWindow(ty.BinaryIO):
         value: ty.Optional[BaseException],
         traceback: ty.Optional[TracebackType],
     ) -> None:
+        self._close_mapping()
         return self.wrapped_io.__exit__(type, value, traceback)
+
+
+class MappedBinaryIOWindow(BinaryIOWindow):
+    """A window onto a file that is memory-mapped instead of being read through the
+    wrapped stream, so reads from the window are served directly from the mapping and
+    `getbuffer` returns a view onto it without copying.
+
+    Parameters
+    ----------
+    binary_io: ty.BinaryIO
+        a stream open on a file on disk (i.e. that has a file descriptor)
+    start: int
+        start of the window, if negative then interpreted as being from the end of the
+        file
+    end: int, optional
+        end of the window, if negative then interpreted as being from the end of the
+        file, if None then the end of the file, by default None
+    """
+
+    def __init__(
+        self, binary_io: ty.BinaryIO, start: int, end: ty.Optional[int] = None
+    ):
+        self.wrapped_io = binary_io
+        self._mmap: ty.Optional[mmap.mmap]
+        try:
+            self._mmap = mmap.mmap(binary_io.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty files can't be mapped
+            self._mmap = None
+            self._view = memoryview(b"")
+        else:
+            self._view = memoryview(self._mmap)
+        self._set_bounds(len(self._view), start, end)
+        self._view = self._view[self.start : self.end]
+        self._pos = 0
+
+    def read(self, size: ty.Optional[int] = -1) -> bytes:
+        if size is None or size < 0:
+            end = self.size
+        else:
+            end = min(self._pos + size, self.size)
+        if self._pos >= end:
+            return b""
+        data = self._view[self._pos : end].tobytes()
+        self._pos = end
+        return data
+
+    def _readinto(self, buffer: ty.Any, method_name: str) -> int:
+        view = memoryview(buffer).cast("B")
+        size = max(min(len(view), self.size - self._pos), 0)
+        view[:size] = self._view[self._pos : self._pos + size]
+        self._pos += size
+        return size
+
+    def readline(self, limit: int = -1) -> bytes:
+        if self._pos >= self.size:
+            return b""
+        end = self.size if limit is None or limit < 0 else self._pos + limit
+        if self._mmap is not None:
+            newline = self._mmap.find(
+                b"\n", self.start + self._pos, self.start + min(end, self.size)
+            )
+            if newline >= 0:
+                end = newline - self.start + 1
+        return self.read(end - self._pos)
+
+    def getbuffer(self) -> memoryview:
+        return self._view.toreadonly()
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            ref = 0
+        elif whence == io.SEEK_CUR:
+            ref = self._pos
+        elif whence == io.SEEK_END:
+            ref = self.size
+        else:
+            raise ValueError(
+                f"Invalid value for 'whence' {whence}, should be 0, 1, or 2 "
+                "(io.SEEK_SET, io.SEEK_CUR, io.SEEK_END)"
+            )
+        self._pos = max(ref + offset, 0)
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def close(self) -> None:
+        self._view.release()
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:  # buffers returned by getbuffer() are still in use
+                pass
+        self.wrapped_io.close()
+
+    def __exit__(
+        self,
+        type: ty.Optional[ty.Type[BaseException]],
+        value: ty.Optional[BaseException],
+        traceback: ty.Optional[TracebackType],
+    ) -> None:
+        self.close()
@@ -7,7 +7,7 @@ import fileformats.core
 from .utils import get_optional_type
 from .decorators import validated_property, classproperty
 from .identification import to_mime_format_name
-from .converter_helpers import SubtypeVar, Converter
+from .converter_helpers import SubtypeVar, Converter, register_converter_target
 from .classifier import Classifier
 from .exceptions import (
     FormatMismatchError,
@@ -675,6 +675,7 @@ class WithClassifiers:
             converters_dict = cls.unclassified.get_converters_dict()  # type: ignore[attr-defined]
             converter.classifiers = cls.classifiers
             converters_dict[source_format] = converter
+            register_converter_target(cls.unclassified)  # type: ignore[attr-defined]
         else:
             super().register_converter(source_format, converter)  # type: ignore[misc]
 
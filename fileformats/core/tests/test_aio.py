@@ -0,0 +1,52 @@
+import asyncio
+from pathlib import Path
+import pytest
+from fileformats.core import aio
+from fileformats.generic import BinaryFile
+from fileformats.testing import Magic
+
+
+def test_async_hash_and_copy(work_dir: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(aio, "HASH_CHUNKS_PER_STEP", 2)
+    fspath = work_dir / "file.bin"
+    fspath.write_bytes(b"x" * 100_000)
+    binary = BinaryFile(fspath)
+
+    async def run():
+        return await asyncio.gather(
+            binary.ahash(chunk_len=1000),
+            binary.aread_contents(3, offset=-3),
+            binary.acopy(work_dir / "dest", make_dirs=True),
+        )
+
+    hsh, contents, copied = asyncio.run(run())
+    assert hsh == binary.hash(chunk_len=1000)
+    assert contents == b"xxx"
+    assert copied.fspath == work_dir / "dest" / "file.bin"
+    assert copied.hash() == binary.hash()
+
+
+def test_async_from_paths(work_dir: Path):
+    magic_path = work_dir / "file.magic"
+    magic_path.write_bytes(b"MAGIC contents")
+    other_path = work_dir / "other.magic"
+    other_path.write_bytes(b"NOT MAGIC")
+    filesets, remaining = asyncio.run(Magic.afrom_paths([magic_path, other_path]))
+    assert filesets == {Magic(magic_path)}
+    assert remaining == {other_path}
+
+
+def test_async_hash_cancellation(work_dir: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(aio, "HASH_CHUNKS_PER_STEP", 1)
+    fspath = work_dir / "file.bin"
+    fspath.write_bytes(b"x" * 1_000_000)
+    binary = BinaryFile(fspath)
+
+    async def run():
+        task = asyncio.ensure_future(binary.ahash(chunk_len=1))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
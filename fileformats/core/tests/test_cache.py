@@ -0,0 +1,328 @@
+import os
+import stat
+import time
+import typing as ty
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import pytest
+from fileformats.core import (
+    FileSet,
+    extra_implementation,
+    cache_stats,
+    reset_cache_stats,
+    validated_property,
+)
+from fileformats.core.exceptions import FormatMismatchError
+from fileformats.core.cache import (
+    SharedCache,
+    shared_cache,
+    estimate_size,
+    set_persistent_metadata_cache,
+    instance_cache_budget,
+    WeakValue,
+    validation_cache,
+)
+from fileformats.generic import BinaryFile
+
+
+class CountedMetadataFile(BinaryFile):
+    ext = ".cnt"
+
+    num_reads = 0
+
+
+@extra_implementation(FileSet.read_metadata)
+def counted_read_metadata(
+    cnt: CountedMetadataFile, **kwargs: ty.Any
+) -> ty.Mapping[str, ty.Any]:
+    type(cnt).num_reads += 1
+    return {"contents": cnt.read_contents(), **kwargs}
+
+
+@pytest.fixture
+def counted_fspath(tmp_path: Path) -> Path:
+    fspath = tmp_path / "file.cnt"
+    fspath.write_bytes(b"counted")
+    # Backdate the modification time so it is outside the mtime resolution window
+    mtime = time.time() - 10
+    os.utime(fspath, (mtime, mtime))
+    CountedMetadataFile.num_reads = 0
+    shared_cache.clear()
+    return fspath
+
+
+def test_shared_cache_lru_eviction():
+    cache = SharedCache(max_size=estimate_size(("a", b"a" * 100)) * 2)
+    cache.put("a", b"a" * 100)
+    cache.put("b", b"b" * 100)
+    assert cache["a"] == b"a" * 100  # "a" is now the most recently used
+    cache.put("c", b"c" * 100)
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert not cache.put("d", b"d" * 1000)  # larger than the budget
+    assert "d" not in cache
+    cache.max_size = 0
+    assert len(cache) == 0
+    assert cache.size == 0
+
+
+def test_shared_cache_counts_keys():
+    cache = SharedCache(max_size=10000)
+    # e.g. memoised validations, where the paths in the keys outweigh the values
+    key = (FileSet, ("/" + "x" * 1000,), 123456789)
+    cache.put(key, None)
+    assert cache.size == estimate_size((key, None))
+    assert cache.size > 1000
+    assert estimate_size(FileSet) == 0  # classes are shared so aren't counted
+
+
+def test_metadata_shared_between_instances(counted_fspath: Path):
+    assert CountedMetadataFile(counted_fspath).metadata["contents"] == b"counted"
+    assert CountedMetadataFile(counted_fspath).metadata["contents"] == b"counted"
+    assert CountedMetadataFile.num_reads == 1
+    # Modifications by one caller don't leak to other instances
+    modified = CountedMetadataFile(counted_fspath)
+    modified.metadata["contents"] = b"modified in place"
+    assert CountedMetadataFile(counted_fspath).metadata["contents"] == b"counted"
+    # but the instance's own copy isn't copied again on each access
+    assert modified.metadata is modified.metadata
+    assert modified.metadata["contents"] == b"modified in place"
+    assert CountedMetadataFile.num_reads == 1
+    # Different load kwargs shouldn't be served from the same cache entry
+    assert CountedMetadataFile(counted_fspath, extra=1).metadata["extra"] == 1
+    assert CountedMetadataFile.num_reads == 2
+    # Modifying the file should invalidate the shared cache
+    counted_fspath.write_bytes(b"modified")
+    mtime = time.time() - 5
+    os.utime(counted_fspath, (mtime, mtime))
+    assert CountedMetadataFile(counted_fspath).metadata["contents"] == b"modified"
+    assert CountedMetadataFile.num_reads == 3
+
+
+def test_explicit_metadata_not_shared(counted_fspath: Path):
+    explicit = CountedMetadataFile(counted_fspath, metadata={"contents": b"explicit"})
+    assert explicit.metadata["contents"] == b"explicit"
+    assert CountedMetadataFile(counted_fspath).metadata["contents"] == b"counted"
+    assert CountedMetadataFile.num_reads == 1
+
+
+@pytest.fixture
+def persistent_cache(tmp_path: Path):
+    cache = set_persistent_metadata_cache(tmp_path / "metadata-cache")
+    yield cache
+    set_persistent_metadata_cache(None)
+
+
+def test_persistent_metadata_cache(counted_fspath: Path, persistent_cache):
+    assert CountedMetadataFile(counted_fspath).metadata["contents"] == b"counted"
+    assert CountedMetadataFile.num_reads == 1
+    # Simulate a separate process by clearing the in-memory cache
+    shared_cache.clear()
+    assert CountedMetadataFile(counted_fspath).metadata["contents"] == b"counted"
+    assert CountedMetadataFile.num_reads == 1
+    # Entries are keyed by the mtimes of the files
+    counted_fspath.write_bytes(b"modified")
+    mtime = time.time() - 5
+    os.utime(counted_fspath, (mtime, mtime))
+    assert CountedMetadataFile(counted_fspath).metadata["contents"] == b"modified"
+    assert CountedMetadataFile.num_reads == 2
+    persistent_cache.clear()
+    shared_cache.clear()
+    assert CountedMetadataFile(counted_fspath).metadata["contents"] == b"modified"
+    assert CountedMetadataFile.num_reads == 3
+
+
+def test_persistent_metadata_cache_untrusted(counted_fspath: Path, persistent_cache):
+    assert CountedMetadataFile(counted_fspath).metadata["contents"] == b"counted"
+    (entry_path,) = persistent_cache.cache_dir.glob("*/*.pkl")
+    # Only accessible by the current user
+    assert stat.S_IMODE(persistent_cache.cache_dir.stat().st_mode) == 0o700
+    assert stat.S_IMODE(entry_path.parent.stat().st_mode) == 0o700
+    # Entries writable by other users aren't unpickled
+    entry_path.chmod(0o666)
+    shared_cache.clear()
+    assert CountedMetadataFile(counted_fspath).metadata["contents"] == b"counted"
+    assert CountedMetadataFile.num_reads == 2
+    if os.geteuid() == 0:
+        # Nor are entries owned by other users
+        entry_path.chmod(0o600)
+        os.chown(entry_path, 12345, -1)
+        shared_cache.clear()
+        assert CountedMetadataFile(counted_fspath).metadata["contents"] == b"counted"
+        assert CountedMetadataFile.num_reads == 3
+
+
+@pytest.fixture
+def small_instance_cache_budget():
+    orig_max_size = instance_cache_budget.max_size
+    instance_cache_budget.max_size = estimate_size(b"x" * 1000) + 100
+    yield instance_cache_budget
+    instance_cache_budget.max_size = orig_max_size
+    instance_cache_budget.weak_values = False
+
+
+def test_instance_cache_budget_eviction(tmp_path: Path, small_instance_cache_budget):
+    files = []
+    for i in range(3):
+        fspath = tmp_path / f"{i}.cnt"
+        fspath.write_bytes(str(i).encode() * 1000)
+        mtime = time.time() - 10
+        os.utime(fspath, (mtime, mtime))
+        files.append(CountedMetadataFile(fspath))
+    for f in files:
+        assert f.raw_contents == f.fspath.read_bytes()
+    # Only the most recently accessed value fits within the budget
+    assert [("_raw_contents_mtime_cache" in f.__dict__) for f in files] == [
+        False,
+        False,
+        True,
+    ]
+    assert small_instance_cache_budget.size <= small_instance_cache_budget.max_size
+    # Evicted values are transparently reloaded
+    assert files[0].raw_contents == b"0" * 1000
+    assert "_raw_contents_mtime_cache" in files[0].__dict__
+    assert "_raw_contents_mtime_cache" not in files[2].__dict__
+    # Entries are dropped when the instances they are cached on are deleted
+    del files
+    assert small_instance_cache_budget.size == 0
+
+
+@extra_implementation(FileSet.load)
+def counted_load(cnt: CountedMetadataFile, **kwargs: ty.Any) -> bytes:
+    return cnt.read_contents()
+
+
+def test_instance_cache_budget_evicts_shared(
+    tmp_path: Path, small_instance_cache_budget
+):
+    shared_cache.clear()
+    files = []
+    for i in range(2):
+        fspath = tmp_path / f"{i}.cnt"
+        fspath.write_bytes(str(i).encode() * 1000)
+        mtime = time.time() - 10
+        os.utime(fspath, (mtime, mtime))
+        files.append(CountedMetadataFile(fspath))
+    for f in files:
+        assert f.contents == f.fspath.read_bytes()
+    assert len(shared_cache) == 1
+    # Evicted values are dropped from the shared cache too, so the memory is freed
+    assert "_contents_mtime_cache" not in files[0].__dict__
+    assert CountedMetadataFile(files[0].fspath).contents == b"0" * 1000
+    assert "_contents_mtime_cache" not in files[1].__dict__
+    assert len(shared_cache) == 1
+
+
+def test_instance_cache_budget_weak_values(small_instance_cache_budget):
+    small_instance_cache_budget.weak_values = True
+    value = [1, 2, 3]  # lists don't support weak references
+    assert small_instance_cache_budget.wrap(value) is value
+    weakrefable = {1, 2, 3}
+    weak_value = small_instance_cache_budget.wrap(weakrefable)
+    assert isinstance(weak_value, WeakValue)
+    assert weak_value() is weakrefable
+    del weakrefable
+    assert weak_value() is None
+
+
+def test_cache_stats(counted_fspath: Path):
+    reset_cache_stats()
+    counted = CountedMetadataFile(counted_fspath)
+    counted.metadata
+    counted.metadata
+    CountedMetadataFile(counted_fspath).metadata
+    counted_fspath.write_bytes(b"modified")
+    mtime = time.time() - 5
+    os.utime(counted_fspath, (mtime, mtime))
+    counted.metadata
+    # Modified within the mtime resolution, so can't be trusted to stay valid
+    counted_fspath.write_bytes(b"modified again")
+    counted.metadata
+    counted.metadata
+    stats = cache_stats(reset=True)[(CountedMetadataFile, "metadata")]
+    assert stats.hits == 1
+    assert stats.misses == 2
+    assert stats.shared_hits == 1
+    assert stats.invalidations == 2
+    assert stats.resolution_misses == 1
+    assert stats.recomputes == 4
+    assert stats.recompute_time > 0
+    assert cache_stats().by_property().get("metadata") is None
+
+
+class SlowMetadataFile(BinaryFile):
+    ext = ".slw"
+
+    num_reads = 0
+    delay = 0.2
+
+
+@extra_implementation(FileSet.read_metadata)
+def slow_read_metadata(
+    slw: SlowMetadataFile, **kwargs: ty.Any
+) -> ty.Mapping[str, ty.Any]:
+    type(slw).num_reads += 1
+    time.sleep(type(slw).delay)
+    return {"name": slw.fspath.name}
+
+
+def test_concurrent_cache_misses(tmp_path: Path):
+    SlowMetadataFile.num_reads = 0
+    fspaths = []
+    for i in range(4):
+        fspath = tmp_path / f"{i}.slw"
+        fspath.write_bytes(b"slow")
+        mtime = time.time() - 10
+        os.utime(fspath, (mtime, mtime))
+        fspaths.append(fspath)
+    shared_cache.clear()
+    # Misses on the same files are only computed once
+    same = [SlowMetadataFile(fspaths[0]) for _ in range(4)]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda f: f.metadata["name"], same))
+    assert results == ["0.slw"] * 4
+    assert SlowMetadataFile.num_reads == 1
+    # Misses on different files don't block each other
+    different = [SlowMetadataFile(p) for p in fspaths[1:]]
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        results = list(executor.map(lambda f: f.metadata["name"], different))
+    assert results == ["1.slw", "2.slw", "3.slw"]
+    assert SlowMetadataFile.num_reads == 4
+    assert time.monotonic() - start < SlowMetadataFile.delay * 3
+
+
+class CountedValidationFile(BinaryFile):
+    ext = ".cvl"
+
+    num_checks = 0
+
+    @validated_property
+    def _check_contents(self) -> None:
+        type(self).num_checks += 1
+        if self.read_contents(4) != b"good":
+            raise FormatMismatchError(f"{self} doesn't start with 'good'")
+
+
+def test_validation_memo(tmp_path: Path):
+    validation_cache.clear()
+    CountedValidationFile.num_checks = 0
+    good = tmp_path / "good.cvl"
+    good.write_bytes(b"good contents")
+    bad = tmp_path / "bad.cvl"
+    bad.write_bytes(b"bad contents")
+    mtime = time.time() - 10
+    for fspath in (good, bad):
+        os.utime(fspath, (mtime, mtime))
+    for _ in range(3):
+        assert CountedValidationFile.matches(good)
+        assert not CountedValidationFile.matches(bad)
+    assert CountedValidationFile.num_checks == 2
+    with pytest.raises(FormatMismatchError, match="doesn't start with 'good'"):
+        CountedValidationFile(bad)
+    # Modifying the file invalidates the memo
+    bad.write_bytes(b"good now")
+    os.utime(bad, (mtime + 1, mtime + 1))
+    assert CountedValidationFile.matches(bad)
+    assert CountedValidationFile.num_checks == 3
@@ -0,0 +1,100 @@
+import os
+import pickle
+import tempfile
+import typing as ty
+from pathlib import Path
+import attrs
+import pytest
+from fileformats.core import FileSet, converter_helpers
+from fileformats.testing import Foo, Bar
+from conftest import write_test_file
+
+
+def foo_bar(in_file: Foo, suffix: str = "") -> Path:
+    # Written relative to the working directory, like many converters
+    return write_test_file(
+        Path(in_file.fspath.with_suffix(".bar").name),
+        in_file.raw_contents + suffix + f":{os.getpid()}",
+    )
+
+
+@attrs.define
+class FooBar:
+    """Mimics the task classes created by pydra.design.python.define, which replace
+    the functions they wrap in their modules"""
+
+    @attrs.define
+    class Outputs:
+        out_file: Bar
+
+    function: ty.Callable[..., ty.Any] = foo_bar
+    in_file: ty.Optional[Foo] = None
+    suffix: str = ""
+
+
+foo_bar = FooBar  # type: ignore[assignment,misc]  # noqa: F811
+
+
+@pytest.fixture
+def foo_bar_route(tmp_path: Path, monkeypatch):
+    converter = converter_helpers.Converter(FooBar())  # type: ignore[arg-type]
+
+    def get_converter_route(
+        cls: ty.Type[FileSet], source_format: type, max_hops: ty.Optional[int] = None
+    ) -> converter_helpers.ConverterRoute:
+        return [(Bar, converter)]
+
+    monkeypatch.setattr(Bar, "get_converter_route", classmethod(get_converter_route))
+    # Inherited by the worker processes, which are forked
+    (tmp_path / "tmp").mkdir()
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path / "tmp"))
+    (tmp_path / "cwd").mkdir()
+    monkeypatch.chdir(tmp_path / "cwd")
+
+
+def test_convert_many_processes(work_dir, foo_bar_route):
+    foos = [Foo(write_test_file(work_dir / f"{i}.foo", str(i))) for i in range(8)]
+    bars = Bar.convert_many(foos, max_workers=2, suffix="x")
+    assert [type(b) for b in bars] == [Bar] * 8
+    contents = [b.raw_contents.split(":") for b in bars]
+    assert [c[0] for c in contents] == [f"{i}x" for i in range(8)]
+    # Converted in worker processes
+    assert all(int(c[1]) != os.getpid() for c in contents)
+
+
+def test_convert_many_same_names(tmp_path: Path, foo_bar_route):
+    foos = []
+    for i in range(4):
+        (tmp_path / str(i)).mkdir()
+        foos.append(Foo(write_test_file(tmp_path / str(i) / "x.foo", str(i))))
+    bars = Bar.convert_many(foos, max_workers=2)
+    # Each conversion is run in its own working directory, so outputs with the same
+    # relative paths don't overwrite each other
+    assert len(set(b.fspath for b in bars)) == 4
+    assert [b.raw_contents.split(":")[0] for b in bars] == ["0", "1", "2", "3"]
+    assert all(b.fspath.is_relative_to(tmp_path / "tmp") for b in bars)
+    assert not list((tmp_path / "cwd").iterdir())
+
+
+def test_convert_many_in_process(work_dir, foo_bar_route, monkeypatch):
+    run = []
+
+    def run_converter(cls, converter, fileset, **kwargs):
+        run.append(fileset)
+        return cls(write_test_file(work_dir / f"{fileset.stem}.bar", "converted"))
+
+    monkeypatch.setattr(Bar, "_run_converter", classmethod(run_converter))
+
+    def unpicklable(obj, *args, **kwargs):
+        raise pickle.PicklingError("unpicklable")
+
+    # Fall back to running the conversions across threads
+    monkeypatch.setattr(pickle, "dumps", unpicklable)
+    foos = [Foo(write_test_file(work_dir / f"{i}.foo", str(i))) for i in range(4)]
+    # The working directory can't be isolated within threads (or the calling process)
+    # so the converters are run as Pydra tasks instead of calling the functions directly
+    for max_workers in (None, 2):
+        run.clear()
+        bars = Bar.convert_many(foos, max_workers=max_workers, suffix="x")
+        assert sorted(f.stem for f in run) == ["0", "1", "2", "3"]
+        assert [b.stem for b in bars] == ["0", "1", "2", "3"]
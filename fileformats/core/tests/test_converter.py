@@ -5,8 +5,9 @@ import pytest
 from pydra.design import python, shell
 from fileformats.generic import File
 from fileformats.testing import Foo, Bar, Baz, Qux
-from fileformats.core import converter
-from fileformats.core.exceptions import FormatConversionError
+from fileformats.text import Plain
+from fileformats.core import converter, converter_helpers
+from fileformats.core.exceptions import FormatConversionError, AmbiguousConverterError
 from conftest import write_test_file
 
 try:
@@ -40,6 +41,25 @@ def baz_bar_converter():
     return baz_bar_converter_
 
 
+class Corge(Plain):
+
+    ext = ".corge"
+
+
+@pytest.fixture(scope="session")
+def bar_corge_converter():
+    work_dir = Path(tempfile.mkdtemp())
+
+    @converter
+    @python.define(outputs={"out_file": Corge})  # type: ignore[misc]
+    def bar_corge_converter_(in_file: Bar):
+        return Corge(
+            write_test_file(work_dir / f"{in_file.stem}.corge", in_file.raw_contents)
+        )
+
+    return bar_corge_converter_
+
+
 @pytest.fixture(scope="session")
 def FooQuxConverter():
     @converter(source_format=Foo, target_format=Qux)
@@ -120,3 +140,107 @@ def test_convert_mapped_conversion(baz_bar_converter, work_dir):
     bar = Bar.convert(baz)
     assert type(bar) is Bar
     assert bar.contents == baz.contents
+
+
+@pytest.mark.skipif(pydra is None, reason="Pydra could not be imported")
+def test_convert_chained(foo_bar_converter, bar_corge_converter, work_dir):
+
+    fspath = work_dir / "test.foo"
+    write_test_file(fspath)
+    foo = Foo(fspath)
+    # There is no direct converter between Foo and Corge
+    with pytest.raises(FormatConversionError):
+        Corge.get_converter(Foo)
+    assert [f for f, _ in Corge.get_converter_route(Foo)] == [Bar, Corge]
+    with pytest.raises(FormatConversionError):
+        Corge.get_converter_route(Foo, max_hops=1)
+    corge = Corge.convert(foo)
+    assert type(corge) is Corge
+    assert corge.contents == foo.contents
+
+
+@pytest.mark.skipif(pydra is None, reason="Pydra could not be imported")
+def test_convert_ambiguous(foo_bar_converter, bar_corge_converter, monkeypatch):
+
+    get_converter_defs = Corge.get_converter_defs.__func__
+
+    def ambiguous_get_converter_defs(cls, source_format):
+        if source_format is Foo:
+            return [Bar.get_converter(Foo), Corge.get_converter(Bar)]
+        return get_converter_defs(cls, source_format)
+
+    monkeypatch.setattr(
+        Corge, "get_converter_defs", classmethod(ambiguous_get_converter_defs)
+    )
+    converter_helpers.converters_changed()
+    try:
+        # Ambiguous direct converters aren't bypassed by converting via Bar
+        with pytest.raises(AmbiguousConverterError):
+            Corge.get_converter_route(Foo)
+        with pytest.raises(AmbiguousConverterError):
+            converter_helpers.find_converter_route(Foo, Corge)
+    finally:
+        converter_helpers.converters_changed()
+
+
+@pytest.mark.skipif(pydra is None, reason="Pydra could not be imported")
+def test_get_converter_cached(foo_bar_converter, monkeypatch):
+
+    num_searches = []
+    get_converter_defs = Baz.get_converter_defs.__func__
+
+    def counted_get_converter_defs(cls, source_format):
+        num_searches.append(source_format)
+        return get_converter_defs(cls, source_format)
+
+    monkeypatch.setattr(
+        Baz, "get_converter_defs", classmethod(counted_get_converter_defs)
+    )
+    converter_helpers.converters_changed()
+    # Both successful and failed resolutions are cached
+    for _ in range(3):
+        assert Bar.get_converter(Foo) is Bar.get_converter(Foo)
+        with pytest.raises(FormatConversionError):
+            Baz.get_converter(Foo)
+    assert num_searches == [Foo]
+    # Until another converter is registered
+    converter_helpers.converters_changed()
+    with pytest.raises(FormatConversionError):
+        Baz.get_converter(Foo)
+    assert num_searches == [Foo, Foo]
+
+
+@pytest.mark.skipif(pydra is None, reason="Pydra could not be imported")
+def test_convert_many(bar_corge_converter, work_dir):
+
+    bars = [Bar(write_test_file(work_dir / f"{i}.bar", str(i))) for i in range(10)]
+    corges = Corge.convert_many(bars, max_workers=4)
+    assert [type(c) for c in corges] == [Corge] * 10
+    assert [c.contents for c in corges] == [b.contents for b in bars]
+    assert [c.stem for c in corges] == [b.stem for b in bars]
+
+
+def test_get_converter_failure_cached(monkeypatch):
+    def failing_resolve_converter(cls, source_format):
+        try:
+            raise KeyError(source_format)
+        except KeyError as e:
+            raise FormatConversionError(f"no converter from {source_format}") from e
+
+    monkeypatch.setattr(
+        Baz, "_resolve_converter", classmethod(failing_resolve_converter)
+    )
+    converter_helpers.converters_changed()
+    # The original error is re-raised, along with its cause and traceback
+    errors = []
+    traceback_lengths = []
+    for _ in range(3):
+        with pytest.raises(FormatConversionError) as exc_info:
+            Baz.get_converter(Foo)
+        errors.append(exc_info.value)
+        traceback_lengths.append(len(exc_info.traceback))
+        assert isinstance(exc_info.value.__cause__, KeyError)
+        assert exc_info.traceback[-1].name == "failing_resolve_converter"
+    assert all(e is errors[0] for e in errors)
+    assert len(set(traceback_lengths)) == 1
+    converter_helpers.converters_changed()
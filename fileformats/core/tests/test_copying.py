@@ -0,0 +1,396 @@
+import errno
+import os
+import time
+from pathlib import Path
+import pytest
+from fileformats.core import FileSet, copying
+from fileformats.core.exceptions import TransferVerificationError
+from fileformats.generic import Directory
+from fileformats.text import TextFile
+
+
+@pytest.fixture
+def sparse_file(tmp_path: Path) -> Path:
+    fspath = tmp_path / "sparse.bin"
+    with open(fspath, "wb") as f:
+        f.write(b"head")
+        f.seek(8 * 1024 * 1024)
+        f.write(b"middle")
+        f.truncate(16 * 1024 * 1024)  # ends in a hole
+    return fspath
+
+
+def test_copy_file_sparse(sparse_file: Path, tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(copying, "COPY_CHUNK_SIZE", 3)
+    dest = tmp_path / "dest.bin"
+    copying.copy_file(sparse_file, dest)
+    assert dest.stat().st_size == sparse_file.stat().st_size
+    assert dest.read_bytes() == sparse_file.read_bytes()
+    if sparse_file.stat().st_blocks * 512 < sparse_file.stat().st_size:
+        # Holes are preserved if the source file-system supports them
+        assert dest.stat().st_blocks * 512 < dest.stat().st_size
+
+
+def test_copy_file_fallback(sparse_file: Path, tmp_path: Path, monkeypatch):
+    def unsupported(*args):
+        raise OSError(errno.EXDEV, "Cross-device copy not supported")
+
+    monkeypatch.setattr(copying, "_KERNEL_COPY_METHODS", (unsupported, unsupported))
+    monkeypatch.setattr(copying, "BUFFERED_COPY_SIZE", 5)
+    dest = tmp_path / "dest.bin"
+    copying.copy_file(sparse_file, dest)
+    assert dest.read_bytes() == sparse_file.read_bytes()
+
+
+def test_copy_file_kernel_copy_returns_zero(
+    sparse_file: Path, tmp_path: Path, monkeypatch
+):
+    def copies_nothing(*args):
+        return 0
+
+    monkeypatch.setattr(copying, "_KERNEL_COPY_METHODS", (copies_nothing,))
+    dest = tmp_path / "dest.bin"
+    copying.copy_file(sparse_file, dest)
+    assert dest.read_bytes() == sparse_file.read_bytes()
+
+
+def test_copy_file_pseudo_file(tmp_path: Path, monkeypatch):
+    src = tmp_path / "pseudo"
+    src.write_bytes(b"x" * 1000)
+    fstat = os.fstat
+
+    def zero_size_fstat(fd):
+        stat = fstat(fd)
+        return os.stat_result((*stat[:6], 0, *stat[7:]))
+
+    reads = []
+    read = os.read
+
+    def counted_read(fd, count):
+        data = read(fd, count)
+        reads.append(len(data))
+        return data
+
+    monkeypatch.setattr(copying, "_KERNEL_COPY_METHODS", ())
+    monkeypatch.setattr(copying.os, "fstat", zero_size_fstat)
+    monkeypatch.setattr(copying.os, "read", counted_read)
+    dest = tmp_path / "dest"
+    copying.copy_file(src, dest)
+    monkeypatch.undo()
+    # The contents are read once (until EOF)
+    assert sum(reads) == 1000
+    assert dest.read_bytes() == b"x" * 1000
+
+
+def test_copy_dir(tmp_path: Path):
+    src = tmp_path / "src"
+    (src / "sub").mkdir(parents=True)
+    (src / "a.txt").write_text("a")
+    (src / "sub" / "b.txt").write_text("b")
+    os.utime(src / "a.txt", (1000000, 1000000))
+    copied = Directory(src).copy(tmp_path / "dest")
+    assert (copied.fspath / "a.txt").read_text() == "a"
+    assert (copied.fspath / "sub" / "b.txt").read_text() == "b"
+    assert (copied.fspath / "a.txt").stat().st_mtime == 1000000
+
+
+def test_copy_dir_parallel(tmp_path: Path):
+    src = tmp_path / "src"
+    for i in range(5):
+        (src / str(i)).mkdir(parents=True)
+        for j in range(20):
+            (src / str(i) / f"{j}.txt").write_text(f"{i}-{j}")
+    for mode in ("copy", "hardlink"):
+        copied = Directory(src).copy(tmp_path / mode, mode=mode, max_workers=4)
+        copied_paths = sorted(
+            p.relative_to(copied.fspath) for p in copied.fspath.rglob("*")
+        )
+        assert copied_paths == sorted(p.relative_to(src) for p in src.rglob("*"))
+        assert (copied.fspath / "3" / "7.txt").read_text() == "3-7"
+
+
+def test_hardlink_dir_symlinks(tmp_path: Path):
+    src = tmp_path / "src"
+    (src / "sub").mkdir(parents=True)
+    (src / "sub" / "a.txt").write_text("a")
+    (src / "sub" / "cycle").symlink_to(src, target_is_directory=True)
+    (src / "linked").symlink_to(src / "sub", target_is_directory=True)
+    linked = Directory(src).copy(tmp_path / "dest", mode="hardlink")
+    # Symlinks to directories aren't followed (so cyclic links don't recurse)
+    assert sorted(
+        str(p.relative_to(linked.fspath)) for p in linked.fspath.rglob("*")
+    ) == [
+        "sub",
+        "sub/a.txt",
+    ]
+    assert (linked.fspath / "sub" / "a.txt").stat().st_ino == (
+        src / "sub" / "a.txt"
+    ).stat().st_ino
+
+
+def test_transfer_errors_deterministic(tmp_path: Path):
+    transferred = []
+
+    def flaky(src: Path, dest: Path) -> None:
+        index = int(src.name)
+        # Later failures finish first
+        time.sleep(0.05 if index == 3 else 0.0)
+        if index in (3, 6, 8):
+            raise ValueError(f"failed {index}")
+        transferred.append(index)
+
+    pairs = [(tmp_path / str(i), tmp_path / f"dest{i}") for i in range(10)]
+    for _ in range(3):
+        with pytest.raises(ValueError, match="failed 3"):
+            copying.transfer(pairs, flaky, max_workers=4)
+        # Transfers before the first failure are always run
+        assert {0, 1, 2} <= set(transferred)
+        transferred.clear()
+
+
+def test_copy_move_many(tmp_path: Path):
+    src_dir = tmp_path / "src"
+    files = []
+    for i in range(10):
+        subdir = src_dir / str(i)
+        subdir.mkdir(parents=True)
+        (subdir / "file.txt").write_text(str(i))
+        files.append(TextFile(subdir / "file.txt"))
+    dest_dir = tmp_path / "dest"
+    dest_dir.mkdir()
+    (dest_dir / "file.txt").write_text("existing")
+    # Without avoiding clashes, the same-named files clash with each other
+    with pytest.raises(FileExistsError):
+        FileSet.copy_many(files[1:], tmp_path / "clash", make_dirs=True)
+    copied = FileSet.copy_many(files, dest_dir, avoid_clashes=True, max_workers=4)
+    assert [type(c) for c in copied] == [TextFile] * 10
+    assert [c.fspath.name for c in copied] == [f"file ({i + 1}).txt" for i in range(10)]
+    assert [c.fspath.read_text() for c in copied] == [str(i) for i in range(10)]
+    assert (dest_dir / "file.txt").read_text() == "existing"
+    moved_dir = tmp_path / "moved"
+    moved = FileSet.move_many(
+        copied, moved_dir, make_dirs=True, prefix="moved-", max_workers=4
+    )
+    assert moved == copied
+    assert [m.fspath.read_text() for m in moved] == [str(i) for i in range(10)]
+    assert sorted(p.name for p in dest_dir.iterdir()) == ["file.txt"]
+
+
+def test_copy_many_rejected_overwrite(tmp_path: Path):
+    files = []
+    for i in range(2):
+        subdir = tmp_path / "src" / str(i)
+        subdir.mkdir(parents=True)
+        (subdir / "x.txt").write_text(str(i))
+        files.append(TextFile(subdir / "x.txt"))
+    dest_dir = tmp_path / "dest"
+    dest_dir.mkdir()
+    (dest_dir / "x.txt").write_text("existing")
+    # Existing destinations survive a batch that is rejected
+    for transfer_many in (FileSet.copy_many, FileSet.move_many):
+        with pytest.raises(FileExistsError, match="clash"):
+            transfer_many(files, dest_dir, overwrite=True)
+        assert (dest_dir / "x.txt").read_text() == "existing"
+        # Missing destination directories aren't created either
+        with pytest.raises(FileExistsError, match="clash"):
+            transfer_many(files, tmp_path / "new" / "dest", make_dirs=True)
+        assert not (tmp_path / "new").exists()
+    copied = FileSet.copy_many(files[1:], dest_dir, overwrite=True)
+    assert copied[0].fspath.read_text() == "1"
+
+
+def test_destination_index(tmp_path: Path, monkeypatch):
+    src = tmp_path / "src" / "file.txt"
+    src.parent.mkdir()
+    src.write_text("src")
+    dest_dir = tmp_path / "dest"
+    dest_dir.mkdir()
+    (dest_dir / "file.txt").write_text("existing")
+    (dest_dir / "file (1).txt").write_text("existing")
+    index = copying.DestinationIndex()
+    assert dest_dir / "file.txt" in index
+    # After the initial listing, candidate names aren't checked on disk
+    checked = []
+    orig_exists = Path.exists
+
+    def exists(self: Path) -> bool:
+        checked.append(self)
+        return orig_exists(self)
+
+    monkeypatch.setattr(Path, "exists", exists)
+    copied = [TextFile(src).copy(dest_dir, avoid_clashes=index) for _ in range(5)]
+    monkeypatch.undo()
+    assert [c.fspath.name for c in copied] == [f"file ({i}).txt" for i in range(2, 7)]
+    # Only the new paths are checked (when the copied file-sets are validated)
+    assert [p for p in checked if p.parent == dest_dir] == [c.fspath for c in copied]
+    assert index.counter_hint(("{stem} ({counter})", dest_dir / "file.txt")) == 6
+    # Directories created to hold new paths are registered in their parents' listings
+    index.add(dest_dir / "sub" / "nested.txt")
+    assert dest_dir / "sub" in index
+    with pytest.raises(ValueError, match="mutually exclusive"):
+        TextFile(src).copy(dest_dir, avoid_clashes=index, overwrite=True)
+
+
+def test_sync(tmp_path: Path, monkeypatch):
+    src = tmp_path / "src"
+    (src / "sub").mkdir(parents=True)
+    for name in ("a.txt", "b.txt", "sub/c.txt"):
+        (src / name).write_text(name)
+    copied = []
+    orig_copy = copying.copy_with_metadata
+
+    def counted_copy(src_fpath, dest_fpath):
+        copied.append(Path(src_fpath).name)
+        orig_copy(src_fpath, dest_fpath)
+
+    monkeypatch.setattr(copying, "copy_with_metadata", counted_copy)
+    synced = Directory(src).sync(tmp_path / "dest", make_dirs=True)
+    assert sorted(copied) == ["a.txt", "b.txt", "c.txt"]
+    copied.clear()
+    # Only the modified file is transferred again
+    (src / "a.txt").write_text("modified")
+    (synced.fspath / "extra.txt").write_text("extra")
+    Directory(src).sync(tmp_path / "dest")
+    assert copied == ["a.txt"]
+    assert (synced.fspath / "a.txt").read_text() == "modified"
+    assert (synced.fspath / "extra.txt").exists()
+    copied.clear()
+    Directory(src).sync(tmp_path / "dest", delete_extra=True)
+    assert not copied
+    assert not (synced.fspath / "extra.txt").exists()
+    # Files with the same contents aren't transferred when comparing checksums
+    os.utime(src / "sub" / "c.txt", (1000000, 1000000))
+    Directory(src).sync(tmp_path / "dest", comparison="checksum")
+    assert not copied
+    Directory(src).sync(tmp_path / "dest")
+    assert copied == ["c.txt"]
+    assert (synced.fspath / "sub" / "c.txt").stat().st_mtime == 1000000
+
+
+@pytest.fixture
+def cross_device(monkeypatch):
+    def rename(src, dest):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    monkeypatch.setattr(copying.os, "rename", rename)
+    monkeypatch.setattr(copying, "MOVE_CHUNK_SIZE", 4)
+
+
+def test_move_cross_device(tmp_path: Path, cross_device):
+    src = tmp_path / "src"
+    (src / "sub").mkdir(parents=True)
+    (src / "a.txt").write_text("a" * 10)
+    (src / "sub" / "b.txt").write_text("b" * 6)
+    updates = []
+    metrics = []
+    copying.set_transfer_metrics_hook(metrics.append)
+    try:
+        moved = Directory(src).move(
+            tmp_path / "dest",
+            progress=lambda p: updates.append((p.bytes_done, p.files_done)),
+        )
+    finally:
+        copying.set_transfer_metrics_hook(None)
+    assert not src.exists()
+    assert (moved.fspath / "a.txt").read_text() == "a" * 10
+    assert (moved.fspath / "sub" / "b.txt").read_text() == "b" * 6
+    assert updates[-1] == (16, 2)
+    assert [u[0] for u in updates] == sorted(u[0] for u in updates)
+    assert sorted(m.num_bytes for m in metrics) == [6, 10]
+    assert all(m.verified and not m.resumed_bytes for m in metrics)
+
+
+def test_move_resume_and_verify(tmp_path: Path, cross_device, monkeypatch):
+    src = tmp_path / "src.txt"
+    src.write_text("0123456789")
+    dest = tmp_path / "dest.txt"
+    metrics = []
+    copying.set_transfer_metrics_hook(metrics.append)
+    try:
+        # Resumes from a partial file left by an interrupted move
+        partial = copying._partial_path(dest, src.stat())
+        partial.write_text("012345")
+        copying.move_file(src, dest)
+        assert dest.read_text() == "0123456789"
+        assert metrics[-1].resumed_bytes == 6
+        # Restarts if the partial file doesn't match the original
+        src.write_text("abcdefghij")
+        partial = copying._partial_path(dest, src.stat())
+        partial.write_text("XXXXX")
+        copying.move_file(src, dest)
+        assert dest.read_text() == "abcdefghij"
+        assert not partial.exists()
+        assert metrics[-1].resumed_bytes == 0
+    finally:
+        copying.set_transfer_metrics_hook(None)
+    # The original isn't deleted if the new file can't be verified
+    src.write_text("original")
+    orig_digest = copying.file_digest
+    monkeypatch.setattr(
+        copying,
+        "file_digest",
+        lambda p: "corrupt" if str(p).endswith(".partial") else orig_digest(p),
+    )
+    with pytest.raises(TransferVerificationError):
+        copying.move_file(src, tmp_path / "dest3.txt")
+    assert src.read_text() == "original"
+    assert not (tmp_path / "dest3.txt").exists()
+
+
+def test_move_stale_partial(tmp_path: Path, cross_device):
+    src = tmp_path / "src.txt"
+    dest = tmp_path / "dest.txt"
+    # Partial file left by an interrupted move of an older version of the file
+    src.write_text("old-version-data")
+    os.utime(src, ns=(1000000000, 1000000000))
+    stale = copying._partial_path(dest, src.stat())
+    stale.write_text("old-vers")
+    src.write_text("new-version-data")
+    os.utime(src, ns=(2000000000, 2000000000))
+    copying.move_file(src, dest, verify=False)
+    assert dest.read_text() == "new-version-data"
+    assert not stale.exists()
+    assert not src.exists()
+
+
+def test_move_cross_device_dir_symlink(tmp_path: Path, cross_device):
+    target = tmp_path / "target"
+    target.mkdir()
+    (target / "c.txt").write_text("c")
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "a.txt").write_text("a")
+    (src / "link").symlink_to(target)
+    moved = Directory(src).move(tmp_path / "dest")
+    assert not src.exists()
+    assert (moved.fspath / "link").is_symlink()
+    assert os.readlink(moved.fspath / "link") == str(target)
+    assert (moved.fspath / "a.txt").read_text() == "a"
+    assert (target / "c.txt").read_text() == "c"
+
+
+def test_move_cross_device_stale_partials(tmp_path: Path, cross_device, monkeypatch):
+    src = tmp_path / "src"
+    src.mkdir()
+    for i in range(20):
+        (src / f"{i}.txt").write_text(str(i) * 5)
+    dest = tmp_path / "dest"
+    dest.mkdir()
+    stale = dest / f"0.txt.{'0' * copying.PARTIAL_ID_LENGTH}{copying.PARTIAL_SUFFIX}"
+    stale.write_text("stale")
+    scanned = []
+    scandir = os.scandir
+
+    def counted_scandir(path):
+        if Path(path) == dest:
+            scanned.append(path)
+        return scandir(path)
+
+    monkeypatch.setattr(copying.os, "scandir", counted_scandir)
+    copying.move_path(src, dest)
+    # The destination directory is only scanned for stale partial files once
+    assert len(scanned) == 1
+    assert not stale.exists()
+    assert sorted(p.name for p in dest.iterdir()) == sorted(
+        f"{i}.txt" for i in range(20)
+    )
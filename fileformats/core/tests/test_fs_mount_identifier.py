@@ -2,7 +2,8 @@ import os.path
 import platform
 import pytest
 from fileformats.core.fs_mount_identifier import FsMountIdentifier
-from fileformats.generic import File
+from fileformats.generic import File, Directory
+from fileformats.core.exceptions import UnsatisfiableCopyModeError
 
 
 MOUNT_OUTPUTS = (
@@ -371,3 +372,58 @@ def test_generate_mount_table():
 )
 def test_symlink_supported():
     assert isinstance(FsMountIdentifier.symlinks_supported("/"), bool)
+
+
+def test_copy_reflink(tmp_path):
+
+    btrfs_mnt = tmp_path / "btrfs_mnt"
+    ext4_mnt = tmp_path / "ext4_mnt"
+
+    fake_mount_table = [
+        (str(btrfs_mnt), "btrfs"),
+        (str(ext4_mnt), "ext4"),
+    ]
+
+    btrfs_mnt.mkdir()
+    ext4_mnt.mkdir()
+    (btrfs_mnt / "src.txt").write_text("btrfs")
+    (ext4_mnt / "src.txt").write_text("ext4")
+    btrfs_file = File(btrfs_mnt / "src.txt")
+    ext4_file = File(ext4_mnt / "src.txt")
+
+    with FsMountIdentifier.patch_table(fake_mount_table):
+        assert FsMountIdentifier.reflinks_supported(btrfs_mnt)
+        assert not FsMountIdentifier.reflinks_supported(ext4_mnt)
+        # Reflinks are preferred over full copies (falling back to a full copy if the
+        # underlying file-system doesn't actually support them)
+        reflinked = btrfs_file.copy(
+            btrfs_mnt / "dest", mode=File.CopyMode.reflink_or_copy, make_dirs=True
+        )
+        assert reflinked.raw_contents == btrfs_file.raw_contents
+        assert os.stat(reflinked).st_ino != os.stat(btrfs_file).st_ino
+        # Reflinks aren't supported on ext4 or across mounts
+        with pytest.raises(UnsatisfiableCopyModeError, match="reflinks"):
+            ext4_file.copy(ext4_mnt / "dest", mode=File.CopyMode.reflink)
+        with pytest.raises(UnsatisfiableCopyModeError, match="reflinked"):
+            ext4_file.copy(btrfs_mnt / "dest2", mode=File.CopyMode.reflink)
+        copied = ext4_file.copy(
+            btrfs_mnt / "dest2", mode=File.CopyMode.reflink_or_copy, make_dirs=True
+        )
+        assert copied.raw_contents == ext4_file.raw_contents
+        assert File.CopyMode(0b11011).name == "leave_or_hardlink_or_reflink_or_copy"
+
+
+def test_copy_mount_point_dir(tmp_path):
+
+    mnt = tmp_path / "mnt"
+    mnt.mkdir()
+    (mnt / "file.txt").write_text("mounted")
+    with FsMountIdentifier.patch_table([("/", "ext4"), (str(mnt), "ext4")]):
+        # A directory that is itself a mount point isn't on the same mount as its parent
+        copied = Directory(mnt).copy(
+            tmp_path / "dest", mode=File.CopyMode.copy | File.CopyMode.hardlink
+        )
+    assert (copied.fspath / "file.txt").read_text() == "mounted"
+    assert (
+        os.stat(copied.fspath / "file.txt").st_ino != os.stat(mnt / "file.txt").st_ino
+    )
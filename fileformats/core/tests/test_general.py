@@ -2,10 +2,10 @@ from pathlib import Path
 import platform
 import pytest
 import typing as ty
-from fileformats.core import validated_property
+from fileformats.core import validated_property, FileSetArray
 from fileformats.generic import File, UnicodeFile, BinaryFile
 from fileformats.field import Integer, Boolean, Decimal, Array, Text
-from fileformats.testing import Foo
+from fileformats.testing import Foo, Magic
 from fileformats.core.exceptions import FormatMismatchError
 from conftest import write_test_file
 
@@ -204,3 +204,41 @@ def test_required_check_op_fail(work_dir):
         binary=True,
     )
     assert not YFile.matches(fspath)
+
+
+def test_trusted_deferred_validation(work_dir: Path):
+    fspath = work_dir / "test.magic"
+    write_test_file(fspath, b"NOMAGIC", binary=True)
+    trusted = Magic.trusted(fspath)
+    assert trusted.fspaths == frozenset([fspath])
+    with pytest.raises(FormatMismatchError):
+        trusted.validate()
+    # Validation is also triggered by the first access of a validated property
+    with pytest.raises(FormatMismatchError):
+        trusted.fspath
+    write_test_file(fspath, b"MAGIC contents", binary=True)
+    assert trusted.fspath == fspath
+    assert trusted == Magic(fspath)
+    missing = Magic.trusted(work_dir / "missing.magic")
+    with pytest.raises(FileNotFoundError):
+        missing.validate()
+
+
+def test_fileset_array(work_dir: Path):
+    filesets = []
+    for i in range(3):
+        fspath = work_dir / f"{i}.magic"
+        write_test_file(fspath, b"MAGIC contents", binary=True)
+        filesets.append(Magic(fspath))
+    filesets.append(File(work_dir / "0.magic"))
+    array = FileSetArray(filesets)
+    assert len(array) == 4
+    assert list(array) == filesets
+    assert [hash(f) for f in array] == [hash(f) for f in filesets]
+    assert [array.hash_of(i) for i in range(4)] == [hash(f) for f in filesets]
+    assert array[-1] == filesets[-1]
+    assert type(array[-1]) is File
+    assert list(array[1:3]) == filesets[1:3]
+    assert filesets[2] in array
+    assert UnicodeFile(work_dir / "0.magic") not in array
+    assert len(array._dirs) == 1  # parent directories are interned
@@ -1,7 +1,7 @@
 import io
 import pytest
 from pathlib import Path
-from fileformats.core.io import BinaryIOWindow
+from fileformats.core.io import BinaryIOWindow, MappedBinaryIOWindow
 
 
 def test_binary_window():
@@ -114,3 +114,79 @@ def test_binary_window_start_too_small():
 def test_binary_window_end_before_start():
     with pytest.raises(ValueError, match=" is before start position"):
         BinaryIOWindow(io.BytesIO(b"abc"), start=1, end=-3)
+
+
+def test_binary_window_readinto(tmp_path: Path):
+    data = b"0123456789abcdefghijklmnopqrstuvwxyz"
+    test_file = tmp_path / "test.bin"
+    test_file.write_bytes(data)
+    with BinaryIOWindow(test_file.open("rb"), start=10, end=20) as window:
+        buffer = bytearray(4)
+        assert window.readinto(buffer) == 4
+        assert buffer == b"abcd"
+        buffer = bytearray(20)
+        assert window.readinto1(buffer) == 6
+        assert buffer[:6] == b"efghij"
+        assert window.readinto(buffer) == 0
+        assert window.getbuffer() == b"abcdefghij"
+    with BinaryIOWindow(io.BytesIO(data), start=-6) as window:
+        assert window.getbuffer() == b"uvwxyz"
+
+
+def test_binary_window_getbuffer_mapping(tmp_path: Path):
+    test_file = tmp_path / "test.bin"
+    test_file.write_bytes(b"0123456789")
+    with BinaryIOWindow(test_file.open("rb"), start=2, end=6) as window:
+        # The file is only mapped once, however many buffers are requested
+        buffers = [window.getbuffer() for _ in range(3)]
+        assert all(b.obj is buffers[0].obj for b in buffers)
+        assert buffers[-1] == b"2345"
+        mapping = buffers[0].obj
+        for buffer in buffers:
+            buffer.release()
+    assert mapping.closed
+
+
+class NonSeekable(io.RawIOBase):
+    def __init__(self, data: bytes):
+        self.data = io.BytesIO(data)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def readinto(self, buffer) -> int:
+        return self.data.readinto(buffer)
+
+
+def test_binary_window_spooled(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(BinaryIOWindow, "SPOOL_MAX_SIZE", 8)
+    data = b"0123456789abcdefghijklmnopqrstuvwxyz"
+    with BinaryIOWindow(NonSeekable(data), start=10, end=-10) as window:
+        assert window.read(3) == b"abc"
+        buffer = bytearray(3)
+        assert window.readinto(buffer) == 3
+        assert buffer == b"def"
+        assert window.read() == b"ghijklmnop"
+
+
+def test_mapped_binary_window(tmp_path: Path):
+    test_file = tmp_path / "test.txt"
+    test_file.write_bytes(b"abc\ndef\nghi\njkl\nmn")
+    with MappedBinaryIOWindow(test_file.open("rb"), start=4, end=-4) as window:
+        assert window.getbuffer() == b"def\nghi\njk"
+        assert window.readlines() == [b"def\n", b"ghi\n", b"jk"]
+        window.seek(-3, io.SEEK_END)
+        buffer = bytearray(5)
+        assert window.readinto(buffer) == 3
+        assert buffer[:3] == b"\njk"
+        window.seek(2)
+        assert window.read(3) == b"f\ng"
+        assert window.tell() == 5
+    assert window.closed
+    empty_file = tmp_path / "empty.txt"
+    empty_file.write_bytes(b"")
+    with MappedBinaryIOWindow(empty_file.open("rb"), start=0) as window:
+        assert window.read() == b""
@@ -237,3 +237,34 @@ def test_with_side_car_fail3(work_dir):
         side_car_fs_path, "\n".join(f"{k}:{v}" for k, v in side_car.items())
     )
     assert not FileWithSideCars.matches([fspath, side_car_fs_path])
+
+
+class ValidatedMixin:
+    @validated_property
+    def _check_mixin(self) -> None:
+        pass
+
+
+def test_validated_properties_registry():
+    assert "_required_props" in FileWithMagicNumber.__dict__
+    assert FileWithMagicNumber.validated_properties() == (
+        "_check_magic_number",
+        "fspath",
+    )
+    assert not FileWithMagicNumber.unconstrained
+    # The cached extensions can't be modified via the list returned to callers
+    FileWithMagicNumber.possible_exts.append(".other")
+    assert FileWithMagicNumber.possible_exts == [FileWithMagicNumber.ext]
+    # Classes created on the fly (e.g. classified types) get their own registry
+    Dynamic = type("Dynamic", (ValidatedMixin, FileWithMagicNumber), {})
+    assert Dynamic.validated_properties() == (
+        "_check_magic_number",
+        "_check_mixin",
+        "fspath",
+    )
+    # Overriding a validated property with a plain one removes it
+    Overridden = type(
+        "Overridden", (Dynamic,), {"_check_mixin": property(lambda self: None)}
+    )
+    assert Overridden.validated_properties() == ("_check_magic_number", "fspath")
+    assert BinaryFile.unconstrained
@@ -5,10 +5,18 @@ import shutil
 import time
 import typing as ty
 import pytest
-from fileformats.core import FileSet, validated_property
+from fileformats.core import FileSet, validated_property, cache_stats, reset_cache_stats
 from fileformats.generic import File, BinaryFile, Directory, FsObject
 from fileformats.core.mixin import WithSeparateHeader
-from fileformats.core.exceptions import UnsatisfiableCopyModeError
+from fileformats.testing import Foo
+from fileformats.core.exceptions import UnsatisfiableCopyModeError, FormatMismatchError
+from fileformats.core import converter_helpers, utils
+from fileformats.core.utils import (
+    fspaths_converter,
+    intern_path,
+    clear_interned_paths,
+    import_extras_module,
+)
 from conftest import write_test_file
 
 
@@ -523,3 +531,59 @@ def test_hash_files(fsobject: FsObject, work_dir: Path, dest_dir: Path):
     )
     cpy = fsobject.copy(dest_dir)
     assert cpy.hash_files() == fsobject.hash_files()
+
+
+def test_intern_path(work_dir: Path, monkeypatch: pytest.MonkeyPatch):
+    fspath = work_dir / "file.txt"
+    interned = intern_path(str(fspath))
+    assert interned == fspath
+    assert intern_path(fspath) is interned
+    assert intern_path(interned.parent) is intern_path(str(work_dir))
+    assert fspaths_converter([fspath, str(fspath)]) == frozenset([interned])
+    monkeypatch.chdir(work_dir)
+    assert intern_path("file.txt") is interned
+    clear_interned_paths()
+    assert intern_path(fspath) is not interned
+
+
+def test_cached_nested_structure(work_dir: Path):
+    luigi_path = work_dir / "file.luigi"
+    mario_path = work_dir / "file.mario"
+    luigi_path.write_bytes(b"luigi")
+    mario_path.write_bytes(b"mario")
+    mtime = time.time() - 10
+    for fspath in (luigi_path, mario_path):
+        os.utime(fspath, (mtime, mtime))
+    reset_cache_stats()
+    luigi = Luigi(luigi_path)
+    for _ in range(3):
+        assert luigi.required_paths() == frozenset([luigi_path, mario_path])
+        nested = luigi.nested_filesets()
+        assert nested == [Mario(mario_path)]
+        nested.clear()  # returned lists are copies of the cached value
+    stats = cache_stats()
+    assert stats[(Luigi, "required_paths")].recomputes == 1
+    assert stats[(Luigi, "nested_filesets")].recomputes == 1
+    # Trimming the paths invalidates the cached values
+    luigi.fspaths = frozenset([luigi_path])
+    with pytest.raises(FormatMismatchError):
+        luigi.required_paths()
+
+
+def test_missing_extras_module_retried(monkeypatch: pytest.MonkeyPatch):
+    attempts = []
+
+    def import_module(name):
+        attempts.append(name)
+        raise ModuleNotFoundError(f"No module named '{name}'")
+
+    monkeypatch.setattr(utils, "_extras_modules", {})
+    monkeypatch.setattr(utils.importlib, "import_module", import_module)
+    # Failed imports are cached
+    for _ in range(3):
+        assert not import_extras_module(Foo).imported
+    assert attempts == ["fileformats.extras.testing"]
+    # Until another converter is registered (e.g. after installing the package)
+    converter_helpers.converters_changed()
+    assert not import_extras_module(Foo).imported
+    assert attempts == ["fileformats.extras.testing"] * 2
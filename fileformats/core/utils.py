@@ -6,10 +6,11 @@ from types import ModuleType
 import urllib.request
 import urllib.error
 import os
+import itertools
 import logging
 import pkgutil
 from contextlib import contextmanager
-from .typing import FspathsInputType
+from .typing import FspathsInputType, PathType
 import fileformats.core
 from fileformats.core.exceptions import FormatDefinitionError
 
@@ -83,14 +84,67 @@ def set_cwd(path: Path) -> ty.Generator[Path, None, None]:
 
 
 def fspaths_converter(fspaths: FspathsInputType) -> ty.FrozenSet[Path]:
-    """Ensures fs-paths are a set of pathlib.Path"""
+    """Ensures fs-paths are a set of absolute, interned (see `intern_path`),
+    pathlib.Path objects"""
     import fileformats.core
 
     if isinstance(fspaths, fileformats.core.FileSet):
-        fspaths = fspaths.fspaths
+        return fspaths.fspaths  # already converted
     elif isinstance(fspaths, (str, os.PathLike)):
-        fspaths = [Path(fspaths)]
-    return frozenset(Path(p).absolute() for p in fspaths)
+        return frozenset([intern_path(fspaths)])
+    return frozenset(intern_path(p) for p in fspaths)
+
+
+def intern_path(fspath: PathType) -> Path:
+    """Converts a path to an absolute Path object, returning the same object for
+    subsequent calls with the same path. The Path objects are constructed from interned
+    parent directories, so siblings share the storage of their common ancestors (on
+    Python versions where Path objects store their parts).
+
+    The intern table is bounded by `INTERNED_PATHS_MAX`, with the oldest entries
+    dropped when it is exceeded, and can be cleared with `clear_interned_paths`.
+
+    Parameters
+    ----------
+    fspath : str or Path
+        the path to intern
+
+    Returns
+    -------
+    Path
+        the absolute, interned, path
+    """
+    key = os.fspath(fspath)
+    try:
+        return _interned_paths[key]
+    except KeyError:
+        pass
+    if isinstance(fspath, Path) and fspath.is_absolute():
+        path = fspath  # skip the construction of a new Path object
+    else:
+        path = Path(key)
+        if not path.is_absolute():
+            # Relative paths are interned by their absolute path, as they depend on
+            # the current working directory
+            return intern_path(path.absolute())
+    parent = path.parent
+    if parent != path:  # i.e. not the root directory
+        path = intern_path(parent) / path.name
+    if len(_interned_paths) >= INTERNED_PATHS_MAX:
+        # Drop the oldest half of the entries
+        for old_key in list(itertools.islice(_interned_paths, INTERNED_PATHS_MAX // 2)):
+            _interned_paths.pop(old_key, None)
+    _interned_paths[key] = path
+    return path
+
+
+def clear_interned_paths() -> None:
+    """Clears the table of interned paths used by `intern_path`"""
+    _interned_paths.clear()
+
+
+INTERNED_PATHS_MAX = 2**18
+_interned_paths: ty.Dict[str, Path] = {}
 
 
 def add_exc_note(e: Exception, note: str) -> Exception:
@@ -164,7 +218,10 @@ class ExtrasModule:
 
 
 def import_extras_module(klass: ty.Type["fileformats.core.DataType"]) -> ExtrasModule:
-    """Attempt to load extras module corresponding to the provided class's module
+    """Attempt to load extras module corresponding to the provided class's module. The
+    outcome of the attempt is cached, so missing extras packages aren't searched for
+    again until `forget_missing_extras_modules` is called (e.g. when a converter is
+    registered)
 
     Parameters
     ----------
@@ -195,6 +252,10 @@ def import_extras_module(klass: ty.Type["fileformats.core.DataType"]) -> ExtrasM
         )
         return ExtrasModule(True, None, None)
     sub_pkg = pkg_parts[1]
+    try:
+        return _extras_modules[sub_pkg]
+    except KeyError:
+        pass
     extras_pkg = "fileformats.extras." + sub_pkg
     if sub_pkg in IANA_MIME_TYPE_REGISTRIES + ["testing"]:
         extras_pypi = "fileformats-extras"
@@ -208,7 +269,25 @@ def import_extras_module(klass: ty.Type["fileformats.core.DataType"]) -> ExtrasM
         extras_imported = False
     else:
         extras_imported = True
-    return ExtrasModule(extras_imported, extras_pkg, extras_pypi)
+    extras_module = _extras_modules[sub_pkg] = ExtrasModule(
+        extras_imported, extras_pkg, extras_pypi
+    )
+    return extras_module
+
+
+def forget_missing_extras_modules() -> None:
+    """Discards the cached outcomes of failed attempts to import extras modules, so they
+    are attempted again (e.g. after the extras package has been installed)"""
+    missing = [k for k, m in _extras_modules.items() if not m.imported]
+    if not missing:
+        return
+    for sub_pkg in missing:
+        del _extras_modules[sub_pkg]
+    importlib.invalidate_caches()
+
+
+# Outcomes of attempts to import the extras modules of each fileformats sub-package
+_extras_modules: ty.Dict[str, ExtrasModule] = {}
 
 
 TypeType = ty.TypeVar("TypeType", bound=ty.Type[ty.Any])
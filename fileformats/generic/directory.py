@@ -31,7 +31,7 @@ class Directory(FsObject):
             )
         return dirs[0]
 
-    @mtime_cached_property
+    @mtime_cached_property(bounded=True)
     def contents(self) -> ty.List[ty.Union[File, "Directory"]]:
         contnts: ty.List[ty.Union[File, Directory]] = []
         for p in self.fspath.iterdir():
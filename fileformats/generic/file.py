@@ -1,4 +1,6 @@
 import io
+import os
+import mmap
 from pathlib import Path
 import typing as ty
 from fileformats.core.fileset import FileSet
@@ -8,12 +10,30 @@ from fileformats.core.exceptions import (
 )
 from fileformats.core.decorators import (
     validated_property,
-    classproperty,
+    cached_classproperty,
     mtime_cached_property,
 )
+from fileformats.core import aio
+from fileformats.core.io import pread_ranges
 from .fsobject import FsObject
 
 
+# Flags used to open files for reading (O_BINARY is required on Windows)
+OPEN_FLAGS = os.O_RDONLY | getattr(os, "O_BINARY", 0)
+
+
+def _release_mapping(mapping: memoryview) -> None:
+    """Releases a memory map of a file, unless views onto it are still in use, in which
+    case it is closed when they are garbage collected"""
+    mapped = mapping.obj
+    mapping.release()
+    if isinstance(mapped, mmap.mmap):
+        try:
+            mapped.close()
+        except BufferError:
+            pass
+
+
 class File(FsObject):
     """Generic file type"""
 
@@ -33,7 +53,7 @@ class File(FsObject):
             )
         return fspath
 
-    @classproperty  # type: ignore[arg-type]
+    @cached_classproperty  # type: ignore[arg-type]
     def unconstrained(cls) -> bool:
         """Whether the file-format is unconstrained by extension, magic number or another
         constraint"""
@@ -82,7 +102,7 @@ class File(FsObject):
         )
         return Path(new_path).with_suffix(suffix)
 
-    @mtime_cached_property
+    @mtime_cached_property(bounded=True)
     def raw_contents(self) -> ty.Union[str, bytes]:
         return self.read_contents()
 
@@ -103,10 +123,128 @@ class File(FsObject):
             newline=newline,
         )
 
+    def mmap(self, offset: int = 0, length: ty.Optional[int] = None) -> memoryview:
+        """Returns a read-only view onto the contents of the file via a memory map, so
+        that slices of large files can be accessed without reading them into memory.
+
+        The mapping is created on the first call and cached on the file object until the
+        modification time of the file changes, after which a new mapping is created. Note
+        that accessing a view onto a mapping of a file that has since been truncated
+        may crash the process (SIGBUS).
+
+        Parameters
+        ----------
+        offset : int, optional
+            the offset of the start of the view, if negative then interpreted as being
+            from the end of the file, by default 0
+        length : int, optional
+            the length of the view, if None then to the end of the file, by default None
+
+        Returns
+        -------
+        memoryview
+            a read-only view onto the requested bytes of the file
+        """
+        cached = self.__dict__.get(self._mapping_cache_name)
+        mapping: memoryview = self._mapping
+        if cached is not None and cached[1] is not mapping:
+            # The file has been modified since it was mapped, so release the superseded
+            # mapping instead of waiting for it to be garbage collected
+            _release_mapping(cached[1])
+        if offset < 0:
+            offset = max(len(mapping) + offset, 0)
+        end = len(mapping) if length is None else offset + length
+        return mapping[offset:end]
+
+    @mtime_cached_property
+    def _mapping(self) -> memoryview:
+        """A read-only memory map of the whole file"""
+        with open(self.fspath, "rb") as f:
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty files can't be mapped
+                return memoryview(b"")
+        return memoryview(mapped)
+
+    @cached_classproperty
+    def _mapping_cache_name(cls) -> str:
+        """The name of the attribute the memory map of the file is cached in"""
+        mapping: ty.Any = cls._mapping
+        return mapping._cache_name  # type: ignore[no-any-return]
+
+    async def aread_contents(
+        self, size: ty.Optional[int] = None, offset: int = 0
+    ) -> ty.Union[str, bytes]:
+        """Awaitable version of `read_contents`, which is run on the bounded I/O
+        executor (see `fileformats.core.aio`)"""
+        async with aio.mount_limits([self.fspath]):
+            return await aio.run_io(self.read_contents, size, offset)
+
+    def read_ranges(
+        self, ranges: ty.Iterable[ty.Tuple[int, ty.Optional[int]]]
+    ) -> ty.List[bytes]:
+        """Reads several byte ranges of the raw file on disk (e.g. for format probes at
+        different offsets) with a single open of the file, coalescing ranges that
+        overlap or are close together into single reads
+
+        Parameters
+        ----------
+        ranges : Iterable[tuple[int, int or None]]
+            the (offset, size) pairs of the ranges to read. Negative offsets are
+            interpreted as being from the end of the file, and sizes of None as to the
+            end of the file
+
+        Returns
+        -------
+        list[bytes]
+            the bytes read for each range in the order they were requested
+        """
+        ranges = list(ranges)
+        if self._mapping_cache_name in self.__dict__:
+            # Serve the reads from the existing memory map of the file
+            return [self.mmap(o, s).tobytes() for o, s in ranges]
+        probe_fds = self.__dict__.get("_probe_fds")
+        if probe_fds is not None:
+            # Share a file descriptor between the probes made during validation
+            try:
+                fd = probe_fds[self.fspath]
+            except KeyError:
+                fd = probe_fds[self.fspath] = os.open(self.fspath, OPEN_FLAGS)
+            return pread_ranges(fd, ranges)
+        fd = os.open(self.fspath, OPEN_FLAGS)
+        try:
+            return pread_ranges(fd, ranges)
+        finally:
+            os.close(fd)
+
+    @cached_classproperty
+    def _opens_raw_file(cls) -> bool:
+        """Whether the `open` method returns a plain stream of the bytes on disk, i.e.
+        it hasn't been overridden by a subclass (e.g. to decompress the file)"""
+        open_method: ty.Any = cls.open
+        return open_method in (File.open, BinaryFile.open)
+
+    def _validate_properties(self) -> None:
+        # File descriptors opened by read_ranges during validation are kept open, and
+        # reused, until the validation is complete
+        self._probe_fds: ty.Dict[Path, int] = {}
+        try:
+            super()._validate_properties()
+        finally:
+            for fd in self.__dict__.pop("_probe_fds").values():
+                os.close(fd)
+
     def read_contents(
         self, size: ty.Optional[int] = None, offset: int = 0
     ) -> ty.Union[str, bytes]:
-        with self.open("rb" if getattr(self, "binary", True) else "r") as f:
+        binary = getattr(self, "binary", True)
+        if (
+            binary
+            and self._opens_raw_file
+            and (size or self._mapping_cache_name in self.__dict__)
+        ):
+            return self.read_ranges([(offset, size if size else None)])[0]
+        with self.open("rb" if binary else "r") as f:
             if offset:
                 f.seek(offset, (io.SEEK_SET if offset >= 0 else io.SEEK_END))
             contents = f.read(size) if size else f.read()
@@ -116,7 +254,7 @@ class File(FsObject):
     def actual_ext(self) -> str:
         "The actual file extension (out of the primary  and alternate extensions possible)"
         constrained_exts = [
-            e for e in self.possible_exts if e is not None
+            e for e in self._possible_exts if e is not None
         ]  # strip out unconstrained
         matching = [e for e in constrained_exts if self.fspath.name.endswith(e)]
         if not matching:
@@ -1,5 +1,7 @@
+import os
 import pytest
-from fileformats.generic import FsObject, File
+from fileformats.generic import FsObject, File, BinaryFile
+from fileformats.core.io import pread_ranges
 from fileformats.testing import Magic, MagicVersion, Foo, MyFormatX
 
 
@@ -28,3 +30,56 @@ def test_sample_magic():
 )
 def test_sample_magic_version():
     assert isinstance(MagicVersion.sample(), MagicVersion)
+
+
+def test_file_mmap(tmp_path):
+    fspath = tmp_path / "file.bin"
+    fspath.write_bytes(b"0123456789abcdef")
+    binary = BinaryFile(fspath)
+    assert binary.mmap() == b"0123456789abcdef"
+    assert binary.mmap(4, 3) == b"456"
+    assert binary.mmap(-6) == b"abcdef"
+    assert binary.mmap().readonly
+    # Reads are served from the mapping once the file has been mapped
+    assert binary.read_contents(3, offset=10) == b"abc"
+    assert binary.read_contents(offset=-3) == b"def"
+    assert binary.read_contents() == b"0123456789abcdef"
+    # Modifying the file invalidates the mapping
+    mapped = binary.__dict__[BinaryFile._mapping_cache_name][1].obj
+    fspath.write_bytes(b"modified")
+    mtime = fspath.stat().st_mtime + 10
+    os.utime(fspath, (mtime, mtime))
+    assert binary.mmap() == b"modified"
+    # The superseded mapping is closed rather than left for the garbage collector
+    assert mapped.closed
+    empty = tmp_path / "empty.bin"
+    empty.write_bytes(b"")
+    assert BinaryFile(empty).mmap() == b""
+
+
+def test_file_read_ranges(tmp_path):
+    fspath = tmp_path / "file.bin"
+    fspath.write_bytes(b"0123456789abcdef")
+    binary = BinaryFile(fspath)
+    assert binary.read_ranges([(10, 3), (0, 2), (-2, None), (1, 3), (20, 5)]) == [
+        b"abc",
+        b"01",
+        b"ef",
+        b"123",
+        b"",
+    ]
+    assert binary.read_contents(4, offset=-6) == b"abcd"
+
+
+def test_pread_ranges_coalescing(tmp_path):
+    fspath = tmp_path / "file.bin"
+    fspath.write_bytes(bytes(range(256)) * 64)
+    fd = os.open(fspath, os.O_RDONLY)
+    try:
+        ranges = [(16000, 8), (0, 4), (2, 4), (100, 1), (-1, 1)]
+        contents = fspath.read_bytes()
+        expected = [contents[o : (o + s) if o >= 0 else None] for o, s in ranges]
+        assert pread_ranges(fd, ranges, coalesce_gap=0) == expected
+        assert pread_ranges(fd, ranges) == expected
+    finally:
+        os.close(fd)